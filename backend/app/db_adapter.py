@@ -4,104 +4,976 @@ Provides MongoDB-like API over PostgreSQL using JSONB
 """
 import json
 import uuid
+import time
+import asyncio
+import inspect
 import logging
-from typing import Any, Dict, List, Optional, Callable, Sequence
+from typing import Any, AsyncIterator, Dict, List, Optional, Callable, Sequence
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import text, bindparam, String
+from sqlalchemy import text, bindparam, String, make_url
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.exc import DBAPIError
 try:
     from backend.app.config import config
+    from backend.app.db_aggregate import compile_aggregate
+    from backend.app.db_backend import (
+        LEASED_QUEUE_STATUS, VERSION_FIELD, StorageBackend, VersionConflict, claim_scope, decode_cursor,
+        document_version, encode_cursor, leased_item, retry_on_conflict,
+    )
+    from backend.app.db_cache import MISSING, CACHE_CHANNEL, CacheInvalidationListener, DocumentCache, invalidation_payload
+    from backend.app.db_codec import get_codec, install_codec
+    from backend.app.db_filters import compile_filter, split_path
+    from backend.app.db_metrics import DBMetrics, db_operation, install_metrics
+    from backend.app.db_pool import engine_options, install_pool_metrics, pool_status
+    from backend.app.db_projection import compile_projection, expand_projection, normalize_projection, project
+    from backend.app.db_search import (
+        SEARCH_FIELDS, SEARCH_QUEUE_TABLE, SEARCH_SCHEMA, SEARCH_TABLE, SEARCH_TRIGRAM_INDEX,
+        index_entry, like_pattern, search_triggers, to_tsquery_literal, tokenize,
+    )
+    from backend.app.db_updates import UPDATE_FUNCTIONS, compile_update
 except ImportError:
     from app.config import config
+    from app.db_aggregate import compile_aggregate
+    from app.db_backend import (
+        LEASED_QUEUE_STATUS, VERSION_FIELD, StorageBackend, VersionConflict, claim_scope, decode_cursor,
+        document_version, encode_cursor, leased_item, retry_on_conflict,
+    )
+    from app.db_cache import MISSING, CACHE_CHANNEL, CacheInvalidationListener, DocumentCache, invalidation_payload
+    from app.db_codec import get_codec, install_codec
+    from app.db_filters import compile_filter, split_path
+    from app.db_metrics import DBMetrics, db_operation, install_metrics
+    from app.db_pool import engine_options, install_pool_metrics, pool_status
+    from app.db_projection import compile_projection, expand_projection, normalize_projection, project
+    from app.db_search import (
+        SEARCH_FIELDS, SEARCH_QUEUE_TABLE, SEARCH_SCHEMA, SEARCH_TABLE, SEARCH_TRIGRAM_INDEX,
+        index_entry, like_pattern, search_triggers, to_tsquery_literal, tokenize,
+    )
+    from app.db_updates import UPDATE_FUNCTIONS, compile_update
 
 logger = logging.getLogger(__name__)
 
+# Hot document fields materialised as STORED generated columns on `documents`.
+# column -> (document path, SQL type, generation expression)
+GENERATED_COLUMNS = {
+    "status": ("review_state.status", "text", "data->'review_state'->>'status'"),
+    "finalized": (
+        "review_state.finalized", "boolean",
+        "CASE WHEN jsonb_typeof(data->'review_state'->'finalized') = 'boolean' "
+        "THEN (data->'review_state'->'finalized')::boolean END",
+    ),
+    "language": ("language", "text", "data->>'language'"),
+    "dataset_type_id": ("dataset_type_id", "text", "data->>'dataset_type_id'"),
+    "reviewer_id": ("reviewer_id", "text", "data->>'reviewer_id'"),
+    "is_gold": (
+        "is_gold", "boolean",
+        "CASE WHEN jsonb_typeof(data->'is_gold') = 'boolean' THEN (data->'is_gold')::boolean END",
+    ),
+    "flagged": (
+        "flagged", "boolean",
+        "CASE WHEN jsonb_typeof(data->'flagged') = 'boolean' THEN (data->'flagged')::boolean END",
+    ),
+    # Falls back to the row timestamp so ordering never has to COALESCE at query time
+    "doc_created_at": (
+        "created_at", "timestamptz",
+        "COALESCE(documents_parse_ts(data->>'created_at'), created_at AT TIME ZONE 'UTC')",
+    ),
+}
 
-class DBAdapter:
+# Paths the filter compiler may answer from a promoted column (equality-style operators)
+FILTER_COLUMNS = {
+    path: (column, bool if sql_type == "boolean" else str)
+    for column, (path, sql_type, _) in GENERATED_COLUMNS.items()
+    if sql_type in ("text", "boolean")
+}
+
+# Btree/partial indexes over the promoted columns: name -> definition ({table} is the target table)
+DOCUMENT_INDEXES = {
+    "idx_collection": "ON {table} (collection_name)",
+    # Claim path: oldest open dataset item first
+    "idx_claim_queue": """
+        ON {table} (doc_created_at NULLS FIRST, id)
+        WHERE collection_name = 'dataset_items'
+          AND finalized IS NOT TRUE
+          AND status IN ('pending', 'in_review')
+    """,
+    "idx_type_lang_status": "ON {table} (collection_name, dataset_type_id, language, status)",
+    # Default query_collection order; id makes (sort key, id) keyset pages an index range scan
+    "idx_collection_created_id": "ON {table} (collection_name, doc_created_at, id)",
+    "idx_reviewer": "ON {table} (collection_name, reviewer_id) WHERE reviewer_id IS NOT NULL",
+    "idx_flagged": "ON {table} (collection_name, doc_created_at) WHERE flagged",
+    "idx_gold": "ON {table} (collection_name, dataset_type_id) WHERE is_gold",
+    # jsonb_path_ops only supports @> but is far smaller and cheaper to maintain than the
+    # default jsonb_ops index; the filter compiler expresses equality/$contains as @>.
+    "idx_data_gin_path": "ON {table} USING GIN (data jsonb_path_ops)",
+}
+
+# `documents` is LIST-partitioned by collection_name: each known collection gets its own
+# partition (named documents_<collection>), everything else lands in documents_default.
+PARTITIONED_COLLECTIONS = (
+    "dataset_items",
+    "dataset_types",
+    "review_logs",
+    "admin_audit_logs",
+    "ocr_jobs",
+    "ocr_results",
+    "audio_jobs",
+    "audio_transcripts",
+    "upload_batches",
+    "system_config",
+    "counters",
+    "homepage_content",
+    "user",
+    "payout",
+)
+DEFAULT_PARTITION = "documents_default"
+
+# Plain (non-generated) columns copied by migrate_to_partitioned
+DOCUMENT_BASE_COLUMNS = ("id", "collection_name", "doc_id", "data", "created_at", "updated_at")
+
+# Shadow table built by migrate_to_partitioned before it is swapped in as `documents`
+MIGRATION_TABLE = "documents_partitioned"
+MIGRATION_INDEX_SUFFIX = "_partitioned"
+LEGACY_TABLE = "documents_legacy"
+
+# Bumps the document version (db_backend.VERSION_FIELD) on every write to `data`,
+# whatever statement made it
+VERSION_TRIGGER = "documents_version"
+VERSION_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION documents_bump_version() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.data := jsonb_set(
+            NEW.data, '{{{VERSION_FIELD}}}',
+            to_jsonb(COALESCE((OLD.data->>'{VERSION_FIELD}')::bigint, 0) + 1)
+        );
+        RETURN NEW;
+    END
+    $$
+"""
+
+# Claim queue predicates: the reviewer's scope (dataset type and languages), and items
+# still open to the reviewer (whether or not another reviewer holds them right now)
+CLAIM_SCOPE_SQL = """
+    collection_name = 'dataset_items'
+    AND (:dataset_type_id IS NULL OR dataset_type_id = :dataset_type_id)
+    AND (:lang_filter = false OR language = ANY(:languages))
+"""
+CLAIM_OPEN_SQL = """
+    finalized IS NOT TRUE
+    AND status IN ('pending', 'in_review')
+    AND NOT ((data->'review_state'->'reviewed_by') @> :reviewer_ids_jsonb)
+"""
+
+# Review leases: who holds a dataset item (doc_id) and until when. A lease is active while
+# expires_at is in the future; expired rows are taken over by the next claim.
+ITEM_LEASES_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS item_leases (
+        item_id varchar NOT NULL PRIMARY KEY,
+        lock_owner text NOT NULL,
+        leased_at timestamp NOT NULL,
+        expires_at timestamp NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_item_leases_owner ON item_leases (lock_owner)",
+    "CREATE INDEX IF NOT EXISTS idx_item_leases_expires ON item_leases (expires_at)",
+)
+
+# Advisory lock (hashtext key) held by each reap_expired_leases batch
+LEASE_REAPER_LOCK = "item_leases_reaper"
+
+# Review queue counters: dataset items per (dataset type, language, status, finalized),
+# plus a LEASED_QUEUE_STATUS group counting item_leases rows by their item's type and
+# language. NULL keys are stored as ''. The statement-level triggers below keep them in
+# the writing transaction with one upsert per group and statement: a row-level trigger
+# would rewrite the same counter row once per document, which gets quadratically slower
+# over a bulk write in one transaction. Each group is spread over QUEUE_COUNTER_SLOTS rows
+# picked by backend pid so concurrent writers seldom wait on the same row; readers sum them.
+QUEUE_COUNTERS_TABLE = "queue_counters"
+QUEUE_COUNTERS_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS {QUEUE_COUNTERS_TABLE} (
+        dataset_type_id text NOT NULL,
+        language text NOT NULL,
+        status text NOT NULL,
+        finalized boolean NOT NULL,
+        slot smallint NOT NULL,
+        items bigint NOT NULL,
+        PRIMARY KEY (dataset_type_id, language, status, finalized, slot)
+    )
+"""
+# Counter group of a document row / of a leased item's document row (alias {t})
+QUEUE_KEY_SQL = (
+    "COALESCE({t}.dataset_type_id, ''), COALESCE({t}.language, ''), "
+    "COALESCE({t}.status, ''), {t}.finalized IS TRUE"
+)
+QUEUE_LEASED_KEY_SQL = (
+    "COALESCE({t}.dataset_type_id, ''), COALESCE({t}.language, ''), '" + LEASED_QUEUE_STATUS + "', false"
+)
+
+
+def _queue_counter_upsert(changes_sql: str) -> str:
+    """Add the deltas of `changes_sql` (group columns, delta) to the calling backend's counter slot."""
+    return f"""
+        INSERT INTO {QUEUE_COUNTERS_TABLE} AS c (dataset_type_id, language, status, finalized, slot, items)
+        SELECT dataset_type_id, language, status, finalized, pg_backend_pid() % {config.QUEUE_COUNTER_SLOTS}, SUM(delta)
+        FROM ({changes_sql}) AS changes (dataset_type_id, language, status, finalized, delta)
+        GROUP BY 1, 2, 3, 4
+        HAVING SUM(delta) <> 0
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (dataset_type_id, language, status, finalized, slot)
+        DO UPDATE SET items = c.items + EXCLUDED.items
+    """
+
+
+def _document_changes(rows: str, delta: int) -> str:
+    return f"SELECT {QUEUE_KEY_SQL.format(t='r')}, {delta} FROM {rows} r WHERE r.collection_name = 'dataset_items'"
+
+
+def _lease_changes(leases: str, delta: int, documents: str = "documents") -> str:
+    return (
+        f"SELECT {QUEUE_LEASED_KEY_SQL.format(t='d')}, {delta} FROM {leases} l "
+        f"JOIN {documents} d ON d.collection_name = 'dataset_items' AND d.doc_id = l.item_id"
+    )
+
+
+QUEUE_COUNTER_FUNCTIONS = (
+    f"""
+    CREATE OR REPLACE FUNCTION documents_queue_count() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        -- Only dataset item writes move the queue; other collections skip the upserts
+        IF TG_OP = 'INSERT' THEN
+            IF EXISTS (SELECT 1 FROM new_rows WHERE collection_name = 'dataset_items') THEN
+                {_queue_counter_upsert(_document_changes('new_rows', 1))};
+            END IF;
+        ELSIF TG_OP = 'UPDATE' THEN
+            IF NOT EXISTS (SELECT 1 FROM old_rows WHERE collection_name = 'dataset_items')
+                AND NOT EXISTS (SELECT 1 FROM new_rows WHERE collection_name = 'dataset_items') THEN
+                RETURN NULL;
+            END IF;
+            -- A leased item moved to another type or language takes its lease count along
+            {_queue_counter_upsert(' UNION ALL '.join([
+                _document_changes('old_rows', -1),
+                _document_changes('new_rows', 1),
+                _lease_changes('item_leases', -1, documents='old_rows'),
+                _lease_changes('item_leases', 1, documents='new_rows'),
+            ]))};
+        ELSE
+            IF NOT EXISTS (SELECT 1 FROM old_rows WHERE collection_name = 'dataset_items') THEN
+                RETURN NULL;
+            END IF;
+            {_queue_counter_upsert(_document_changes('old_rows', -1))};
+            -- Deleted items lose their leases; the lease trigger can't find their group any more
+            WITH released AS (
+                DELETE FROM item_leases l USING old_rows r
+                WHERE r.collection_name = 'dataset_items' AND l.item_id = r.doc_id
+                RETURNING {QUEUE_LEASED_KEY_SQL.format(t='r')}
+            )
+            {_queue_counter_upsert('SELECT *, -1 FROM released')};
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION item_leases_queue_count() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {_queue_counter_upsert(_lease_changes('new_rows', 1))};
+        ELSE
+            {_queue_counter_upsert(_lease_changes('old_rows', -1))};
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+)
+
+
+def _statement_triggers(table: str, function: str, events: Dict[str, str]) -> Dict[str, str]:
+    return {
+        f"{function}_{event.lower()}": (
+            f"CREATE TRIGGER {function}_{event.lower()} AFTER {event} ON {table} "
+            f"REFERENCING {transitions} FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+        for event, transitions in events.items()
+    }
+
+
+def queue_counter_triggers(table: str = "documents") -> Dict[str, str]:
+    """CREATE TRIGGER statements keeping the queue counters of a documents table: name -> statement."""
+    return _statement_triggers(table, "documents_queue_count", {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    })
+
+
+LEASE_COUNTER_TRIGGERS = _statement_triggers("item_leases", "item_leases_queue_count", {
+    "INSERT": "NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+})
+
+# Actual size of every queue counter group (backfill and reconcile_queue_counters)
+QUEUE_COUNTS_SQL = f"""
+    SELECT {QUEUE_KEY_SQL.format(t='d')}, COUNT(*)
+    FROM documents d WHERE d.collection_name = 'dataset_items'
+    GROUP BY 1, 2, 3, 4
+    UNION ALL
+    SELECT {QUEUE_LEASED_KEY_SQL.format(t='d')}, COUNT(*)
+    FROM item_leases l JOIN documents d ON d.collection_name = 'dataset_items' AND d.doc_id = l.item_id
+    GROUP BY 1, 2, 3, 4
+"""
+
+# Advisory lock (hashtext key) held by reconcile_queue_counters
+QUEUE_COUNTERS_RECONCILE_LOCK = "queue_counters_reconcile"
+
+# Per-reviewer claim watermark: every item of the scope before (created_at, item_id) in
+# queue order was, when the watermark was recorded, closed to the reviewer (finalized,
+# not pending/in_review, or reviewed by them), so claims start scanning there instead
+# of walking past everything the reviewer has done. Items held by other reviewers are
+# open and stay after the watermark, so they come back when their lock goes stale.
+# Watermarks are rebuilt from the queue head every CLAIM_WATERMARK_TTL_SEC so items
+# reopened by hand or imported with an old created_at are eventually seen.
+CLAIM_WATERMARK_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS claim_watermarks (
+        lock_owner text NOT NULL,
+        scope text NOT NULL,
+        created_at timestamptz NOT NULL,
+        item_id bigint NOT NULL,
+        rebuilt_at timestamp NOT NULL,
+        PRIMARY KEY (lock_owner, scope)
+    )
+"""
+
+# query_collection sort keys: name -> (SQL expression, SQL type, may be NULL)
+QUERY_SORTS = {
+    # default: created_at from data (generated column falls back to the row's created_at)
+    "created_at": ("doc_created_at", "timestamptz", False),
+    "updated_at": ("updated_at", "timestamp", False),
+    "item_number": ("(data->>'item_number')::bigint", "bigint", True),
+    "review_count": ("(data->'review_state'->>'review_count')::int", "int", True),
+}
+
+
+
+def _prefix_pattern(prefix: str) -> str:
+    """LIKE pattern matching values that start with `prefix` (backslash is LIKE's default escape)."""
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class UnitOfWork:
+    """
+    One transaction shared by every DBAdapter call made while it is active
+    (see DBAdapter.unit_of_work). The session is opened on first use, so a
+    unit of work that never touches the database never checks out a connection.
+    """
+
+    def __init__(self, adapter: "DBAdapter"):
+        self.adapter = adapter
+        self.active = True
+        self.session: Optional[AsyncSession] = None
+        # Cached collections written in this transaction bypass the cache until it ends,
+        # so uncommitted documents are never cached
+        self.dirty_collections: set = set()
+
+    async def get_session(self) -> AsyncSession:
+        if self.session is None:
+            self.session = self.adapter.SessionFactory()
+            await self.session.begin()
+        return self.session
+
+    async def close(self, commit: bool) -> None:
+        self.active = False
+        session, self.session = self.session, None
+        if session is None:
+            return
+        try:
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        finally:
+            await session.close()
+
+
+class DBAdapter(StorageBackend):
     """
-    Adapter that wraps PostgreSQL with MongoDB-like operations.
+    Storage backend that wraps PostgreSQL with MongoDB-like operations.
     Uses a single table with collection and JSONB document storage.
     """
     
     def __init__(self):
-        self.engine = create_async_engine(config.DATABASE_URL, echo=config.DEBUG)
+        # Documents are bound to and read from jsonb through the codec registered on each connection
+        self.codec = get_codec(config.JSON_CODEC)
+        options = engine_options(config)
+        self.engine = create_async_engine(
+            config.DATABASE_URL,
+            echo=config.DEBUG,
+            json_serializer=self.codec.dumps_text,
+            json_deserializer=self.codec.loads,
+            **options,
+        )
+        install_codec(self.engine, self.codec)
+        install_pool_metrics(self.engine, options)
+        self.metrics = DBMetrics(
+            enabled=config.DB_METRICS_ENABLED,
+            slow_query_ms=config.SLOW_QUERY_MS,
+            explain=config.SLOW_QUERY_EXPLAIN,
+        )
+        install_metrics(self.engine, self.metrics)
+        # LISTEN through PgBouncer's transaction pooling never receives notifications
+        listen_url = make_url(config.DATABASE_DIRECT_URL) if config.DATABASE_DIRECT_URL else self.engine.url
+        cached_collections = config.CACHED_COLLECTIONS
+        if config.DB_PGBOUNCER and not config.DATABASE_DIRECT_URL and cached_collections:
+            logger.warning("DB_PGBOUNCER without DATABASE_DIRECT_URL: document cache disabled")
+            cached_collections = []
+        self.cache = DocumentCache(
+            cached_collections,
+            ttl_sec=config.DOCUMENT_CACHE_TTL_SEC,
+            max_entries=config.DOCUMENT_CACHE_MAX_ENTRIES,
+            codec=self.codec,
+        )
+        self._cache_listener = CacheInvalidationListener(
+            self.cache, listen_url.set(drivername="postgresql").render_as_string(hide_password=False)
+        )
         self.SessionFactory = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
         self.prefix = "curation"
         self._initialized = False
+        # Set by _ensure_search_schema when the pg_trgm extension is installed
+        self._search_trigram = False
     
     async def _ensure_schema(self):
-        """Create table if it doesn't exist"""
+        """
+        Create the partitioned table, promoted columns and indexes if they don't exist.
+        A pre-partitioning deployment keeps its plain table until migrate_to_partitioned() runs.
+        """
         if self._initialized:
             return
         
         async with self.engine.begin() as conn:
-            # Create table
-            await conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS documents (
-                    id SERIAL PRIMARY KEY,
-                    collection_name VARCHAR(255) NOT NULL,
-                    doc_id VARCHAR(255) NOT NULL,
-                    data JSONB NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(collection_name, doc_id)
+            # Serialise schema setup across workers starting at the same time
+            await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('documents_schema'))"))
+            relkind = await self._relkind(conn, "documents")
+            if relkind is None:
+                await self._create_partitioned_table(conn, "documents")
+            elif relkind == "r":
+                logger.warning(
+                    "documents is not partitioned; run backend.scripts.migrate_partition_documents "
+                    "to move it to per-collection partitions"
                 )
+            # Timestamp parser for generated columns: must be IMMUTABLE, so naive ISO strings
+            # are read as UTC and unparseable values become NULL instead of failing the write.
+            await conn.execute(text("""
+                CREATE OR REPLACE FUNCTION documents_parse_ts(value text) RETURNS timestamptz
+                LANGUAGE plpgsql IMMUTABLE AS $$
+                BEGIN
+                    IF value IS NULL OR value = '' THEN
+                        RETURN NULL;
+                    END IF;
+                    IF value ~ '[0-9]{2}:[0-9]{2}(:[0-9]{2}(\\.[0-9]+)?)?(Z|[+-][0-9]{2}(:?[0-9]{2})?)$' THEN
+                        RETURN value::timestamptz;
+                    END IF;
+                    RETURN value::timestamp AT TIME ZONE 'UTC';
+                EXCEPTION WHEN others THEN
+                    RETURN NULL;
+                END
+                $$
             """))
-            # Create indexes separately (asyncpg doesn't support multiple statements in one execute)
-            await conn.execute(text("CREATE INDEX IF NOT EXISTS idx_collection_doc ON documents(collection_name, doc_id)"))
-            await conn.execute(text("CREATE INDEX IF NOT EXISTS idx_collection ON documents(collection_name)"))
-            await conn.execute(text("CREATE INDEX IF NOT EXISTS idx_data_gin ON documents USING GIN (data)"))
+            for function_sql in UPDATE_FUNCTIONS:
+                await conn.execute(text(function_sql))
+            await self._ensure_document_columns(conn, "documents")
+            await self._ensure_document_indexes(conn, "documents")
+            # Superseded: idx_collection_doc duplicated the UNIQUE constraint's index and the
+            # default-opclass GIN over whole documents made every write expensive.
+            await conn.execute(text("DROP INDEX IF EXISTS idx_collection_doc"))
+            await conn.execute(text("DROP INDEX IF EXISTS idx_data_gin"))
+            await conn.execute(text("DROP INDEX IF EXISTS idx_collection_created"))
+            if relkind != "r":
+                await self._ensure_partitions(conn, "documents")
+            await conn.execute(text(VERSION_FUNCTION))
+            await self._ensure_document_triggers(conn, "documents")
+            await self._ensure_search_schema(conn)
+            for statement in ITEM_LEASES_SCHEMA:
+                await conn.execute(text(statement))
+            await self._ensure_queue_counters(conn)
+            await conn.execute(text(CLAIM_WATERMARK_SCHEMA))
         self._initialized = True
+
+    async def _ensure_search_schema(self, conn):
+        """Create the search index tables and triggers (see db_search); use pg_trgm if it can be installed."""
+        created = await self._relkind(conn, SEARCH_TABLE) is None
+        for statement in SEARCH_SCHEMA:
+            await conn.execute(text(statement))
+        if created:
+            # Index documents written before search existed on the first sync
+            await conn.execute(text(f"""
+                INSERT INTO {SEARCH_QUEUE_TABLE} (collection_name, doc_id)
+                SELECT collection_name, doc_id FROM documents WHERE collection_name = ANY(:collections)
+                ON CONFLICT DO NOTHING
+            """), {"collections": list(SEARCH_FIELDS)})
+        await self._ensure_search_triggers(conn, "documents")
+
+        available = (await conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+        ))).scalar()
+        if available:
+            try:
+                async with conn.begin_nested():
+                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            except DBAPIError as e:
+                logger.info("pg_trgm not installed (%s); search matches whole-word prefixes only", e.orig)
+        self._search_trigram = bool((await conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+        ))).scalar())
+        if self._search_trigram:
+            await conn.execute(text(SEARCH_TRIGRAM_INDEX))
+
+    async def _ensure_queue_counters(self, conn):
+        """Create the queue counters (filled from a full count when new) and their triggers."""
+        created = await self._relkind(conn, QUEUE_COUNTERS_TABLE) is None
+        await conn.execute(text(QUEUE_COUNTERS_SCHEMA))
+        for function_sql in QUEUE_COUNTER_FUNCTIONS:
+            await conn.execute(text(function_sql))
+        if created:
+            await conn.execute(text(f"""
+                INSERT INTO {QUEUE_COUNTERS_TABLE} (dataset_type_id, language, status, finalized, slot, items)
+                SELECT dataset_type_id, language, status, finalized, 0, items
+                FROM ({QUEUE_COUNTS_SQL}) AS counts (dataset_type_id, language, status, finalized, items)
+            """))
+        await self._ensure_triggers(conn, "documents", queue_counter_triggers("documents"))
+        await self._ensure_triggers(conn, "item_leases", LEASE_COUNTER_TRIGGERS)
+
+    @staticmethod
+    async def _ensure_document_triggers(conn, table: str):
+        """Create the version trigger (see VERSION_FIELD) if it's missing on a table."""
+        result = await conn.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgrelid = to_regclass(:table) AND tgname = :name)"),
+            {"table": table, "name": VERSION_TRIGGER},
+        )
+        if not result.scalar():
+            await conn.execute(text(
+                f"CREATE TRIGGER {VERSION_TRIGGER} BEFORE UPDATE OF data ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION documents_bump_version()"
+            ))
+
+    @classmethod
+    async def _ensure_search_triggers(cls, conn, table: str):
+        """Create the search queue triggers missing on a table."""
+        await cls._ensure_triggers(conn, table, search_triggers(table))
+
+    @staticmethod
+    async def _ensure_triggers(conn, table: str, triggers: Dict[str, str]):
+        """Run the CREATE TRIGGER statements (name -> statement) of triggers missing on a table."""
+        result = await conn.execute(
+            text("SELECT tgname FROM pg_trigger WHERE tgrelid = to_regclass(:table)"), {"table": table}
+        )
+        existing = set(result.scalars())
+        for name, statement in triggers.items():
+            if name not in existing:
+                await conn.execute(text(statement))
+
+    @staticmethod
+    async def _relkind(conn, table: str) -> Optional[str]:
+        """pg_class.relkind of a table ('r' plain, 'p' partitioned) or None if missing."""
+        result = await conn.execute(
+            text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        )
+        return result.scalar()
+
+    @staticmethod
+    async def _create_partitioned_table(conn, table: str):
+        """Create an empty documents-shaped table partitioned by collection_name."""
+        # Unique constraints on a partitioned table must include the partition key
+        await conn.execute(text(f"""
+            CREATE TABLE {table} (
+                id BIGSERIAL NOT NULL,
+                collection_name VARCHAR(255) NOT NULL,
+                doc_id VARCHAR(255) NOT NULL,
+                data JSONB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (collection_name, id),
+                UNIQUE (collection_name, doc_id)
+            ) PARTITION BY LIST (collection_name)
+        """))
+
+    @staticmethod
+    async def _ensure_document_columns(conn, table: str):
+        """Add the promoted generated columns (rewrites the table once on existing deployments)."""
+        for column, (_, sql_type, expression) in GENERATED_COLUMNS.items():
+            await conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {sql_type} "
+                f"GENERATED ALWAYS AS ({expression}) STORED"
+            ))
+
+    @staticmethod
+    async def _ensure_document_indexes(conn, table: str, suffix: str = ""):
+        """Create DOCUMENT_INDEXES on a table (asyncpg doesn't support multiple statements in one execute)."""
+        for index_name, definition in DOCUMENT_INDEXES.items():
+            await conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {index_name}{suffix} {definition.format(table=table)}"
+            ))
+
+    @staticmethod
+    async def _ensure_partitions(conn, table: str):
+        """Attach a partition for every known collection plus the default partition."""
+        has_default = await DBAdapter._relkind(conn, DEFAULT_PARTITION) is not None
+        for collection in PARTITIONED_COLLECTIONS:
+            partition = f"documents_{collection}"
+            if await DBAdapter._relkind(conn, partition) is not None:
+                continue
+            if has_default:
+                # Rows already sitting in the default partition would violate the new bound
+                result = await conn.execute(
+                    text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE collection_name = :collection)"),
+                    {"collection": collection},
+                )
+                if result.scalar():
+                    logger.warning(
+                        "Collection %s has rows in %s; leaving it in the default partition",
+                        collection, DEFAULT_PARTITION,
+                    )
+                    continue
+            await conn.execute(text(
+                f"CREATE TABLE {partition} PARTITION OF {table} FOR VALUES IN ('{collection}')"
+            ))
+        if not has_default:
+            await conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {table} DEFAULT"))
+
+    async def migrate_to_partitioned(self, batch_size: int = 5000, pause_sec: float = 0.0) -> Dict[str, Any]:
+        """
+        Move a pre-partitioning `documents` table into the partitioned layout without downtime.
+
+        A partitioned shadow table is built next to the live one and kept in sync by a
+        trigger while existing rows are copied over in id-ordered batches. The tables are
+        then swapped under a short exclusive lock; the old table is kept as documents_legacy
+        for the operator to drop. Safe to re-run after an interruption.
+
+        Returns:
+            {"migrated": bool, "rows": copied rows, "batches": batches, "seconds": elapsed}
+        """
+        await self._ensure_schema()
+        started = datetime.utcnow()
+        columns = ", ".join(DOCUMENT_BASE_COLUMNS)
+
+        async with self.engine.begin() as conn:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('documents_schema'))"))
+            if await self._relkind(conn, "documents") != "r":
+                logger.info("documents is already partitioned; nothing to migrate")
+                return {"migrated": False, "rows": 0, "batches": 0, "seconds": 0.0}
+            if await self._relkind(conn, LEGACY_TABLE) is not None:
+                raise RuntimeError(f"{LEGACY_TABLE} already exists; drop it before migrating again")
+            if await self._relkind(conn, MIGRATION_TABLE) is None:
+                await self._create_partitioned_table(conn, MIGRATION_TABLE)
+            await self._ensure_document_columns(conn, MIGRATION_TABLE)
+            await self._ensure_document_indexes(conn, MIGRATION_TABLE, suffix=MIGRATION_INDEX_SUFFIX)
+            await self._ensure_partitions(conn, MIGRATION_TABLE)
+            # Mirror live writes so rows copied early don't go stale during the backfill
+            await conn.execute(text(f"""
+                CREATE OR REPLACE FUNCTION documents_mirror_partitioned() RETURNS trigger
+                LANGUAGE plpgsql AS $$
+                BEGIN
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        DELETE FROM {MIGRATION_TABLE}
+                        WHERE collection_name = OLD.collection_name AND doc_id = OLD.doc_id;
+                    END IF;
+                    IF TG_OP = 'DELETE' THEN
+                        RETURN OLD;
+                    END IF;
+                    INSERT INTO {MIGRATION_TABLE} ({columns})
+                    VALUES (NEW.id, NEW.collection_name, NEW.doc_id, NEW.data, NEW.created_at, NEW.updated_at)
+                    ON CONFLICT (collection_name, doc_id) DO UPDATE
+                        SET id = EXCLUDED.id, data = EXCLUDED.data, updated_at = EXCLUDED.updated_at;
+                    RETURN NEW;
+                END
+                $$
+            """))
+            await conn.execute(text("DROP TRIGGER IF EXISTS documents_mirror_partitioned ON documents"))
+            await conn.execute(text("""
+                CREATE TRIGGER documents_mirror_partitioned
+                AFTER INSERT OR UPDATE OR DELETE ON documents
+                FOR EACH ROW EXECUTE FUNCTION documents_mirror_partitioned()
+            """))
+
+        # Backfill. FOR SHARE makes each batch wait for in-flight writers, so a row deleted
+        # or rewritten concurrently is either skipped or already mirrored (DO NOTHING keeps it).
+        backfill = text(f"""
+            WITH batch AS (
+                SELECT {columns} FROM documents
+                WHERE id > :last_id
+                ORDER BY id
+                LIMIT :batch_size
+                FOR SHARE
+            ), copied AS (
+                INSERT INTO {MIGRATION_TABLE} ({columns})
+                SELECT {columns} FROM batch
+                ON CONFLICT (collection_name, doc_id) DO NOTHING
+            )
+            SELECT COUNT(*), MAX(id) FROM batch
+        """)
+        last_id = 0
+        rows = 0
+        batches = 0
+        while True:
+            async with self.engine.begin() as conn:
+                batch_rows, max_id = (await conn.execute(
+                    backfill, {"last_id": last_id, "batch_size": batch_size}
+                )).one()
+            if not batch_rows:
+                break
+            rows += batch_rows
+            batches += 1
+            last_id = max_id
+            logger.info("Partition migration: copied %d rows (through id %d)", rows, last_id)
+            if pause_sec:
+                await asyncio.sleep(pause_sec)
+
+        index_names = list(DOCUMENT_INDEXES)
+        async with self.engine.begin() as conn:
+            await conn.execute(text("LOCK TABLE documents IN ACCESS EXCLUSIVE MODE"))
+            # Rows inserted with an id below last_id after their batch ran were mirrored by the trigger
+            await conn.execute(text(f"""
+                INSERT INTO {MIGRATION_TABLE} ({columns})
+                SELECT {columns} FROM documents WHERE id > :last_id
+                ON CONFLICT (collection_name, doc_id) DO NOTHING
+            """), {"last_id": last_id})
+            await conn.execute(text("DROP TRIGGER documents_mirror_partitioned ON documents"))
+            await conn.execute(text("DROP FUNCTION documents_mirror_partitioned()"))
+            await conn.execute(text(f"""
+                SELECT setval(
+                    pg_get_serial_sequence('{MIGRATION_TABLE}', 'id'),
+                    GREATEST((SELECT COALESCE(MAX(id), 0) FROM documents), 1)
+                )
+            """))
+            await conn.execute(text(f"ALTER TABLE documents RENAME TO {LEGACY_TABLE}"))
+            for index_name in index_names:
+                await conn.execute(text(f"ALTER INDEX IF EXISTS {index_name} RENAME TO {index_name}_legacy"))
+            await conn.execute(text(f"ALTER TABLE {MIGRATION_TABLE} RENAME TO documents"))
+            for index_name in index_names:
+                await conn.execute(text(
+                    f"ALTER INDEX IF EXISTS {index_name}{MIGRATION_INDEX_SUFFIX} RENAME TO {index_name}"
+                ))
+            await self._ensure_document_triggers(conn, "documents")
+            await self._ensure_search_triggers(conn, "documents")
+            await self._ensure_triggers(conn, "documents", queue_counter_triggers("documents"))
+
+        seconds = (datetime.utcnow() - started).total_seconds()
+        logger.info("Partition migration complete: %d rows in %d batches (%.1fs)", rows, batches, seconds)
+        return {"migrated": True, "rows": rows, "batches": batches, "seconds": seconds}
     
-    def _key(self, collection: str, doc_id: str) -> str:
-        """Generate namespaced key (for compatibility, not used in PostgreSQL)"""
-        return f"{self.prefix}:{collection}:{doc_id}"
+    async def startup(self) -> None:
+        """Create the schema and start the cache listener (application startup hook)."""
+        await self._ensure_schema()
+        if self.cache.collections:
+            await self._cache_listener.ensure_started()
+
+    async def shutdown(self) -> None:
+        """Close the cache listener and the connection pool (application shutdown hook)."""
+        await self._cache_listener.close()
+        await self.engine.dispose()
+
+    def _new_unit_of_work(self) -> UnitOfWork:
+        return UnitOfWork(self)
 
     @asynccontextmanager
-    async def transaction(self) -> AsyncSession:
-        """Async transactional context yielding a shared session."""
-        await self._ensure_schema()
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """Session for one adapter call: the active unit of work's, or its own committed transaction."""
+        if not self._initialized:
+            await self._ensure_schema()
+        unit = self._active_unit_of_work()
+        if unit is not None:
+            yield await unit.get_session()
+            return
         async with self.SessionFactory() as session:
             async with session.begin():
                 yield session
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncSession:
+        """
+        Async transactional context yielding a shared session. Inside a unit of
+        work it is a savepoint on the unit's session, so the block still rolls
+        back on its own if it raises.
+        """
+        unit = self._active_unit_of_work()
+        if unit is None:
+            async with self._session() as session:
+                yield session
+            return
+        session = await unit.get_session()
+        async with session.begin_nested():
+            yield session
     
+    @db_operation()
     async def insert(self, collection: str, document: Dict[str, Any]) -> str:
         """Insert document, generate ID if not present"""
-        await self._ensure_schema()
         doc_id = document.get("_id") or str(uuid.uuid4())
         document["_id"] = doc_id
         
-        async with self.SessionFactory() as session:
+        async with self._session() as session:
             await session.execute(
                 text("""
                     INSERT INTO documents (collection_name, doc_id, data, updated_at)
-                    VALUES (:collection, :doc_id, CAST(:data AS jsonb), CURRENT_TIMESTAMP)
+                    VALUES (:collection, :doc_id, :data, CURRENT_TIMESTAMP)
                     ON CONFLICT (collection_name, doc_id) 
-                    DO UPDATE SET data = CAST(:data AS jsonb), updated_at = CURRENT_TIMESTAMP
+                    DO UPDATE SET data = EXCLUDED.data, updated_at = CURRENT_TIMESTAMP
                 """),
-                {"collection": collection, "doc_id": doc_id, "data": json.dumps(document)}
+                {"collection": collection, "doc_id": doc_id, "data": document}
             )
-            await session.commit()
+            await self._invalidate_cached(session, collection, [doc_id])
         return doc_id
     
-    async def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
-        """Get document by ID"""
-        await self._ensure_schema()
-        async with self.SessionFactory() as session:
+    async def _cache_usable(self, collection: str) -> bool:
+        """True if reads of `collection` may be served from the document cache."""
+        if not self.cache.enabled_for(collection):
+            return False
+        unit = self._active_unit_of_work()
+        if unit is not None and collection in unit.dirty_collections:
+            return False
+        if await self._cache_listener.ensure_started():
+            return True
+        self.cache.counters["bypassed"] += 1
+        return False
+
+    async def _invalidate_cached(
+        self, session: AsyncSession, collection: str, doc_ids: Optional[Sequence[str]] = None
+    ) -> None:
+        """
+        Drop cached copies of written documents (all of `collection` when doc_ids is None).
+        Runs inside the writing transaction: other workers are notified when it commits.
+        """
+        if not self.cache.enabled_for(collection):
+            return
+        unit = self._active_unit_of_work()
+        if unit is not None and session is unit.session:
+            unit.dirty_collections.add(collection)
+        self.cache.invalidate(collection, doc_ids)
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CACHE_CHANNEL, "payload": invalidation_payload(self.codec, collection, doc_ids)}
+        )
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Document cache counters (hits, misses, evictions, ...) for this process."""
+        return {**self.cache.stats(), "listening": self._cache_listener.listening}
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool occupancy, checkout waits and prepared-statement cache hit rate."""
+        return {**pool_status(self.engine), "pgbouncer": config.DB_PGBOUNCER}
+
+    async def ping(self) -> float:
+        """Round trip a trivial query through the pool; returns seconds taken."""
+        started = time.perf_counter()
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return time.perf_counter() - started
+
+    @db_operation()
+    async def get(
+        self,
+        collection: str,
+        doc_id: str,
+        projection: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get document by ID. With `projection` (dotted paths, see db_projection) only
+        `_id` and those paths are returned; projected reads are not cached.
+        """
+        projection = normalize_projection(projection)
+        use_cache = await self._cache_usable(collection)
+        if use_cache:
+            cached = self.cache.get(collection, doc_id)
+            if cached is not MISSING:
+                return project(cached, projection) if projection else cached
+            token = self.cache.token()
+        select_sql, params = compile_projection(projection) if projection else ("data", {})
+        async with self._session() as session:
             result = await session.execute(
-                text("SELECT data FROM documents WHERE collection_name = :collection AND doc_id = :doc_id"),
-                {"collection": collection, "doc_id": doc_id}
+                text(f"SELECT {select_sql} FROM documents WHERE collection_name = :collection AND doc_id = :doc_id"),
+                {**params, "collection": collection, "doc_id": doc_id}
             )
             row = result.fetchone()
-            if row:
-                return row[0]
-            return None
+        document = row[0] if row else None
+        if projection:
+            return expand_projection(document, projection)
+        if use_cache:
+            self.cache.put(collection, doc_id, document, token)
+        return document
+
+    @db_operation(rows=len)
+    async def get_many(self, collection: str, doc_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several documents by ID in one query.
+        Returns {doc_id: document}; IDs that don't exist are left out.
+        """
+        doc_ids = list(dict.fromkeys(doc_id for doc_id in doc_ids if doc_id))
+        if not doc_ids:
+            return {}
+        documents: Dict[str, Dict[str, Any]] = {}
+        use_cache = await self._cache_usable(collection)
+        if use_cache:
+            remaining = []
+            for doc_id in doc_ids:
+                cached = self.cache.get(collection, doc_id)
+                if cached is MISSING:
+                    remaining.append(doc_id)
+                elif cached is not None:
+                    documents[doc_id] = cached
+            if not remaining:
+                return documents
+            doc_ids = remaining
+            token = self.cache.token()
+        async with self._session() as session:
+            result = await session.execute(
+                text("""
+                    SELECT doc_id, data FROM documents
+                    WHERE collection_name = :collection AND doc_id = ANY(CAST(:doc_ids AS varchar[]))
+                """),
+                {"collection": collection, "doc_ids": doc_ids}
+            )
+            fetched = {row[0]: row[1] for row in result.fetchall()}
+        if use_cache:
+            for doc_id in doc_ids:
+                self.cache.put(collection, doc_id, fetched.get(doc_id), token)
+        documents.update(fetched)
+        return documents
+
+    @db_operation(rows=len)
+    async def get_by_prefix(self, collection: str, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        """Get all documents whose ID starts with `prefix` in one query, as {doc_id: document}."""
+        async with self._session() as session:
+            result = await session.execute(
+                text("""
+                    SELECT doc_id, data FROM documents
+                    WHERE collection_name = :collection AND doc_id LIKE :pattern
+                    ORDER BY id
+                """),
+                {"collection": collection, "pattern": _prefix_pattern(prefix)}
+            )
+            return {row[0]: row[1] for row in result.fetchall()}
+
+    @db_operation(rows=len)
+    async def list_ids(self, collection: str, prefix: str = "") -> List[str]:
+        """IDs of the documents whose ID starts with `prefix`, without reading the documents."""
+        async with self._session() as session:
+            result = await session.execute(
+                text("""
+                    SELECT doc_id FROM documents
+                    WHERE collection_name = :collection AND doc_id LIKE :pattern
+                    ORDER BY id
+                """),
+                {"collection": collection, "pattern": _prefix_pattern(prefix)}
+            )
+            return [row[0] for row in result.fetchall()]
 
+    @db_operation()
     async def get_for_update(self, session: AsyncSession, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get document by ID with FOR UPDATE lock using an existing session."""
-        await self._ensure_schema()
         result = await session.execute(
             text("""
                 SELECT data FROM documents 
@@ -113,40 +985,157 @@ class DBAdapter:
         row = result.fetchone()
         return row[0] if row else None
     
-    async def update(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
+    @db_operation()
+    async def update_one(
+        self,
+        collection: str,
+        doc_id: str,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        push_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
-        Update document fields.
-        Supports dotted field notation (e.g., "review_state.status").
+        Apply a partial update in a single UPDATE statement and return the new document.
+        See db_updates for the operations; returns None if the document doesn't exist.
+        Pass `session` to run inside an open transaction (the caller commits).
         """
-        doc = await self.get(collection, doc_id)
-        if not doc:
-            return False
-        
-        # Apply updates (handle nested fields)
-        for field, value in updates.items():
-            parts = field.split(".")
-            current = doc
-            
-            for i, part in enumerate(parts[:-1]):
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-            
-            last_key = parts[-1]
-            current[last_key] = value
-        
-        # Save updated document
-        async with self.SessionFactory() as session:
-            await session.execute(
-                text("""
-                    UPDATE documents 
-                    SET data = CAST(:data AS jsonb), updated_at = CURRENT_TIMESTAMP
-                    WHERE collection_name = :collection AND doc_id = :doc_id
-                """),
-                {"collection": collection, "doc_id": doc_id, "data": json.dumps(doc)}
+        data_expr, params = compile_update(set_fields, inc_fields, push_fields, unset_fields)
+        stmt = text(f"""
+            UPDATE documents
+            SET data = {data_expr}, updated_at = CURRENT_TIMESTAMP
+            WHERE collection_name = :collection AND doc_id = :doc_id
+            RETURNING data
+        """)
+        params.update({"collection": collection, "doc_id": doc_id})
+        if session is not None:
+            result = await session.execute(stmt, params)
+            row = result.fetchone()
+            await self._invalidate_cached(session, collection, [doc_id])
+        else:
+            async with self._session() as own_session:
+                result = await own_session.execute(stmt, params)
+                row = result.fetchone()
+                await self._invalidate_cached(own_session, collection, [doc_id])
+        return row[0] if row else None
+
+    async def _write_if_version(
+        self,
+        session: Optional[AsyncSession],
+        collection: str,
+        doc_id: str,
+        expected_version: int,
+        data_expr: str,
+        params: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """UPDATE ... SET data = data_expr when the document is at expected_version (see update_if_version)."""
+        stmt = text(f"""
+            UPDATE documents
+            SET data = {data_expr}, updated_at = CURRENT_TIMESTAMP
+            WHERE collection_name = :collection AND doc_id = :doc_id
+              AND COALESCE((data->>'{VERSION_FIELD}')::bigint, 0) = :expected_version
+            RETURNING data
+        """)
+        params.update({"collection": collection, "doc_id": doc_id, "expected_version": int(expected_version)})
+        exists = text("SELECT EXISTS (SELECT 1 FROM documents WHERE collection_name = :collection AND doc_id = :doc_id)")
+
+        async def write(active: AsyncSession):
+            row = (await active.execute(stmt, params)).fetchone()
+            if row is None:
+                # Tell a concurrent change apart from a missing document (failure path only)
+                if (await active.execute(exists, params)).scalar():
+                    raise VersionConflict(collection, doc_id, expected_version)
+                return None
+            await self._invalidate_cached(active, collection, [doc_id])
+            return row[0]
+
+        if session is not None:
+            return await write(session)
+        async with self._session() as own_session:
+            return await write(own_session)
+
+    @db_operation()
+    async def update_if_version(
+        self,
+        collection: str,
+        doc_id: str,
+        expected_version: int,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        push_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compare-and-swap partial update: like update_one, but only applied if the document
+        is still at `expected_version` (document_version() of the copy the caller read).
+        Returns the new document (its version bumped), None if the document doesn't exist,
+        and raises VersionConflict if it was changed in between. No row lock is taken
+        before the write; wrap read + write in retry_on_conflict.
+        """
+        data_expr, params = compile_update(set_fields, inc_fields, push_fields, unset_fields)
+        return await self._write_if_version(session, collection, doc_id, expected_version, data_expr, params)
+
+    @db_operation()
+    async def replace_if_version(
+        self,
+        collection: str,
+        doc_id: str,
+        document: Dict[str, Any],
+        expected_version: int,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Compare-and-swap replacement of a whole document (semantics as update_if_version)."""
+        document["_id"] = doc_id
+        return await self._write_if_version(
+            session, collection, doc_id, expected_version, "CAST(:document AS jsonb)", {"document": document}
+        )
+
+    @db_operation()
+    async def increment_counter(
+        self,
+        collection: str,
+        doc_id: str,
+        field: str,
+        amount: int = 1,
+        defaults: Optional[Dict[str, Any]] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> int:
+        """
+        Atomically add `amount` to a numeric field and return the new value, creating
+        the document (from `defaults`, field starting at 0) if it doesn't exist. One
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement, so concurrent callers
+        always see distinct values. Pass `session` to run inside an open transaction;
+        the row stays locked until it commits.
+        """
+        stmt = text("""
+            INSERT INTO documents (collection_name, doc_id, data, updated_at)
+            VALUES (
+                :collection, :doc_id,
+                documents_inc_path(CAST(:initial AS jsonb), CAST(:path AS text[]), CAST(:amount AS numeric)),
+                CURRENT_TIMESTAMP
             )
-            await session.commit()
-        return True
+            ON CONFLICT (collection_name, doc_id) DO UPDATE
+                SET data = documents_inc_path(documents.data, CAST(:path AS text[]), CAST(:amount AS numeric)),
+                    updated_at = CURRENT_TIMESTAMP
+            RETURNING data #> CAST(:path AS text[])
+        """)
+        params = {
+            "collection": collection,
+            "doc_id": doc_id,
+            "initial": {**(defaults or {}), "_id": doc_id},
+            "path": split_path(field),
+            "amount": amount,
+        }
+        if session is not None:
+            value = (await session.execute(stmt, params)).scalar()
+            await self._invalidate_cached(session, collection, [doc_id])
+        else:
+            async with self._session() as own_session:
+                value = (await own_session.execute(stmt, params)).scalar()
+                await self._invalidate_cached(own_session, collection, [doc_id])
+        return int(value)
 
     async def _upsert_with_session(self, session: AsyncSession, collection: str, document: Dict[str, Any]) -> str:
         """Internal helper to upsert using an existing session."""
@@ -155,105 +1144,408 @@ class DBAdapter:
         await session.execute(
             text("""
                 INSERT INTO documents (collection_name, doc_id, data, updated_at)
-                VALUES (:collection, :doc_id, CAST(:data AS jsonb), CURRENT_TIMESTAMP)
+                VALUES (:collection, :doc_id, :data, CURRENT_TIMESTAMP)
                 ON CONFLICT (collection_name, doc_id)
-                DO UPDATE SET data = CAST(:data AS jsonb), updated_at = CURRENT_TIMESTAMP
+                DO UPDATE SET data = EXCLUDED.data, updated_at = CURRENT_TIMESTAMP
             """),
-            {"collection": collection, "doc_id": doc_id, "data": json.dumps(document)}
+            {"collection": collection, "doc_id": doc_id, "data": document}
         )
+        await self._invalidate_cached(session, collection, [doc_id])
         return doc_id
 
-    async def upsert_document(self, session: AsyncSession, collection: str, document: Dict[str, Any]) -> str:
-        """Public helper to upsert within an existing transaction."""
+    @db_operation(rows=lambda result: result["written"])
+    async def insert_many(
+        self,
+        collection: str,
+        documents: Sequence[Dict[str, Any]],
+        on_conflict: str = "error",
+        batch_size: Optional[int] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> Dict[str, Any]:
+        """
+        Insert documents with one multi-row statement per batch.
+
+        Each batch is sent as a single INSERT ... SELECT FROM unnest(...); from
+        config.BULK_COPY_THRESHOLD documents on, batches are COPYed into a temporary
+        staging table and merged instead. All batches share one transaction (the caller's
+        when `session` is given). Missing `_id`s are generated as in insert().
+
+        on_conflict: "error" (raise on an existing doc_id), "ignore" (keep the
+        stored document) or "update" (replace it).
+
+        Returns:
+            {"ids": doc ids in input order, "written": rows inserted/updated,
+             "batches": [{"rows", "written", "method", "seconds"}, ...]}
+        """
+        if on_conflict not in ("error", "ignore", "update"):
+            raise ValueError(f"on_conflict must be 'error', 'ignore' or 'update', got {on_conflict!r}")
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        ids: List[str] = []
+        for document in documents:
+            document["_id"] = document.get("_id") or str(uuid.uuid4())
+            ids.append(document["_id"])
+        result: Dict[str, Any] = {"ids": ids, "written": 0, "batches": []}
+        if not ids:
+            return result
+
+        if session is not None:
+            await self._insert_batches(session, collection, documents, on_conflict, batch_size, result)
+            await self._invalidate_cached(session, collection, ids)
+        else:
+            async with self._session() as own_session:
+                await self._insert_batches(own_session, collection, documents, on_conflict, batch_size, result)
+                await self._invalidate_cached(own_session, collection, ids)
+        return result
+
+    async def _insert_batches(
+        self,
+        session: AsyncSession,
+        collection: str,
+        documents: Sequence[Dict[str, Any]],
+        on_conflict: str,
+        batch_size: int,
+        result: Dict[str, Any],
+    ) -> None:
+        conflict_sql = {
+            "error": "",
+            "ignore": "ON CONFLICT (collection_name, doc_id) DO NOTHING",
+            "update": "ON CONFLICT (collection_name, doc_id) "
+                      "DO UPDATE SET data = EXCLUDED.data, updated_at = CURRENT_TIMESTAMP",
+        }[on_conflict]
+        use_copy = len(documents) >= config.BULK_COPY_THRESHOLD
+        staging_ready = False
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            if on_conflict != "error":
+                # One statement can't touch the same row twice; keep the document that would win
+                by_id = {}
+                for document in batch:
+                    if on_conflict == "update" or document["_id"] not in by_id:
+                        by_id[document["_id"]] = document
+                batch = list(by_id.values())
+            doc_ids = [document["_id"] for document in batch]
+            started = time.perf_counter()
+
+            if use_copy:
+                method = "copy"
+                if not staging_ready:
+                    await session.execute(text(
+                        "CREATE TEMP TABLE IF NOT EXISTS documents_staging "
+                        "(doc_id VARCHAR(255), data JSONB) ON COMMIT DROP"
+                    ))
+                    staging_ready = True
+                raw_connection = await (await session.connection()).get_raw_connection()
+                await raw_connection.driver_connection.copy_records_to_table(
+                    "documents_staging", records=zip(doc_ids, batch), columns=["doc_id", "data"]
+                )
+                written = (await session.execute(text(f"""
+                    INSERT INTO documents (collection_name, doc_id, data, updated_at)
+                    SELECT :collection, doc_id, data, CURRENT_TIMESTAMP FROM documents_staging
+                    {conflict_sql}
+                """), {"collection": collection})).rowcount
+                await session.execute(text("TRUNCATE documents_staging"))
+            else:
+                method = "values"
+                written = (await session.execute(text(f"""
+                    INSERT INTO documents (collection_name, doc_id, data, updated_at)
+                    SELECT :collection, batch.doc_id, batch.data, CURRENT_TIMESTAMP
+                    FROM unnest(CAST(:doc_ids AS varchar[]), CAST(:payloads AS jsonb[])) AS batch(doc_id, data)
+                    {conflict_sql}
+                """), {"collection": collection, "doc_ids": doc_ids, "payloads": batch})).rowcount
+
+            seconds = time.perf_counter() - started
+            result["written"] += written
+            result["batches"].append({"rows": len(batch), "written": written, "method": method, "seconds": seconds})
+            logger.debug("insert_many %s: %s batch of %d rows in %.3fs", collection, method, len(batch), seconds)
+
+    @db_operation(rows=lambda result: result["affected"])
+    async def update_many(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+        progress: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Apply a partial update (see db_updates) to every document matching `filters`
+        (as in query_collection), in id-ordered batches of one statement and one
+        short transaction each, sleeping `pause_sec` between batches.
+
+        Each document is visited once, even if the update changes whether it matches.
+        `progress` (sync or async) is called after every batch with
+        {"batch", "scanned", "affected", "total_affected", "seconds"}.
+
+        Returns:
+            {"affected": updated documents, "batches": batches, "seconds": elapsed}
+        """
+        data_expr, update_params = compile_update(set_fields, inc_fields, None, unset_fields, data_column="d.data")
+        return await self._run_batched(
+            collection,
+            filters,
+            f"""
+                UPDATE documents d SET data = {data_expr}, updated_at = CURRENT_TIMESTAMP
+                FROM batch WHERE d.collection_name = :collection AND d.id = batch.id AND {{where}}
+                RETURNING d.id
+            """,
+            update_params,
+            batch_size,
+            pause_sec,
+            progress,
+        )
+
+    @db_operation(rows=lambda result: result["affected"])
+    async def delete_many(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+        progress: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        id_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Delete every document matching `filters` (as in query_collection) in batches;
+        batching, pausing and progress work as in update_many. `id_prefix` keeps only
+        documents whose ID starts with it (a doc_id LIKE range, no document is read).
+
+        Returns:
+            {"affected": deleted documents, "batches": batches, "seconds": elapsed}
+        """
+        return await self._run_batched(
+            collection,
+            filters,
+            """
+                DELETE FROM documents d USING batch
+                WHERE d.collection_name = :collection AND d.id = batch.id AND {where}
+                RETURNING d.id
+            """,
+            {},
+            batch_size,
+            pause_sec,
+            progress,
+            id_prefix,
+        )
+
+    async def _run_batched(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]],
+        write_sql: str,
+        write_params: Dict[str, Any],
+        batch_size: Optional[int],
+        pause_sec: Optional[float],
+        progress: Optional[Callable[[Dict[str, Any]], Any]],
+        id_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run `write_sql` (joined to a `batch` of ids) over matching documents batch by batch."""
         await self._ensure_schema()
-        return await self._upsert_with_session(session, collection, document)
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        pause_sec = config.BULK_PAUSE_SEC if pause_sec is None else pause_sec
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        where_sql, params = self._compile_shorthand(filters, data_column="d.data")
+        where_sql = f"({where_sql})" if where_sql else "TRUE"
+        if id_prefix:
+            where_sql += " AND d.doc_id LIKE :id_pattern"
+            params["id_pattern"] = _prefix_pattern(id_prefix)
+        params.update(write_params)
+        params.update({"collection": collection, "batch_size": batch_size})
+        write_sql = write_sql.replace("{where}", where_sql)
+        # The filter is checked again by the write so rows changed after the batch was read are skipped
+        stmt = text(f"""
+            WITH batch AS (
+                SELECT d.id FROM documents d
+                WHERE d.collection_name = :collection AND {where_sql} AND d.id > :after_id
+                ORDER BY d.id
+                LIMIT :batch_size
+            ), written AS (
+                {write_sql}
+            )
+            SELECT (SELECT COUNT(*) FROM batch), (SELECT MAX(id) FROM batch), (SELECT COUNT(*) FROM written)
+        """)
+
+        started = time.perf_counter()
+        after_id = 0
+        affected = 0
+        batches = 0
+        while True:
+            batch_started = time.perf_counter()
+            async with self.SessionFactory() as session:
+                async with session.begin():
+                    scanned, last_id, written = (await session.execute(stmt, {**params, "after_id": after_id})).one()
+                    if written:
+                        await self._invalidate_cached(session, collection)
+            if not scanned:
+                break
+            batches += 1
+            affected += written
+            after_id = last_id
+            if progress is not None:
+                report = progress({
+                    "batch": batches,
+                    "scanned": scanned,
+                    "affected": written,
+                    "total_affected": affected,
+                    "seconds": time.perf_counter() - batch_started,
+                })
+                if inspect.isawaitable(report):
+                    await report
+            if scanned < batch_size:
+                break
+            if pause_sec:
+                await asyncio.sleep(pause_sec)
 
-    async def insert_document(self, session: AsyncSession, collection: str, document: Dict[str, Any]) -> str:
-        """Insert document using an existing session (upsert semantics)."""
+        seconds = time.perf_counter() - started
+        logger.info("%s batched write: %d documents in %d batches (%.2fs)", collection, affected, batches, seconds)
+        return {"affected": affected, "batches": batches, "seconds": seconds}
+
+    @db_operation(rows=int)
+    async def patch_many(
+        self,
+        collection: str,
+        patches: Dict[str, Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+    ) -> int:
+        """
+        Merge a different top-level patch into each document ({doc_id: {field: value}}),
+        one UPDATE ... FROM unnest(...) statement per batch. Returns updated documents.
+        """
         await self._ensure_schema()
-        return await self._upsert_with_session(session, collection, document)
-    
-    async def upsert(self, collection: str, doc_id: str, document: Dict[str, Any]) -> str:
-        """Insert or update document"""
-        document["_id"] = doc_id
-        await self.insert(collection, document)
-        return doc_id
-    
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        pause_sec = config.BULK_PAUSE_SEC if pause_sec is None else pause_sec
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        stmt = text("""
+            UPDATE documents d SET data = d.data || patch.data, updated_at = CURRENT_TIMESTAMP
+            FROM unnest(CAST(:doc_ids AS varchar[]), CAST(:patches AS jsonb[])) AS patch(doc_id, data)
+            WHERE d.collection_name = :collection AND d.doc_id = patch.doc_id
+        """)
+        items = list(patches.items())
+        updated = 0
+        for start in range(0, len(items), batch_size):
+            if start and pause_sec:
+                await asyncio.sleep(pause_sec)
+            batch = items[start:start + batch_size]
+            async with self.SessionFactory() as session:
+                async with session.begin():
+                    result = await session.execute(stmt, {
+                        "collection": collection,
+                        "doc_ids": [doc_id for doc_id, _ in batch],
+                        "patches": [patch for _, patch in batch],
+                    })
+                    updated += result.rowcount
+                    await self._invalidate_cached(session, collection, [doc_id for doc_id, _ in batch])
+        return updated
+
+    @db_operation()
     async def delete(self, collection: str, doc_id: str) -> bool:
         """Delete document"""
-        await self._ensure_schema()
-        async with self.SessionFactory() as session:
+        async with self._session() as session:
             result = await session.execute(
                 text("DELETE FROM documents WHERE collection_name = :collection AND doc_id = :doc_id"),
                 {"collection": collection, "doc_id": doc_id}
             )
-            await session.commit()
+            await self._invalidate_cached(session, collection, [doc_id])
             return result.rowcount > 0
     
-    async def find(self, collection: str, predicate: Optional[Callable[[Dict], bool]] = None) -> List[Dict[str, Any]]:
+    @db_operation()
+    async def find(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+        projection: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Find documents matching predicate.
-        Predicate is a function that takes a document and returns True/False.
-        If no predicate, returns all documents in collection.
+        Find documents matching a filter document (operators: see db_filters).
+        Filtering, sorting (by dotted path) and pagination all run server-side.
+        If no filters, returns all documents in collection.
+        `projection` limits documents to `_id` and the given paths (see db_projection).
+
+        `predicate` is the legacy slow path: a Python callable applied after the
+        SQL filter, which means transferring every candidate row. It is logged on
+        every use; prefer expressing the condition as a filter document.
         """
-        await self._ensure_schema()
-        async with self.SessionFactory() as session:
+        if callable(filters):
+            predicate, filters = filters, None
+
+        where_sql, params = compile_filter(filters, column_map=FILTER_COLUMNS)
+        params["collection"] = collection
+        projection = normalize_projection(projection)
+        select_sql = "data"
+        if projection and predicate is None:
+            select_sql, projection_params = compile_projection(projection)
+            params.update(projection_params)
+
+        order_sql = "id"
+        if sort_by:
+            sort_dir_sql = "DESC" if str(sort_dir).lower() == "desc" else "ASC"
+            order_sql = f"data #> CAST(:sort_path AS text[]) {sort_dir_sql}, id {sort_dir_sql}"
+            params["sort_path"] = split_path(sort_by)
+
+        page_sql = ""
+        if predicate is None:
+            if limit is not None:
+                page_sql += " LIMIT :limit"
+                params["limit"] = limit
+            if offset:
+                page_sql += " OFFSET :offset"
+                params["offset"] = offset
+
+        async with self._session() as session:
             result = await session.execute(
-                text("SELECT data FROM documents WHERE collection_name = :collection"),
-                {"collection": collection}
-            )
-            rows = result.fetchall()
-            documents = [row[0] for row in rows]
-            
-            if predicate:
-                documents = [doc for doc in documents if predicate(doc)]
-            
-            return documents
-    
-    async def find_one(self, collection: str, predicate: Callable[[Dict], bool]) -> Optional[Dict[str, Any]]:
-        """Find first document matching predicate"""
-        results = await self.find(collection, predicate)
-        return results[0] if results else None
-    
-    async def inc(self, collection: str, doc_id: str, field: str, amount: float = 1.0) -> bool:
-        """Increment numeric field"""
-        doc = await self.get(collection, doc_id)
-        if not doc:
-            return False
-        
-        # Handle nested fields
-        parts = field.split(".")
-        current = doc
-        
-        for i, part in enumerate(parts[:-1]):
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        
-        last_key = parts[-1]
-        current[last_key] = current.get(last_key, 0) + amount
-        
-        # Save updated document
-        async with self.SessionFactory() as session:
-            await session.execute(
-                text("""
-                    UPDATE documents 
-                    SET data = CAST(:data AS jsonb), updated_at = CURRENT_TIMESTAMP
-                    WHERE collection_name = :collection AND doc_id = :doc_id
+                text(f"""
+                    SELECT {select_sql} FROM documents
+                    WHERE collection_name = :collection AND ({where_sql})
+                    ORDER BY {order_sql}{page_sql}
                 """),
-                {"collection": collection, "doc_id": doc_id, "data": json.dumps(doc)}
+                params
             )
-            await session.commit()
-        return True
-    
-    async def list_collection(self, collection: str) -> List[Dict[str, Any]]:
-        """List all documents in collection"""
-        return await self.find(collection)
+            documents = [row[0] for row in result.fetchall()]
+        if projection and predicate is None:
+            documents = [expand_projection(doc, projection) for doc in documents]
+
+        if predicate is not None:
+            logger.warning(
+                "Slow path: in-Python predicate scan over %s (%d candidate rows); use a filter document instead",
+                collection,
+                len(documents),
+            )
+            documents = [doc for doc in documents if predicate(doc)]
+            end = offset + limit if limit is not None else None
+            documents = documents[offset:end]
+            if projection:
+                documents = [project(doc, projection) for doc in documents]
+
+        return documents
     
-    async def count(self, collection: str, predicate: Optional[Callable[[Dict], bool]] = None) -> int:
-        """Count documents matching predicate"""
-        results = await self.find(collection, predicate)
-        return len(results)
+    def _compile_shorthand(
+        self,
+        filters: Optional[Dict[str, Any]],
+        param_prefix: str = "f",
+        data_column: str = "data",
+    ):
+        """
+        Compile shorthand/DSL filters (see _shorthand_document) into
+        (sql or None when unfiltered, params).
+        """
+        document = self._shorthand_document(filters)
+        if not document:
+            return None, {}
+        return compile_filter(document, param_prefix=param_prefix, data_column=data_column, column_map=FILTER_COLUMNS)
 
     async def _build_filtered_query(
         self,
@@ -261,54 +1553,44 @@ class DBAdapter:
         filters: Optional[Dict[str, Any]] = None
     ):
         """
-        Build SQL WHERE clause parts and params for common filters.
-        Supported filters: dataset_type_id, language, status, finalized, uploader_id, reviewer_id.
+        Build SQL WHERE clause parts and params for common filters (see _compile_shorthand).
         """
         where_clauses = ["collection_name = :collection"]
         params: Dict[str, Any] = {"collection": collection}
-        filters = filters or {}
-
-        def _json_equals(path: str, key: str, value: Any):
-            where_clauses.append(f"{path} = :{key}")
-            params[key] = value
-
-        def _json_in(path: str, key: str, values: Sequence[Any]):
-            where_clauses.append(f"{path} = ANY(:{key})")
-            params[key] = list(values)
 
-        if "dataset_type_id" in filters and filters["dataset_type_id"]:
-            _json_equals("data->>'dataset_type_id'", "dataset_type_id", filters["dataset_type_id"])
+        where_sql, filter_params = self._compile_shorthand(filters)
+        if where_sql:
+            where_clauses.append(f"({where_sql})")
+            params.update(filter_params)
 
-        if "language" in filters and filters["language"]:
-            langs = filters["language"]
-            if isinstance(langs, (list, tuple, set)):
-                _json_in("data->>'language'", "language", langs)
-            else:
-                _json_equals("data->>'language'", "language", langs)
-
-        if "status" in filters and filters["status"]:
-            _json_equals("data->'review_state'->>'status'", "status", filters["status"])
-
-        if "finalized" in filters and filters["finalized"] is not None:
-            where_clauses.append("(data->'review_state'->>'finalized')::boolean = :finalized")
-            params["finalized"] = bool(filters["finalized"])
-
-        if "uploader_id" in filters and filters["uploader_id"]:
-            _json_equals("data->>'uploader_id'", "uploader_id", filters["uploader_id"])
-
-        if "reviewer_id" in filters and filters["reviewer_id"]:
-            _json_equals("data->>'reviewer_id'", "reviewer_id", filters["reviewer_id"])
-
-        if "flagged" in filters and filters["flagged"] is not None:
-            where_clauses.append("(data->>'flagged')::boolean = :flagged")
-            params["flagged"] = bool(filters["flagged"])
+        return where_clauses, params
 
-        if "is_gold" in filters and filters["is_gold"] is not None:
-            where_clauses.append("(data->>'is_gold')::boolean = :is_gold")
-            params["is_gold"] = bool(filters["is_gold"])
+    @staticmethod
+    def _keyset_clause(order_expr: str, sql_type: str, nullable: bool, descending: bool, value: Any) -> str:
+        """WHERE clause selecting rows after the cursor position in (order_expr, id) order."""
+        # ASC sorts NULLs last and DESC sorts them first (PostgreSQL defaults)
+        if value is None:
+            if descending:
+                return f"(({order_expr} IS NULL AND id < :cursor_id) OR {order_expr} IS NOT NULL)"
+            return f"({order_expr} IS NULL AND id > :cursor_id)"
+        # Row comparison keeps the (sort key, id) range scan index-friendly
+        op = "<" if descending else ">"
+        clause = f"({order_expr}, id) {op} (CAST(CAST(:cursor_value AS text) AS {sql_type}), :cursor_id)"
+        if nullable and not descending:
+            clause = f"({clause} OR {order_expr} IS NULL)"
+        return clause
 
-        return where_clauses, params
+    async def _estimate_rows(self, session: AsyncSession, where_sql: str, params: Dict[str, Any]) -> int:
+        """Planner row estimate for a filtered scan (no rows are read)."""
+        result = await session.execute(
+            text(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM documents WHERE {where_sql}"), params
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
+    @db_operation(rows=lambda result: len(result["items"]))
     async def query_collection(
         self,
         collection: str,
@@ -316,167 +1598,687 @@ class DBAdapter:
         sort_by: str = "created_at",
         sort_dir: str = "desc",
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+        count_filters: Optional[Dict[str, Dict[str, Any]]] = None,
+        projection: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
         """
         Server-side filtered, sorted, paginated query.
         New code should prefer this over in-Python scans.
-        If filters/limits are not provided, falls back to list_collection behavior.
+
+        Pagination: pages are ordered by (sort key, id). Every limited page returns a
+        `next_cursor` (None on the last page); passing it back as `cursor` continues
+        after that row, so deep pages cost O(limit) instead of O(offset).
+
+        Counting: `count` is "exact", "estimate" (planner estimate, no scan) or "none"
+        (total is None). `count_filters` ({name: filters}) adds per-name counts within
+        the filtered set, returned under "counts" and computed in the same
+        COUNT(*) FILTER (...) query as the total.
+
+        `projection` limits items to `_id` and the given paths (see db_projection).
         """
-        await self._ensure_schema()
-        if not filters and limit is None and offset == 0 and sort_by == "created_at":
+        if count not in ("exact", "estimate", "none"):
+            raise ValueError(f"count must be 'exact', 'estimate' or 'none', got {count!r}")
+        if cursor and offset:
+            raise ValueError("Use either cursor or offset pagination, not both")
+        if (not filters and limit is None and offset == 0 and sort_by == "created_at"
+                and not cursor and not count_filters and not projection):
             items = await self.list_collection(collection)
-            return {"items": items, "total": len(items)}
+            return {"items": items, "total": len(items), "next_cursor": None, "counts": {}}
 
         where_clauses, params = await self._build_filtered_query(collection, filters)
+        where_sql = " AND ".join(where_clauses)
 
         # Sorting
-        sort_dir_sql = "DESC" if str(sort_dir).lower() == "desc" else "ASC"
-        if sort_by == "updated_at":
-            order_expr = "updated_at"
-        elif sort_by == "item_number":
-            order_expr = "(data->>'item_number')::bigint"
-        else:
-            # default to created_at from data or fallback to created_at column
-            order_expr = "COALESCE((data->>'created_at')::timestamptz, created_at)"
+        sort_key = sort_by if sort_by in QUERY_SORTS else "created_at"
+        order_expr, sql_type, nullable = QUERY_SORTS[sort_key]
+        descending = str(sort_dir).lower() == "desc"
+        sort_dir_sql = "DESC" if descending else "ASC"
 
-        where_sql = " AND ".join(where_clauses)
+        page_clauses = list(where_clauses)
+        page_params = dict(params)
+        if cursor:
+            position = decode_cursor(cursor, sort_key, sort_dir_sql)
+            page_clauses.append(self._keyset_clause(order_expr, sql_type, nullable, descending, position["value"]))
+            page_params["cursor_value"] = None if position["value"] is None else str(position["value"])
+            page_params["cursor_id"] = position["id"]
 
-        count_sql = text(f"""
-            SELECT COUNT(*) FROM documents
-            WHERE {where_sql}
-        """)
+        projection = normalize_projection(projection)
+        select_sql = "data"
+        if projection:
+            select_sql, projection_params = compile_projection(projection)
+            page_params.update(projection_params)
 
+        limit = limit if limit is not None else 1000
+        # One extra row tells whether another page follows
         query_sql = text(f"""
-            SELECT data FROM documents
-            WHERE {where_sql}
-            ORDER BY {order_expr} {sort_dir_sql}
+            SELECT {select_sql}, id, {order_expr} AS sort_value FROM documents
+            WHERE {" AND ".join(page_clauses)}
+            ORDER BY {order_expr} {sort_dir_sql}, id {sort_dir_sql}
             LIMIT :limit OFFSET :offset
         """)
+        page_params["limit"] = limit + 1
+        page_params["offset"] = 0 if cursor else offset
 
-        params["limit"] = limit if limit is not None else 1000
-        params["offset"] = offset
+        count_names = list(count_filters or {})
+        facet_clauses = []
+        for index, name in enumerate(count_names):
+            facet_sql, facet_params = self._compile_shorthand(count_filters[name], param_prefix=f"c{index}_")
+            facet_clauses.append(facet_sql or "TRUE")
+            params.update(facet_params)
 
-        async with self.SessionFactory() as session:
-            count_result = await session.execute(count_sql, params)
-            total = count_result.scalar() or 0
+        total: Optional[int] = None
+        counts: Dict[str, Optional[int]] = {name: None for name in count_names}
+        async with self._session() as session:
+            if count == "exact":
+                count_exprs = ["COUNT(*)"] + [f"COUNT(*) FILTER (WHERE {clause})" for clause in facet_clauses]
+                count_row = (await session.execute(
+                    text(f"SELECT {', '.join(count_exprs)} FROM documents WHERE {where_sql}"), params
+                )).one()
+                total = count_row[0] or 0
+                counts = {name: count_row[i + 1] or 0 for i, name in enumerate(count_names)}
+            elif count == "estimate":
+                total = await self._estimate_rows(session, where_sql, params)
+                for name, clause in zip(count_names, facet_clauses):
+                    counts[name] = await self._estimate_rows(session, f"{where_sql} AND ({clause})", params)
 
-            result = await session.execute(query_sql, params)
+            result = await session.execute(query_sql, page_params)
             rows = result.fetchall()
-            items = [row[0] for row in rows]
 
-        return {"items": items, "total": total}
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(sort_key, sort_dir_sql, last[2], last[1])
+        items = [row[0] for row in rows]
+        if projection:
+            items = [expand_projection(item, projection) for item in items]
 
+        return {"items": items, "total": total, "next_cursor": next_cursor, "counts": counts}
+
+    @db_operation()
     async def count_documents(self, collection: str, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count documents server-side using common filters."""
-        await self._ensure_schema()
         where_clauses, params = await self._build_filtered_query(collection, filters)
         where_sql = " AND ".join(where_clauses)
         count_sql = text(f"SELECT COUNT(*) FROM documents WHERE {where_sql}")
-        async with self.SessionFactory() as session:
+        async with self._session() as session:
             result = await session.execute(count_sql, params)
             return result.scalar() or 0
 
-    async def claim_next_dataset_item(
+    @db_operation()
+    async def aggregate(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Optional[Sequence[str]] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        lookup: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Group documents matching `filters` (as in query_collection) and compute metrics
+        in one GROUP BY query; see db_aggregate for path and metric syntax.
+
+        `lookup=(collection, path)` LEFT JOINs the document whose ID is stored at `path`,
+        so "$lookup.<path>" can group by a field of the referenced document.
+
+        Returns one dict per group, keyed by the group_by paths and metric names.
+        """
+        group_by = list(group_by or [])
+        select, joins, params = compile_aggregate(group_by, metrics, column_map=FILTER_COLUMNS, lookup=bool(lookup))
+        names = group_by + list(metrics or {})
+
+        from_sql = "documents d"
+        if lookup:
+            lookup_collection, lookup_path = lookup
+            from_sql += (
+                " LEFT JOIN documents l ON l.collection_name = :lookup_collection"
+                " AND l.doc_id = d.data #>> CAST(:lookup_path AS text[])"
+            )
+            params.update({"lookup_collection": lookup_collection, "lookup_path": split_path(lookup_path)})
+        where_sql, filter_params = self._compile_shorthand(filters, data_column="d.data")
+        params.update(filter_params)
+        params["collection"] = collection
+
+        ordinals = ", ".join(str(i) for i in range(1, len(group_by) + 1))
+        stmt = text(f"""
+            SELECT {", ".join(select)}
+            FROM {from_sql} {" ".join(joins)}
+            WHERE d.collection_name = :collection{f" AND ({where_sql})" if where_sql else ""}
+            {f"GROUP BY {ordinals} ORDER BY {ordinals}" if group_by else ""}
+        """)
+        async with self._session() as session:
+            result = await session.execute(stmt, params)
+            return [dict(zip(names, row)) for row in result.fetchall()]
+
+    @db_operation(rows=int)
+    async def sync_search_index(self, batch_size: Optional[int] = None) -> int:
+        """
+        Index the documents the search triggers queued (see db_search); search() runs
+        this first. Each batch is claimed with SKIP LOCKED in its own transaction, so
+        concurrent callers split the queue. Returns processed documents.
+        """
+        await self._ensure_schema()
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        claim = text(f"""
+            DELETE FROM {SEARCH_QUEUE_TABLE} q
+            USING (
+                SELECT collection_name, doc_id FROM {SEARCH_QUEUE_TABLE}
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            ) batch
+            WHERE q.collection_name = batch.collection_name AND q.doc_id = batch.doc_id
+            RETURNING q.collection_name, q.doc_id
+        """)
+        fetch = text("""
+            SELECT doc_id, data #> CAST(:path AS text[]) FROM documents
+            WHERE collection_name = :collection AND doc_id = ANY(CAST(:doc_ids AS varchar[]))
+        """)
+        store = text(f"""
+            INSERT INTO {SEARCH_TABLE} (collection_name, doc_id, search_text, tsv, indexed_at)
+            SELECT :collection, entry.doc_id, entry.search_text, CAST(entry.tsv AS tsvector), CURRENT_TIMESTAMP
+            FROM unnest(CAST(:doc_ids AS varchar[]), CAST(:texts AS text[]), CAST(:tsvs AS text[]))
+                AS entry(doc_id, search_text, tsv)
+            ON CONFLICT (collection_name, doc_id) DO UPDATE
+                SET search_text = EXCLUDED.search_text, tsv = EXCLUDED.tsv, indexed_at = EXCLUDED.indexed_at
+        """)
+        drop = text(f"""
+            DELETE FROM {SEARCH_TABLE}
+            WHERE collection_name = :collection AND doc_id = ANY(CAST(:doc_ids AS varchar[]))
+        """)
+
+        processed = 0
+        while True:
+            async with self.SessionFactory() as session:
+                async with session.begin():
+                    queued = (await session.execute(claim, {"batch_size": batch_size})).fetchall()
+                    by_collection: Dict[str, List[str]] = {}
+                    for collection, doc_id in queued:
+                        by_collection.setdefault(collection, []).append(doc_id)
+                    for collection, doc_ids in by_collection.items():
+                        values = {}
+                        if collection in SEARCH_FIELDS:
+                            result = await session.execute(fetch, {
+                                "collection": collection,
+                                "doc_ids": doc_ids,
+                                "path": split_path(SEARCH_FIELDS[collection]),
+                            })
+                            values = dict(result.fetchall())
+                        # Deleted documents (and collections no longer indexed) leave the index
+                        missing = [doc_id for doc_id in doc_ids if doc_id not in values]
+                        if missing:
+                            await session.execute(drop, {"collection": collection, "doc_ids": missing})
+                        if values:
+                            entries = {doc_id: index_entry(value) for doc_id, value in values.items()}
+                            await session.execute(store, {
+                                "collection": collection,
+                                "doc_ids": list(entries),
+                                "texts": [entry["search_text"] for entry in entries.values()],
+                                "tsvs": [entry["tsv"] for entry in entries.values()],
+                            })
+            processed += len(queued)
+            if len(queued) < batch_size:
+                return processed
+
+    @db_operation(rows=lambda result: len(result["items"]))
+    async def search(
+        self,
+        collection: str,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        count: str = "exact",
+        count_filters: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ranked full-text search over a collection's indexed field (db_search.SEARCH_FIELDS).
+
+        `query` is tokenised like the indexed text and every token must match the start
+        of a word; with pg_trgm installed, the normalised query also matches as a
+        substring and trigram similarity adds to the rank. `filters`, `count` and
+        `count_filters` work as in query_collection ("estimate" counts exactly, since
+        only matching documents are counted).
+
+        Returns {"items", "total", "counts", "has_more"}, best matches first.
+        """
+        if collection not in SEARCH_FIELDS:
+            raise ValueError(f"Collection {collection!r} has no search index")
+        if count not in ("exact", "estimate", "none"):
+            raise ValueError(f"count must be 'exact', 'estimate' or 'none', got {count!r}")
+        if limit < 1 or offset < 0:
+            raise ValueError("limit must be positive and offset non-negative")
+
+        count_names = list(count_filters or {})
+        tokens = tokenize(query)
+        if not tokens:
+            zero = 0 if count != "none" else None
+            return {"items": [], "total": zero, "counts": {name: zero for name in count_names}, "has_more": False}
+        await self.sync_search_index()
+
+        params: Dict[str, Any] = {"collection": collection, "tsquery": to_tsquery_literal(tokens)}
+        match_sql = "tsv @@ CAST(:tsquery AS tsquery)"
+        score_sql = "ts_rank_cd(tsv, CAST(:tsquery AS tsquery))"
+        if self._search_trigram:
+            normalized = " ".join(tokens)
+            params.update({"pattern": like_pattern(normalized), "normalized": normalized})
+            match_sql = f"({match_sql} OR search_text LIKE :pattern)"
+            score_sql = f"{score_sql} + similarity(search_text, :normalized)"
+        matches_sql = f"""
+            WITH matches AS (
+                SELECT doc_id, {score_sql} AS score FROM {SEARCH_TABLE}
+                WHERE collection_name = :collection AND {match_sql}
+            )
+        """
+
+        where_clauses, filter_params = await self._build_filtered_query(collection, filters)
+        params.update(filter_params)
+        where_sql = " AND ".join(where_clauses)
+        facet_clauses = []
+        for index, name in enumerate(count_names):
+            facet_sql, facet_params = self._compile_shorthand(count_filters[name], param_prefix=f"c{index}_")
+            facet_clauses.append(facet_sql or "TRUE")
+            params.update(facet_params)
+
+        total: Optional[int] = None
+        counts: Dict[str, Optional[int]] = {name: None for name in count_names}
+        async with self._session() as session:
+            if count != "none":
+                count_exprs = ["COUNT(*)"] + [f"COUNT(*) FILTER (WHERE {clause})" for clause in facet_clauses]
+                count_row = (await session.execute(text(f"""
+                    {matches_sql}
+                    SELECT {', '.join(count_exprs)} FROM documents JOIN matches USING (doc_id)
+                    WHERE {where_sql}
+                """), params)).one()
+                total = count_row[0] or 0
+                counts = {name: count_row[i + 1] or 0 for i, name in enumerate(count_names)}
+            # One extra row tells whether another page follows
+            result = await session.execute(text(f"""
+                {matches_sql}
+                SELECT data FROM documents JOIN matches USING (doc_id)
+                WHERE {where_sql}
+                ORDER BY matches.score DESC, id
+                LIMIT :limit OFFSET :offset
+            """), {**params, "limit": limit + 1, "offset": offset})
+            items = [row[0] for row in result.fetchall()]
+
+        return {"items": items[:limit], "total": total, "counts": counts, "has_more": len(items) > limit}
+
+    @db_operation(rows=len)
+    async def claim_next_dataset_items(
         self,
         languages: Optional[Sequence[str]],
         lock_owner: str,
+        limit: int = 1,
         lock_timeout_sec: int = 180,
         dataset_type_id: Optional[str] = None
-    ) -> Optional[Dict[str, Any]]:
+    ) -> List[Dict[str, Any]]:
         """
-        Atomically claim the next eligible dataset item using SQL (no in-Python scan).
+        Atomically claim up to `limit` eligible dataset items, oldest first, in one
+        statement (no in-Python scan). Each claimed item gets its own lease in
+        item_leases, expiring lock_timeout_sec after the claim; the documents are
+        not written. Returned items show the lease as review_state.status
+        "in_review", lock_owner and lock_time (see leased_item).
         
         Eligibility:
         - Not finalized
         - Language matches provided list (if any)
-        - Status pending OR stale in_review lock older than lock_timeout_sec
+        - Status pending and no unexpired lease (expired leases and stale in_review
+          locks are reclaimed by reap_expired_leases/QueueService.reap_stale_locks)
         - Optional dataset_type_id filter
         """
-        await self._ensure_schema()
+        if limit < 1:
+            raise ValueError("limit must be positive")
         languages = list(languages) if languages else []
         lang_filter = bool(languages)
         now = datetime.utcnow()
-        stale_cutoff = now - timedelta(seconds=lock_timeout_sec)
+        params = {
+            "languages": languages,
+            "lang_filter": lang_filter,
+            "lock_owner": lock_owner,
+            "reviewer_ids_jsonb": [lock_owner],
+            "expires_at": now + timedelta(seconds=lock_timeout_sec),
+            "dataset_type_id": dataset_type_id,
+            "limit": limit,
+            "scope": claim_scope(languages, dataset_type_id),
+            "now": now,
+            "rebuild_cutoff": now - timedelta(seconds=config.CLAIM_WATERMARK_TTL_SEC),
+        }
+        use_watermark = config.CLAIM_WATERMARK_TTL_SEC > 0
 
-        async with self.SessionFactory() as session:
-            stmt = text("""
+        async with self._session() as session:
+            watermark = None
+            if use_watermark:
+                watermark = (await session.execute(text("""
+                    SELECT created_at, item_id FROM claim_watermarks
+                    WHERE lock_owner = :lock_owner AND scope = :scope AND rebuilt_at >= :rebuild_cutoff
+                """), params)).first()
+            if watermark is not None:
+                params["watermark_ts"], params["watermark_id"] = watermark
+            watermark_sql = "AND (doc_created_at, id) >= (:watermark_ts, :watermark_id)" if watermark else ""
+
+            # Items are locked only while the lease rows are written (SKIP LOCKED keeps
+            # concurrent claims apart); the documents themselves are not rewritten
+            stmt = text(f"""
                 WITH candidate AS (
-                    SELECT id, data
-                    FROM documents
-                    WHERE collection_name = 'dataset_items'
-                      AND COALESCE((data->'review_state'->>'finalized')::boolean, false) = false
-                      AND (:dataset_type_id IS NULL OR data->>'dataset_type_id' = :dataset_type_id)
-                      AND (
-                          :lang_filter = false OR data->>'language' = ANY(:languages)
-                      )
-                      AND NOT ((data->'review_state'->'reviewed_by') @> :reviewer_ids_jsonb)
-                      AND (
-                          data->'review_state'->>'status' = 'pending' OR
-                          (
-                              data->'review_state'->>'status' = 'in_review' AND
-                              COALESCE((data->'review_state'->>'lock_time')::timestamptz, to_timestamp(0)) < :stale_cutoff
-                          )
+                    SELECT d.id, d.doc_id, d.data, d.doc_created_at
+                    FROM documents d
+                    WHERE {CLAIM_SCOPE_SQL}
+                      AND {CLAIM_OPEN_SQL}
+                      {watermark_sql}
+                      AND status = 'pending'
+                      AND NOT EXISTS (
+                          SELECT 1 FROM item_leases l WHERE l.item_id = d.doc_id AND l.expires_at > :now
                       )
-                    ORDER BY (data->>'created_at')::timestamptz NULLS FIRST, id
-                    LIMIT 1
+                    ORDER BY doc_created_at NULLS FIRST, id
+                    LIMIT :limit
                     FOR UPDATE SKIP LOCKED
+                ), leased AS (
+                    INSERT INTO item_leases (item_id, lock_owner, leased_at, expires_at)
+                    SELECT doc_id, :lock_owner, :now, :expires_at FROM candidate
+                    ON CONFLICT (item_id) DO UPDATE SET
+                        lock_owner = EXCLUDED.lock_owner,
+                        leased_at = EXCLUDED.leased_at,
+                        expires_at = EXCLUDED.expires_at
+                    WHERE item_leases.expires_at <= :now
+                    RETURNING item_id
                 )
-                UPDATE documents d
-                  SET data = jsonb_set(
-                      jsonb_set(
-                          jsonb_set(d.data, '{review_state,lock_owner}', :lock_owner_jsonb, true),
-                          '{review_state,lock_time}', :now_ts_jsonb, true
-                      ),
-                      '{review_state,status}', '"in_review"'::jsonb, true
-                  ),
-                  updated_at = CURRENT_TIMESTAMP
-                FROM candidate c
-                WHERE d.id = c.id
-                RETURNING d.data;
+                SELECT c.data, c.doc_created_at, c.id
+                FROM candidate c JOIN leased l ON l.item_id = c.doc_id
             """)
-
-            stmt = stmt.bindparams(
-                bindparam("languages", type_=ARRAY(String)),
-                bindparam("reviewer_ids_jsonb", type_=JSONB),
-                bindparam("lock_owner_jsonb", type_=JSONB),
-                bindparam("now_ts_jsonb", type_=JSONB),
-                bindparam("dataset_type_id", type_=String),
-            )
-
-            params = {
-                "languages": languages,
-                "lang_filter": lang_filter,
-                "lock_owner_jsonb": lock_owner,
-                "reviewer_ids_jsonb": [lock_owner],
-                "now_ts_jsonb": now.isoformat(),
-                "stale_cutoff": stale_cutoff,
-                "dataset_type_id": dataset_type_id,
-            }
             logger.debug(
-                "claim_next_dataset_item executing with params=%s param_types=%s",
+                "claim_next_dataset_items executing with params=%s param_types=%s",
                 params,
                 {k: type(v).__name__ for k, v in params.items()},
             )
 
             try:
-                result = await session.execute(stmt, params)
+                result = await session.execute(self._claim_params(stmt), params)
             except Exception:
-                logger.exception("claim_next_dataset_item failed with params=%s", params)
+                logger.exception("claim_next_dataset_items failed with params=%s", params)
                 raise
 
-            row = result.fetchone()
-            logger.debug("claim_next_dataset_item fetchone -> %s", "hit" if row else "none")
-            return row[0] if row else None
+            rows = result.fetchall()
+            logger.debug("claim_next_dataset_items claimed %d of %d", len(rows), limit)
+            if use_watermark:
+                await self._advance_claim_watermark(session, params, watermark_sql)
+            # RETURNING has no order; hand items out in queue order
+            rows.sort(key=lambda row: (row[1], row[2]))
+            return [leased_item(row[0], lock_owner, now) for row in rows]
+
+    @staticmethod
+    def _claim_params(stmt, *extra):
+        """Bind the parameter types of CLAIM_SCOPE_SQL/CLAIM_OPEN_SQL (and `extra`)."""
+        return stmt.bindparams(
+            bindparam("languages", type_=ARRAY(String)),
+            bindparam("reviewer_ids_jsonb", type_=JSONB),
+            bindparam("dataset_type_id", type_=String),
+            *extra,
+        )
+
+    async def _advance_claim_watermark(self, session: AsyncSession, params: Dict[str, Any], watermark_sql: str):
+        """
+        Move the reviewer's watermark (see CLAIM_WATERMARK_SCHEMA) to the first item of
+        the scope that is still open to them, or past the last item when there is none.
+        Runs after the claim, so its own items (now in_review) count as open.
+        """
+        position = (await session.execute(self._claim_params(text(f"""
+            SELECT doc_created_at, id FROM documents
+            WHERE {CLAIM_SCOPE_SQL} AND {CLAIM_OPEN_SQL} {watermark_sql}
+            ORDER BY doc_created_at NULLS FIRST, id
+            LIMIT 1
+        """)), params)).first()
+        if position is None:
+            position = (await session.execute(self._claim_params(text(f"""
+                SELECT doc_created_at, id FROM documents
+                WHERE {CLAIM_SCOPE_SQL} {watermark_sql}
+                ORDER BY doc_created_at DESC, id DESC
+                LIMIT 1
+            """)), params)).first()
+        if position is None:
+            return
+        await session.execute(text("""
+            INSERT INTO claim_watermarks (lock_owner, scope, created_at, item_id, rebuilt_at)
+            VALUES (:lock_owner, :scope, :created_at, :item_id, :now)
+            ON CONFLICT (lock_owner, scope) DO UPDATE SET
+                created_at = EXCLUDED.created_at,
+                item_id = EXCLUDED.item_id,
+                rebuilt_at = CASE
+                    WHEN claim_watermarks.rebuilt_at < :rebuild_cutoff THEN EXCLUDED.rebuilt_at
+                    ELSE claim_watermarks.rebuilt_at
+                END
+            WHERE claim_watermarks.rebuilt_at < :rebuild_cutoff
+               OR (claim_watermarks.created_at, claim_watermarks.item_id) < (EXCLUDED.created_at, EXCLUDED.item_id)
+        """), {**params, "created_at": position[0], "item_id": position[1]})
+
+    @db_operation(rows=int)
+    async def release_leases(
+        self,
+        item_ids: Optional[Sequence[str]] = None,
+        lock_owner: Optional[str] = None,
+        expired_only: bool = False,
+        session: Optional[AsyncSession] = None,
+    ) -> int:
+        """
+        Delete review leases: those of `item_ids` and/or `lock_owner` (all of them if
+        neither is given), only expired ones with expired_only. Returns leases deleted.
+        """
+        clauses, params = ["TRUE"], {"now": datetime.utcnow()}
+        if item_ids is not None:
+            clauses.append("item_id = ANY(CAST(:item_ids AS varchar[]))")
+            params["item_ids"] = list(item_ids)
+        if lock_owner is not None:
+            clauses.append("lock_owner = :lock_owner")
+            params["lock_owner"] = lock_owner
+        if expired_only:
+            clauses.append("expires_at <= :now")
+        stmt = text(f"DELETE FROM item_leases WHERE {' AND '.join(clauses)}")
+
+        async def delete(active: AsyncSession) -> int:
+            return (await active.execute(stmt, params)).rowcount
+
+        if session is not None:
+            return await delete(session)
+        async with self._session() as active:
+            return await delete(active)
+
+    @db_operation()
+    async def reap_expired_leases(
+        self,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Delete expired review leases, oldest first, one transaction per batch. Each batch
+        holds the LEASE_REAPER_LOCK advisory lock, so workers reaping at the same time
+        don't pile up: whoever finds it taken stops and reports skipped=True.
+        Returns {"reclaimed", "batches", "skipped", "oldest_sec", "mean_sec",
+        "max_overdue_sec"}: lease ages (since the claim) and the longest time one sat
+        expired, in seconds (None when nothing was reclaimed).
+        """
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        pause_sec = config.BULK_PAUSE_SEC if pause_sec is None else pause_sec
+        reclaimed, batches, skipped = 0, 0, False
+        oldest_sec, total_sec, max_overdue_sec = None, 0.0, None
+        while True:
+            now = datetime.utcnow()
+            async with self._session() as session:
+                if not (await session.execute(text(
+                    "SELECT pg_try_advisory_xact_lock(hashtext(:lock_name))"
+                ), {"lock_name": LEASE_REAPER_LOCK})).scalar_one():
+                    skipped = True
+                    break
+                count, age_max, age_sum, overdue_max = (await session.execute(text("""
+                    WITH reaped AS (
+                        DELETE FROM item_leases
+                        WHERE item_id IN (
+                            SELECT item_id FROM item_leases
+                            WHERE expires_at <= :now
+                            ORDER BY expires_at
+                            LIMIT :batch_size
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING leased_at, expires_at
+                    )
+                    SELECT COUNT(*),
+                           EXTRACT(EPOCH FROM MAX(:now - leased_at)),
+                           EXTRACT(EPOCH FROM SUM(:now - leased_at)),
+                           EXTRACT(EPOCH FROM MAX(:now - expires_at))
+                    FROM reaped
+                """), {"now": now, "batch_size": batch_size})).one()
+            if count:
+                batches += 1
+                reclaimed += count
+                total_sec += float(age_sum)
+                oldest_sec = max(oldest_sec or 0.0, float(age_max))
+                max_overdue_sec = max(max_overdue_sec or 0.0, float(overdue_max))
+            if count < batch_size:
+                break
+            if pause_sec:
+                await asyncio.sleep(pause_sec)
+        return {
+            "reclaimed": reclaimed,
+            "batches": batches,
+            "skipped": skipped,
+            "oldest_sec": oldest_sec,
+            "mean_sec": total_sec / reclaimed if reclaimed else None,
+            "max_overdue_sec": max_overdue_sec,
+        }
+
+    @db_operation()
+    async def queue_counts(
+        self,
+        languages: Optional[Sequence[str]] = None,
+        dataset_type_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sizes of the review queue counter groups (see QUEUE_COUNTERS_SCHEMA), optionally
+        for some languages / one dataset type: [{"dataset_type_id", "language", "status",
+        "finalized", "items"}], with "" for missing values and LEASED_QUEUE_STATUS for
+        the items holding a lease. Reads counter rows only, never the items; the leased
+        group counts every item_leases row, expired or not, until reap_expired_leases
+        deletes it.
+        """
+        clauses, params = ["TRUE"], {}
+        if languages:
+            clauses.append("language = ANY(CAST(:languages AS text[]))")
+            params["languages"] = list(languages)
+        if dataset_type_id is not None:
+            clauses.append("dataset_type_id = :dataset_type_id")
+            params["dataset_type_id"] = dataset_type_id
+        async with self._session() as session:
+            result = await session.execute(text(f"""
+                SELECT dataset_type_id, language, status, finalized, SUM(items)
+                FROM {QUEUE_COUNTERS_TABLE}
+                WHERE {' AND '.join(clauses)}
+                GROUP BY 1, 2, 3, 4
+                HAVING SUM(items) <> 0
+                ORDER BY 1, 2, 3, 4
+            """), params)
+            return [
+                {"dataset_type_id": row[0], "language": row[1], "status": row[2], "finalized": row[3], "items": int(row[4])}
+                for row in result
+            ]
+
+    @db_operation()
+    async def reconcile_queue_counters(self) -> Dict[str, Any]:
+        """
+        Recount every queue counter group and add each group's error to its counter.
+        Counters and items are read from one REPEATABLE READ snapshot, where every
+        committed write has both changed its items and counted itself, so the error found
+        there still holds after later writes, which add their own deltas. The corrections
+        are then added in a separate short transaction, so writers never wait on the
+        recount. Returns {"groups", "corrected", "drift", "skipped"}: groups whose counter
+        was wrong, the total absolute error, and skipped=True when another worker is
+        already reconciling.
+        """
+        if not self._initialized:
+            await self._ensure_schema()
+        async with self.SessionFactory() as snapshot, snapshot.begin():
+            await snapshot.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            # Held until the corrections below are committed
+            if not (await snapshot.execute(text(
+                "SELECT pg_try_advisory_xact_lock(hashtext(:lock_name))"
+            ), {"lock_name": QUEUE_COUNTERS_RECONCILE_LOCK})).scalar_one():
+                return {"groups": 0, "corrected": 0, "drift": 0, "skipped": True}
+            stored = {
+                tuple(row[:4]): int(row[4]) for row in await snapshot.execute(text(f"""
+                    SELECT dataset_type_id, language, status, finalized, SUM(items)
+                    FROM {QUEUE_COUNTERS_TABLE} GROUP BY 1, 2, 3, 4
+                """))
+            }
+            actual = {tuple(row[:4]): int(row[4]) for row in await snapshot.execute(text(QUEUE_COUNTS_SQL))}
+            errors = {
+                key: actual.get(key, 0) - stored.get(key, 0)
+                for key in sorted(set(stored) | set(actual))
+            }
+            corrections = [
+                {"dataset_type_id": key[0], "language": key[1], "status": key[2], "finalized": key[3], "items": error}
+                for key, error in errors.items() if error
+            ]
+            if corrections:
+                async with self.SessionFactory() as session, session.begin():
+                    await session.execute(text(f"""
+                        INSERT INTO {QUEUE_COUNTERS_TABLE} AS c (dataset_type_id, language, status, finalized, slot, items)
+                        VALUES (:dataset_type_id, :language, :status, :finalized, 0, :items)
+                        ON CONFLICT (dataset_type_id, language, status, finalized, slot)
+                        DO UPDATE SET items = c.items + EXCLUDED.items
+                    """), corrections)
+        return {
+            "groups": len(actual),
+            "corrected": len(corrections),
+            "drift": sum(abs(error) for error in errors.values()),
+            "skipped": False,
+        }
+
+    @db_operation()
+    async def count_leases(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count active review leases whose dataset item matches shorthand/DSL filters."""
+        where_sql, params = self._compile_shorthand(filters, data_column="d.data")
+        async with self._session() as session:
+            result = await session.execute(text(f"""
+                SELECT COUNT(*) FROM item_leases l
+                JOIN documents d ON d.collection_name = 'dataset_items' AND d.doc_id = l.item_id
+                WHERE l.expires_at > :now AND {where_sql or 'TRUE'}
+            """), {**params, "now": datetime.utcnow()})
+            return result.scalar_one()
+
+    @db_operation()
+    async def get_leases(self, item_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Review leases of `item_ids`, expired or not: item_id -> {"lock_owner", "leased_at", "expires_at"}."""
+        async with self._session() as session:
+            result = await session.execute(text("""
+                SELECT item_id, lock_owner, leased_at, expires_at FROM item_leases
+                WHERE item_id = ANY(CAST(:item_ids AS varchar[]))
+            """), {"item_ids": list(item_ids)})
+            return {row[0]: {"lock_owner": row[1], "leased_at": row[2], "expires_at": row[3]} for row in result}
+
+
+def create_db_adapter(storage_type: Optional[str] = None) -> StorageBackend:
+    """Storage backend for `storage_type` (default config.STORAGE_TYPE): "postgresql" or "memory"."""
+    storage_type = (storage_type or config.STORAGE_TYPE).lower()
+    if storage_type == "postgresql":
+        return DBAdapter()
+    if storage_type == "memory":
+        try:
+            from backend.app.db_memory import MemoryAdapter
+        except ImportError:
+            from app.db_memory import MemoryAdapter
+        return MemoryAdapter(column_map=FILTER_COLUMNS)
+    raise ValueError(f"Unknown STORAGE_TYPE {storage_type!r}; expected 'postgresql' or 'memory'")
 
 
 # Global instance
-db_adapter = DBAdapter()
+db_adapter = create_db_adapter()
 
 
-# Database adapter - PostgreSQL-based with backward-compatible API
+# Database adapter - key/value style API over the global storage backend (backward compatible)
 class DatabaseAdapter:
-    """PostgreSQL adapter providing unified database interface."""
+    """Namespaced adapter providing unified database interface over `db_adapter`."""
     
     def __init__(self, prefix: str = ""):
         """Initialize adapter with optional prefix for namespacing."""
@@ -489,13 +2291,11 @@ class DatabaseAdapter:
     
     async def get(self, key: str, default: Any = None) -> Any:
         """Get value by key."""
-        await self._ensure_schema()
         doc = await db_adapter.get(self.collection, key)
         return doc if doc else default
     
     async def set(self, key: str, value: Any) -> None:
         """Set value for key."""
-        await self._ensure_schema()
         if isinstance(value, dict):
             await db_adapter.upsert(self.collection, key, value)
         else:
@@ -503,38 +2303,37 @@ class DatabaseAdapter:
     
     async def delete(self, key: str) -> bool:
         """Delete key. Returns True if existed."""
-        await self._ensure_schema()
         return await db_adapter.delete(self.collection, key)
     
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
-        await self._ensure_schema()
         doc = await db_adapter.get(self.collection, key)
         return doc is not None
     
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Get values for several keys in one query; missing keys are left out."""
+        return await db_adapter.get_many(self.collection, keys)
+
+    async def find(self, filters: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
+        """Find values matching a filter document (see DBAdapter.find)."""
+        return await db_adapter.find(self.collection, filters, **kwargs)
+
+    async def find_one(self, filters: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Find the first value matching a filter document."""
+        return await db_adapter.find_one(self.collection, filters)
+
     async def list_keys(self, pattern: str = "") -> List[str]:
-        """List all keys matching pattern."""
-        await self._ensure_schema()
-        docs = await db_adapter.list_collection(self.collection)
-        keys = [doc.get("_id", "") for doc in docs if doc.get("_id", "").startswith(pattern)]
-        return keys
+        """List all keys starting with pattern."""
+        return await db_adapter.list_ids(self.collection, pattern)
     
     async def get_all(self, pattern: str = "") -> Dict[str, Any]:
-        """Get all key-value pairs matching pattern."""
-        keys = await self.list_keys(pattern)
-        result = {}
-        for key in keys:
-            result[key] = await self.get(key)
-        return result
+        """Get all key-value pairs whose key starts with pattern."""
+        return await db_adapter.get_by_prefix(self.collection, pattern)
     
     async def clear_all(self, pattern: str = "") -> int:
         """Delete all keys matching pattern. Returns count deleted."""
-        keys = await self.list_keys(pattern)
-        count = 0
-        for key in keys:
-            if await self.delete(key):
-                count += 1
-        return count
+        result = await db_adapter.delete_many(self.collection, id_prefix=pattern or None)
+        return result["affected"]
 
 
 # Singleton instances for different namespaces (for backward compatibility)
@@ -0,0 +1,325 @@
+"""
+Aggregate compiler - translates group-by/metric specs over JSONB paths into
+the SELECT list of one `GROUP BY` query, so DBAdapter.aggregate can return
+compact per-group rows instead of callers streaming whole collections.
+
+Group keys and metric operands are paths:
+    "language"                        dotted path into the document
+    "review_state.reviewed_by[]"      one row per element of the array ([] must be last or
+    "flags[].reviewer_id"             followed by a path inside each element)
+    "$lookup.dataset_type_id"         path into the document joined by `lookup`
+
+Unnested arrays multiply rows exactly like a SQL join: a metric over an item
+field is counted once per array element of its group, and documents whose
+array is missing or empty drop out.
+
+Metrics map a result name to (operator, path[, filter document]):
+    ("count", None)                   rows in the group
+    ("count", path)                   rows where path is present and not null
+    ("count_distinct", path)          distinct non-null values
+    ("sum" | "avg", path)             numeric values only, others ignored
+    ("min" | "max", path)             numbers compare numerically; if a group has no
+                                      numbers, strings compare as text (ISO timestamps)
+The optional filter document (db_filters syntax, applied to the document)
+restricts the rows a metric sees: ("count", None, {"action": "skip"}).
+
+Group values come back as JSON values (None for a missing key), metrics as
+numbers or, for min/max, the JSON value.
+
+aggregate_documents() computes the same rows over documents in Python, for
+in-memory storage.
+"""
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from backend.app.db_filters import (
+        ABSENT, FilterMatcher, compile_filter, extract_path, json_sort_key, json_text, split_path,
+    )
+    from backend.app.db_updates import from_numeric
+except ImportError:
+    from app.db_filters import (
+        ABSENT, FilterMatcher, compile_filter, extract_path, json_sort_key, json_text, split_path,
+    )
+    from app.db_updates import from_numeric
+
+AGGREGATE_OPERATORS = ("count", "count_distinct", "sum", "avg", "min", "max")
+LOOKUP_PREFIX = "$lookup."
+
+
+class AggregateCompiler:
+    """
+    Compiles group-by paths and metrics for a query over `documents d`
+    (optionally LEFT JOINed to `documents l` for lookups).
+
+    Parameters are collected in `params` under generated names
+    (`<prefix>0`, ...); metric filters use `<prefix>f<n>_` prefixes.
+    Array unnesting is returned as LATERAL joins in `joins`.
+    """
+
+    def __init__(
+        self,
+        param_prefix: str = "a",
+        column_map: Optional[Dict[str, Tuple[str, type]]] = None,
+        lookup: bool = False,
+    ):
+        self.param_prefix = param_prefix
+        self.column_map = column_map or {}
+        self.lookup = lookup
+        self.params: Dict[str, Any] = {}
+        self.joins: List[str] = []
+        self._unnested: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._counter = 0
+
+    def _param(self, value: Any) -> str:
+        name = f"{self.param_prefix}{self._counter}"
+        self._counter += 1
+        self.params[name] = value
+        return f":{name}"
+
+    def _path_param(self, parts: Sequence[str]) -> str:
+        return f"CAST({self._param(list(parts))} AS text[])"
+
+    def value_expr(self, path: str) -> str:
+        """jsonb expression for a group/metric path (see module docstring)."""
+        if not isinstance(path, str) or not path:
+            raise ValueError(f"Aggregate path must be a non-empty string, got {path!r}")
+        alias = "d"
+        if path.startswith(LOOKUP_PREFIX):
+            if not self.lookup:
+                raise ValueError(f"{path!r} needs a lookup")
+            alias, path = "l", path[len(LOOKUP_PREFIX):]
+
+        if "[]" in path:
+            array_path, _, element_path = path.partition("[]")
+            if "[]" in element_path or (element_path and not element_path.startswith(".")):
+                raise ValueError(f"Invalid array path: {path!r}")
+            array_expr = self._unnest(alias, tuple(split_path(array_path)))
+            if not element_path:
+                return array_expr
+            return f"{array_expr} #> {self._path_param(split_path(element_path[1:]))}"
+
+        parts = split_path(path)
+        column = self.column_map.get(".".join(parts)) if alias == "d" else None
+        if column:
+            return f"to_jsonb({alias}.{column[0]})"
+        return f"{alias}.data #> {self._path_param(parts)}"
+
+    def _unnest(self, alias: str, parts: Tuple[str, ...]) -> str:
+        key = (alias, parts)
+        if key not in self._unnested:
+            name = f"u{len(self._unnested)}"
+            array_expr = f"{alias}.data #> {self._path_param(parts)}"
+            self.joins.append(
+                f"CROSS JOIN LATERAL jsonb_array_elements("
+                f"CASE WHEN jsonb_typeof({array_expr}) = 'array' THEN {array_expr} ELSE '[]'::jsonb END"
+                f") AS {name}(value)"
+            )
+            self._unnested[key] = f"{name}.value"
+        return self._unnested[key]
+
+    def metric_expr(self, name: str, spec: Any) -> str:
+        if not isinstance(spec, (list, tuple)) or len(spec) not in (2, 3):
+            raise ValueError(f"Metric {name!r} must be (operator, path) or (operator, path, filter)")
+        op, path = spec[0], spec[1]
+        metric_filter = spec[2] if len(spec) == 3 else None
+        if op not in AGGREGATE_OPERATORS:
+            raise ValueError(f"Unsupported aggregate operator {op!r} for metric {name!r}")
+
+        where = ""
+        if metric_filter:
+            where_sql, filter_params = compile_filter(
+                metric_filter,
+                param_prefix=f"{self.param_prefix}f{len(self.params)}_",
+                data_column="d.data",
+                column_map=self.column_map,
+            )
+            self.params.update(filter_params)
+            where = f" FILTER (WHERE {where_sql})"
+
+        if path is None:
+            if op != "count":
+                raise ValueError(f"Metric {name!r}: only count works without a path")
+            return f"COUNT(*){where}"
+        value = self.value_expr(path)
+        non_null = f"NULLIF({value}, 'null'::jsonb)"
+        number = f"CASE WHEN jsonb_typeof({value}) = 'number' THEN ({value})::numeric END"
+        string = f"CASE WHEN jsonb_typeof({value}) = 'string' THEN {value} #>> '{{}}' END"
+        return {
+            "count": f"COUNT({non_null}){where}",
+            "count_distinct": f"COUNT(DISTINCT {non_null}){where}",
+            "sum": f"to_jsonb(SUM({number}){where})",
+            "avg": f"to_jsonb(AVG({number}){where})",
+            "min": f"COALESCE(to_jsonb(MIN({number}){where}), to_jsonb(MIN({string}){where}))",
+            "max": f"COALESCE(to_jsonb(MAX({number}){where}), to_jsonb(MAX({string}){where}))",
+        }[op]
+
+
+def compile_aggregate(
+    group_by: Optional[Sequence[str]] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+    column_map: Optional[Dict[str, Tuple[str, type]]] = None,
+    lookup: bool = False,
+    param_prefix: str = "a",
+) -> Tuple[List[str], List[str], Dict[str, Any]]:
+    """
+    Compile group keys and metrics into (select expressions, lateral joins, params).
+    Select expressions are in group_by order followed by metrics order; group by
+    the first len(group_by) ordinals.
+    """
+    if isinstance(group_by, str):
+        raise ValueError("group_by expects a list of paths")
+    group_by = list(group_by or [])
+    metrics = dict(metrics or {})
+    if not group_by and not metrics:
+        raise ValueError("Aggregate needs at least one group_by path or metric")
+    names = group_by + list(metrics)
+    if len(set(names)) != len(names):
+        raise ValueError("Group paths and metric names must be unique")
+
+    compiler = AggregateCompiler(param_prefix=param_prefix, column_map=column_map, lookup=lookup)
+    select = [compiler.value_expr(path) for path in group_by]
+    select += [compiler.metric_expr(name, spec) for name, spec in metrics.items()]
+    return select, compiler.joins, compiler.params
+
+
+def _group_key(value: Any) -> Any:
+    """Hashable identity of a group value (jsonb equality; a missing key is its own group)."""
+    if value is ABSENT:
+        return ("absent",)
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, dict):
+        return ("object", tuple(sorted((key, _group_key(item)) for key, item in value.items())))
+    if isinstance(value, list):
+        return ("array", tuple(_group_key(item) for item in value))
+    return ("value", value)
+
+
+class _Row:
+    """One joined row: the document, its lookup document and the current element of each unnested array."""
+
+    __slots__ = ("document", "lookup", "elements")
+
+    def __init__(self, document: Dict[str, Any], lookup: Any, elements: Dict[Tuple[str, Tuple[str, ...]], Any]):
+        self.document = document
+        self.lookup = lookup
+        self.elements = elements
+
+
+class _PathReader:
+    """Python counterpart of AggregateCompiler.value_expr for one path."""
+
+    def __init__(self, path: str, column_map: Dict[str, Tuple[str, type]]):
+        self.alias = "d"
+        if path.startswith(LOOKUP_PREFIX):
+            self.alias, path = "l", path[len(LOOKUP_PREFIX):]
+        self.array: Optional[Tuple[str, Tuple[str, ...]]] = None
+        self.parts: Sequence[str] = ()
+        self.column: Optional[type] = None
+        if "[]" in path:
+            array_path, _, element_path = path.partition("[]")
+            self.array = (self.alias, tuple(split_path(array_path)))
+            self.parts = split_path(element_path[1:]) if element_path else ()
+            return
+        self.parts = split_path(path)
+        entry = column_map.get(".".join(self.parts)) if self.alias == "d" else None
+        self.column = entry[1] if entry else None
+
+    def read(self, row: _Row) -> Any:
+        if self.array is not None:
+            return extract_path(row.elements[self.array], self.parts)
+        source = row.document if self.alias == "d" else row.lookup
+        if source is None:
+            return ABSENT
+        value = extract_path(source, self.parts)
+        if self.column is bool:
+            return value if isinstance(value, bool) else ABSENT
+        if self.column is str:
+            text = json_text(value)
+            return ABSENT if text is None else text
+        return value
+
+
+def _numbers(values: Iterable[Any]) -> List[Any]:
+    return [value for value in values if isinstance(value, (int, float)) and not isinstance(value, bool)]
+
+
+def _metric(op: str, values: List[Any]) -> Any:
+    present = [value for value in values if value is not ABSENT and value is not None]
+    if op == "count":
+        return len(present)
+    if op == "count_distinct":
+        return len({_group_key(value) for value in present})
+    numbers = _numbers(present)
+    if op in ("sum", "avg"):
+        if not numbers:
+            return None
+        total = sum((Decimal(repr(number)) for number in numbers), Decimal(0))
+        return from_numeric(total) if op == "sum" else float(total / len(numbers))
+    pick = min if op == "min" else max
+    if numbers:
+        return pick(numbers)
+    strings = [value for value in present if isinstance(value, str)]
+    return pick(strings) if strings else None
+
+
+def aggregate_documents(
+    documents: Iterable[Dict[str, Any]],
+    group_by: Optional[Sequence[str]] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+    column_map: Optional[Dict[str, Tuple[str, type]]] = None,
+    lookup: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Group `documents` and compute metrics in Python, returning the rows the compiled
+    query would (groups in ascending jsonb order, missing values last). `lookup`
+    returns the joined document for "$lookup." paths, or None.
+    """
+    compile_aggregate(group_by, metrics, column_map=column_map, lookup=lookup is not None)
+    column_map = column_map or {}
+    group_by = list(group_by or [])
+    metrics = dict(metrics or {})
+
+    group_readers = [_PathReader(path, column_map) for path in group_by]
+    metric_specs = []
+    for name, spec in metrics.items():
+        reader = _PathReader(spec[1], column_map) if spec[1] is not None else None
+        matcher = FilterMatcher(spec[2], column_map) if len(spec) == 3 and spec[2] else None
+        metric_specs.append((name, spec[0], reader, matcher))
+    arrays = list(dict.fromkeys(
+        reader.array for reader in group_readers + [spec[2] for spec in metric_specs if spec[2]]
+        if reader.array is not None
+    ))
+
+    groups: Dict[Tuple, Dict[str, Any]] = {}
+    if not group_by:
+        groups[()] = {"values": [], "rows": []}
+    for document in documents:
+        joined = lookup(document) if lookup is not None else None
+        combinations: List[Dict[Tuple[str, Tuple[str, ...]], Any]] = [{}]
+        for alias, parts in arrays:
+            source = document if alias == "d" else joined
+            array = extract_path(source, parts) if source is not None else ABSENT
+            elements = array if isinstance(array, list) else []
+            combinations = [
+                {**combination, (alias, parts): element} for combination in combinations for element in elements
+            ]
+        for elements in combinations:
+            row = _Row(document, joined, elements)
+            values = [reader.read(row) for reader in group_readers]
+            group = groups.setdefault(tuple(_group_key(value) for value in values), {"values": values, "rows": []})
+            group["rows"].append(row)
+
+    results = []
+    for group in groups.values():
+        result = {path: (None if value is ABSENT else value) for path, value in zip(group_by, group["values"])}
+        for name, op, reader, matcher in metric_specs:
+            rows = [row for row in group["rows"] if matcher is None or matcher.matches(row.document)]
+            if reader is None:
+                result[name] = len(rows)
+            else:
+                result[name] = _metric(op, [reader.read(row) for row in rows])
+        results.append((group["values"], result))
+    results.sort(key=lambda item: [(1,) if value is ABSENT else (0, json_sort_key(value)) for value in item[0]])
+    return [result for _, result in results]
@@ -0,0 +1,642 @@
+"""
+Storage backend interface - the MongoDB-like document API every storage backend
+implements, plus the helpers that don't depend on how documents are stored.
+
+    StorageBackend         base class: the operations (see their docstrings on
+                           DBAdapter) and the ones built from other operations
+    DBAdapter              PostgreSQL/JSONB backend (db_adapter), the production default
+    MemoryAdapter          in-process backend (db_memory) for tests and benchmarks
+
+config.STORAGE_TYPE selects the backend behind the global `db_adapter`
+(see db_adapter.create_db_adapter); DatabaseAdapter wrappers and services only
+use this interface, so they run unchanged on either.
+
+Sessions passed to `session=` parameters come from the same backend's
+transaction(); they are opaque to callers.
+"""
+import abc
+import asyncio
+import base64
+import binascii
+import contextvars
+import json
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+try:
+    from backend.app.config import config
+    from backend.app.db_metrics import db_operation
+except ImportError:
+    from app.config import config
+    from app.db_metrics import db_operation
+
+# Document version for optimistic concurrency: bumped by every write to an existing
+# document, whatever operation made it; documents never updated have no key (version 0)
+VERSION_FIELD = "_version"
+
+
+def encode_cursor(sort_by: str, sort_dir: str, value: Any, row_id: int) -> str:
+    """Opaque keyset cursor for the row after which the next page starts."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort_by, "d": sort_dir, "v": value, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_dir: str) -> Dict[str, Any]:
+    """Decode a cursor from encode_cursor; raises ValueError if invalid or for another ordering."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = {"value": payload["v"], "id": int(payload["i"])}
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeDecodeError):
+        raise ValueError("Invalid pagination cursor") from None
+    if payload.get("s") != sort_by or payload.get("d") != sort_dir:
+        raise ValueError("Pagination cursor does not match the requested sort order")
+    return position
+
+
+class VersionConflict(Exception):
+    """A compare-and-swap write found the document at a different version than expected."""
+
+    def __init__(self, collection: str, doc_id: str, expected: int):
+        super().__init__(f"{collection}/{doc_id} changed since version {expected}")
+        self.collection = collection
+        self.doc_id = doc_id
+        self.expected = expected
+
+
+def document_version(document: Optional[Dict[str, Any]]) -> int:
+    """Version of a document as read (0 if it was never updated)."""
+    return int((document or {}).get(VERSION_FIELD) or 0)
+
+
+async def retry_on_conflict(
+    operation: Callable[..., Any],
+    *args: Any,
+    attempts: Optional[int] = None,
+    backoff_sec: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Await `operation(*args, **kwargs)`, calling it again while it raises VersionConflict.
+    The operation must re-read what it writes on every call. Retries back off
+    exponentially with jitter; the last conflict is re-raised after `attempts` calls.
+    """
+    attempts = attempts or config.OPTIMISTIC_RETRY_ATTEMPTS
+    backoff_sec = config.OPTIMISTIC_RETRY_BACKOFF_SEC if backoff_sec is None else backoff_sec
+    for attempt in range(attempts):
+        try:
+            return await operation(*args, **kwargs)
+        except VersionConflict:
+            if attempt == attempts - 1:
+                raise
+            if backoff_sec:
+                await asyncio.sleep(backoff_sec * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+def claim_scope(languages: Sequence[str], dataset_type_id: Optional[str]) -> str:
+    """Key of a claim watermark's scope: the dataset type and language set claimed from."""
+    return f"{dataset_type_id or '*'}|{','.join(sorted(set(languages))) or '*'}"
+
+
+# Queue counter status of the group counting leased items (see queue_counts)
+LEASED_QUEUE_STATUS = "leased"
+
+
+def leased_item(item: Dict[str, Any], lock_owner: str, leased_at: datetime) -> Dict[str, Any]:
+    """A claimed dataset item as its reviewer sees it: the lease shown as an in_review lock."""
+    review_state = {**(item.get("review_state") or {}), "status": "in_review",
+                    "lock_owner": lock_owner, "lock_time": leased_at.isoformat()}
+    return {**item, "review_state": review_state}
+
+
+# Unit of work active in the current task (any backend; see StorageBackend.unit_of_work)
+_current_unit_of_work: contextvars.ContextVar[Optional[Any]] = contextvars.ContextVar(
+    "db_unit_of_work", default=None
+)
+
+
+class StorageBackend(abc.ABC):
+    """Document storage operations shared by all backends."""
+
+    # Convenience filter keys accepted by query_collection/count_documents, mapped to document paths
+    _SHORTHAND_FILTERS = {
+        "dataset_type_id": "dataset_type_id",
+        "language": "language",
+        "status": "review_state.status",
+        "finalized": "review_state.finalized",
+        "uploader_id": "uploader_id",
+        "reviewer_id": "reviewer_id",
+        "flagged": "flagged",
+        "is_gold": "is_gold",
+    }
+    _BOOLEAN_SHORTHANDS = {"finalized", "flagged", "is_gold"}
+
+    prefix = "curation"
+
+    def _key(self, collection: str, doc_id: str) -> str:
+        """Generate namespaced key (for compatibility, not used for storage)"""
+        return f"{self.prefix}:{collection}:{doc_id}"
+
+    def _shorthand_document(self, filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Filter document for shorthand/DSL filters (empty when unfiltered).
+        Shorthand filters: dataset_type_id, language (str or list), status, finalized,
+        uploader_id, reviewer_id, flagged, is_gold. Unset shorthands (None/empty) are ignored.
+        `status` is the status reviewers see: a leased item is stored as pending but
+        matches "in_review" (see leased_item). Any other key is passed through as a
+        filter document (see db_filters).
+        """
+        document: Dict[str, Any] = {}
+        statuses: List[str] = []
+        for key, value in (filters or {}).items():
+            if key not in self._SHORTHAND_FILTERS:
+                document[key] = value
+                continue
+            if key in self._BOOLEAN_SHORTHANDS:
+                if value is None:
+                    continue
+                value = bool(value)
+            elif not value:
+                continue
+            elif key == "status":
+                statuses = list(value) if isinstance(value, (list, tuple, set)) else [value]
+                continue
+            elif isinstance(value, (list, tuple, set)):
+                value = {"$in": list(value)}
+            document[self._SHORTHAND_FILTERS[key]] = value
+        if statuses:
+            document["$and"] = [*document.get("$and", []), self._status_filter(statuses)]
+        return document
+
+    def _status_filter(self, statuses: Sequence[str]) -> Dict[str, Any]:
+        """Filter document for items reviewers see in one of `statuses` (see _shorthand_document)."""
+        path = self._SHORTHAND_FILTERS["status"]
+        stored = [status for status in statuses if status != "pending"]
+        clauses: List[Dict[str, Any]] = []
+        if stored:
+            clauses.append({path: {"$in": stored}})
+        if "in_review" in statuses:
+            clauses.append({path: "pending", "$leased": True})
+        if "pending" in statuses:
+            clauses.append({path: "pending", "$leased": False})
+        return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+    # Lifecycle and transactions
+
+    @abc.abstractmethod
+    async def startup(self) -> None:
+        """Prepare storage (application startup hook)."""
+
+    @abc.abstractmethod
+    async def shutdown(self) -> None:
+        """Release storage resources (application shutdown hook)."""
+
+    @abc.abstractmethod
+    async def _ensure_schema(self):
+        """Create whatever the backend needs before the first operation."""
+
+    @abc.abstractmethod
+    def _new_unit_of_work(self) -> Any:
+        """New unit of work for this backend, with `adapter`, `active` and `async close(commit)`."""
+
+    def _active_unit_of_work(self) -> Optional[Any]:
+        unit = _current_unit_of_work.get()
+        if unit is not None and unit.active and unit.adapter is self:
+            return unit
+        return None
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[Any]:
+        """
+        Run every adapter call made inside the block (in this task and tasks it
+        starts) in one transaction, committed when the block exits and rolled back
+        if it raises. Statements still execute as they are issued, so reads see
+        earlier writes of the same unit of work.
+
+        Nested blocks join the outer unit of work. Calls in one unit of work must
+        not run concurrently (no asyncio.gather over adapter calls), and
+        update_many/delete_many/patch_many keep their own per-batch transactions.
+        """
+        unit = self._active_unit_of_work()
+        if unit is not None:
+            yield unit
+            return
+        unit = self._new_unit_of_work()
+        token = _current_unit_of_work.set(unit)
+        try:
+            yield unit
+        except BaseException:
+            await unit.close(commit=False)
+            raise
+        else:
+            await unit.close(commit=True)
+        finally:
+            _current_unit_of_work.reset(token)
+
+    @abc.abstractmethod
+    def transaction(self):
+        """
+        Async transactional context yielding a shared session. Inside a unit of
+        work it is a savepoint on the unit's session, so the block still rolls
+        back on its own if it raises.
+        """
+
+    @abc.abstractmethod
+    def cache_stats(self) -> Dict[str, Any]:
+        """Document cache counters for this process."""
+
+    @abc.abstractmethod
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool occupancy and statement-cache statistics."""
+
+    @abc.abstractmethod
+    async def ping(self) -> float:
+        """Round trip a trivial operation; returns seconds taken."""
+
+    # Single documents
+
+    @abc.abstractmethod
+    async def insert(self, collection: str, document: Dict[str, Any]) -> str:
+        """Insert document (replacing one with the same ID), generate ID if not present."""
+
+    @abc.abstractmethod
+    async def get(
+        self, collection: str, doc_id: str, projection: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get document by ID, optionally projected to `_id` and the given paths."""
+
+    @abc.abstractmethod
+    async def get_many(self, collection: str, doc_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several documents by ID as {doc_id: document}; missing IDs are left out."""
+
+    @abc.abstractmethod
+    async def get_by_prefix(self, collection: str, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        """Get all documents whose ID starts with `prefix`, as {doc_id: document}."""
+
+    @abc.abstractmethod
+    async def list_ids(self, collection: str, prefix: str = "") -> List[str]:
+        """IDs of the documents whose ID starts with `prefix` (the documents are not read)."""
+
+    @abc.abstractmethod
+    async def get_for_update(self, session: Any, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get document by ID, locking it until the session's transaction ends."""
+
+    @abc.abstractmethod
+    async def update_one(
+        self,
+        collection: str,
+        doc_id: str,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        push_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        session: Optional[Any] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Apply a partial update (see db_updates) atomically and return the new document."""
+
+    @abc.abstractmethod
+    async def update_if_version(
+        self,
+        collection: str,
+        doc_id: str,
+        expected_version: int,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        push_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        session: Optional[Any] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Compare-and-swap partial update; raises VersionConflict if the version moved on."""
+
+    @abc.abstractmethod
+    async def replace_if_version(
+        self,
+        collection: str,
+        doc_id: str,
+        document: Dict[str, Any],
+        expected_version: int,
+        session: Optional[Any] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Compare-and-swap replacement of a whole document."""
+
+    @abc.abstractmethod
+    async def increment_counter(
+        self,
+        collection: str,
+        doc_id: str,
+        field: str,
+        amount: int = 1,
+        defaults: Optional[Dict[str, Any]] = None,
+        session: Optional[Any] = None,
+    ) -> int:
+        """Atomically add `amount` to a numeric field (creating the document) and return the new value."""
+
+    @abc.abstractmethod
+    async def _upsert_with_session(self, session: Any, collection: str, document: Dict[str, Any]) -> str:
+        """Insert or replace a document in `session`'s transaction; returns its ID."""
+
+    @abc.abstractmethod
+    async def delete(self, collection: str, doc_id: str) -> bool:
+        """Delete document"""
+
+    @db_operation()
+    async def update(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
+        """
+        Update document fields.
+        Supports dotted field notation (e.g., "review_state.status").
+        """
+        if not updates:
+            return await self.get(collection, doc_id) is not None
+        return await self.update_one(collection, doc_id, set_fields=updates) is not None
+
+    @db_operation()
+    async def upsert_document(self, session: Any, collection: str, document: Dict[str, Any]) -> str:
+        """Public helper to upsert within an existing transaction."""
+        return await self._upsert_with_session(session, collection, document)
+
+    @db_operation()
+    async def insert_document(self, session: Any, collection: str, document: Dict[str, Any]) -> str:
+        """Insert document using an existing session (upsert semantics)."""
+        return await self._upsert_with_session(session, collection, document)
+
+    @db_operation()
+    async def upsert(self, collection: str, doc_id: str, document: Dict[str, Any]) -> str:
+        """Insert or update document"""
+        document["_id"] = doc_id
+        await self.insert(collection, document)
+        return doc_id
+
+    @db_operation()
+    async def inc(self, collection: str, doc_id: str, field: str, amount: float = 1.0) -> bool:
+        """Increment numeric field"""
+        return await self.update_one(collection, doc_id, inc_fields={field: amount}) is not None
+
+    # Bulk writes
+
+    @abc.abstractmethod
+    async def insert_many(
+        self,
+        collection: str,
+        documents: Sequence[Dict[str, Any]],
+        on_conflict: str = "error",
+        batch_size: Optional[int] = None,
+        session: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Insert documents in batches; returns {"ids", "written", "batches"}."""
+
+    @db_operation(rows=lambda result: result["written"])
+    async def upsert_many(
+        self,
+        collection: str,
+        documents: Sequence[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        session: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Insert or replace documents in bulk (insert_many with on_conflict="update")."""
+        return await self.insert_many(collection, documents, "update", batch_size, session)
+
+    @abc.abstractmethod
+    async def update_many(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+        progress: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Any]:
+        """Partially update every matching document in batches; returns {"affected", "batches", "seconds"}."""
+
+    @abc.abstractmethod
+    async def delete_many(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+        progress: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        id_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Delete every matching document (whose ID starts with `id_prefix`, if given) in
+        batches; returns {"affected", "batches", "seconds"}.
+        """
+
+    @abc.abstractmethod
+    async def patch_many(
+        self,
+        collection: str,
+        patches: Dict[str, Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+    ) -> int:
+        """Merge a top-level patch into each document ({doc_id: patch}); returns updated documents."""
+
+    # Queries
+
+    @abc.abstractmethod
+    async def find(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+        projection: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find documents matching a filter document (operators: see db_filters)."""
+
+    @abc.abstractmethod
+    async def query_collection(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+        count_filters: Optional[Dict[str, Dict[str, Any]]] = None,
+        projection: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Filtered, sorted, paginated query; returns {"items", "total", "next_cursor", "counts"}."""
+
+    @abc.abstractmethod
+    async def count_documents(self, collection: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count documents matching shorthand/DSL filters."""
+
+    @abc.abstractmethod
+    async def aggregate(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Optional[Sequence[str]] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        lookup: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Group matching documents and compute metrics (see db_aggregate)."""
+
+    @abc.abstractmethod
+    async def sync_search_index(self, batch_size: Optional[int] = None) -> int:
+        """Bring the search index up to date; returns processed documents."""
+
+    @abc.abstractmethod
+    async def search(
+        self,
+        collection: str,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        count: str = "exact",
+        count_filters: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Ranked full-text search; returns {"items", "total", "counts", "has_more"}."""
+
+    @abc.abstractmethod
+    async def claim_next_dataset_items(
+        self,
+        languages: Optional[Sequence[str]],
+        lock_owner: str,
+        limit: int = 1,
+        lock_timeout_sec: int = 180,
+        dataset_type_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Atomically claim up to `limit` eligible dataset items for `lock_owner`, oldest first."""
+
+    @abc.abstractmethod
+    async def release_leases(
+        self,
+        item_ids: Optional[Sequence[str]] = None,
+        lock_owner: Optional[str] = None,
+        expired_only: bool = False,
+        session: Any = None,
+    ) -> int:
+        """Delete review leases of `item_ids` and/or `lock_owner`; returns how many were deleted."""
+
+    @abc.abstractmethod
+    async def reap_expired_leases(
+        self,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Delete expired review leases in batches, one reaper at a time; returns
+        {"reclaimed", "batches", "skipped", "oldest_sec", "mean_sec", "max_overdue_sec"}.
+        """
+
+    @abc.abstractmethod
+    async def queue_counts(
+        self,
+        languages: Optional[Sequence[str]] = None,
+        dataset_type_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sizes of the review queue counter groups: [{"dataset_type_id", "language", "status",
+        "finalized", "items"}], leased items under LEASED_QUEUE_STATUS.
+        """
+
+    @abc.abstractmethod
+    async def reconcile_queue_counters(self) -> Dict[str, Any]:
+        """Recount the queue counter groups; returns {"groups", "corrected", "drift", "skipped"}."""
+
+    @abc.abstractmethod
+    async def count_leases(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count active review leases whose dataset item matches the filters."""
+
+    @abc.abstractmethod
+    async def get_leases(self, item_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Review leases of `item_ids`: item_id -> {"lock_owner", "leased_at", "expires_at"}."""
+
+    @abc.abstractmethod
+    async def migrate_to_partitioned(self, batch_size: int = 5000, pause_sec: float = 0.0) -> Dict[str, Any]:
+        """Move storage to the partitioned layout; returns {"migrated", "rows", "batches", "seconds"}."""
+
+    async def with_leases(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Dataset items with their review leases shown as in_review locks (see leased_item)."""
+        leases = await self.get_leases([item["_id"] for item in items]) if items else {}
+        return [
+            leased_item(item, leases[item["_id"]]["lock_owner"], leases[item["_id"]]["leased_at"])
+            if item["_id"] in leases else item
+            for item in items
+        ]
+
+    @db_operation()
+    async def find_one(self, collection: str, filters: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Find first document matching a filter document"""
+        if callable(filters):
+            results = await self.find(collection, predicate=filters)
+        else:
+            results = await self.find(collection, filters, limit=1)
+        return results[0] if results else None
+
+    @db_operation()
+    async def claim_next_dataset_item(
+        self,
+        languages: Optional[Sequence[str]],
+        lock_owner: str,
+        lock_timeout_sec: int = 180,
+        dataset_type_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically claim the next eligible dataset item (see claim_next_dataset_items)."""
+        items = await self.claim_next_dataset_items(languages, lock_owner, 1, lock_timeout_sec, dataset_type_id)
+        return items[0] if items else None
+
+    @db_operation()
+    async def list_collection(self, collection: str) -> List[Dict[str, Any]]:
+        """List all documents in collection"""
+        return await self.find(collection)
+
+    @db_operation()
+    async def count(self, collection: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count documents matching a filter document (server-side COUNT)"""
+        if callable(filters):
+            results = await self.find(collection, predicate=filters)
+            return len(results)
+        return await self.count_documents(collection, filters)
+
+    @db_operation()
+    async def iter_collection(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+        sort_by: str = "created_at",
+        sort_dir: str = "asc",
+        projection: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream documents matching `filters` (as in query_collection) in keyset batches.
+
+        Only one batch is held in memory and no transaction stays open between
+        batches, so documents written during iteration may or may not be seen.
+        Updating documents mid-iteration is safe as long as the sort key is unchanged.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        cursor = None
+        while True:
+            page = await self.query_collection(
+                collection,
+                filters=filters,
+                sort_by=sort_by,
+                sort_dir=sort_dir,
+                limit=batch_size,
+                cursor=cursor,
+                count="none",
+                projection=projection,
+            )
+            for document in page["items"]:
+                yield document
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
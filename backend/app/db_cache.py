@@ -0,0 +1,196 @@
+"""
+Process-local read-through cache for small, hot collections
+(system_config, dataset_types).
+
+DBAdapter.get/get_many consult the cache for collections listed in
+config.CACHED_COLLECTIONS. Entries expire after a TTL and the least recently
+used entry is evicted once the cache is full. Every write DBAdapter makes to
+a cached collection drops the local entry and sends a NOTIFY on
+CACHE_CHANNEL inside the writing transaction, so every worker listening on
+the channel drops its copy once the write commits.
+
+While a worker has no working LISTEN connection it cannot see other
+workers' writes, so reads bypass the cache until it reconnects.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import asyncpg
+
+try:
+    from backend.app.db_codec import JsonCodec
+except ImportError:
+    from app.db_codec import JsonCodec
+
+logger = logging.getLogger(__name__)
+
+CACHE_CHANNEL = "documents_cache"
+# pg_notify payloads must stay below 8000 bytes; larger ID lists invalidate the collection
+MAX_NOTIFY_PAYLOAD = 7000
+# Seconds to wait before retrying a failed LISTEN connection
+LISTEN_RETRY_SEC = 5.0
+
+# Returned by DocumentCache.get when the document isn't cached
+MISSING = object()
+
+
+class DocumentCache:
+    """
+    TTL + LRU cache of documents keyed by (collection, doc_id).
+
+    Values are stored serialised with `codec`, so every hit returns a private
+    copy callers can mutate. A missing document (None) is cached as well.
+
+    Reads that race with an invalidation pass the token() they took before
+    querying to put(); the value is dropped if an invalidation happened since.
+    """
+
+    def __init__(
+        self,
+        collections: Iterable[str],
+        ttl_sec: float = 60.0,
+        max_entries: int = 1000,
+        codec: Optional[JsonCodec] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.collections = frozenset(c for c in collections if c)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.codec = codec or JsonCodec()
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Optional[bytes]]]" = OrderedDict()
+        self._generation = 0
+        self.counters = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def enabled_for(self, collection: str) -> bool:
+        return collection in self.collections and self.max_entries > 0 and self.ttl_sec > 0
+
+    def token(self) -> int:
+        """Invalidation generation to pass to put() for a read about to start."""
+        return self._generation
+
+    def get(self, collection: str, doc_id: str) -> Any:
+        """Return the cached document (None if cached as missing), or MISSING."""
+        key = (collection, doc_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            return MISSING
+        expires_at, payload = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.counters["expirations"] += 1
+            self.counters["misses"] += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return None if payload is None else self.codec.loads(payload)
+
+    def put(self, collection: str, doc_id: str, document: Optional[Dict[str, Any]], token: Optional[int] = None) -> None:
+        if token is not None and token != self._generation:
+            return
+        key = (collection, doc_id)
+        payload = None if document is None else self.codec.dumps(document)
+        self._entries[key] = (self._clock() + self.ttl_sec, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def invalidate(self, collection: str, doc_ids: Optional[Iterable[str]] = None) -> None:
+        """Drop the given documents, or the whole collection when doc_ids is None."""
+        self._generation += 1
+        self.counters["invalidations"] += 1
+        if doc_ids is None:
+            for key in [key for key in self._entries if key[0] == collection]:
+                del self._entries[key]
+        else:
+            for doc_id in doc_ids:
+                self._entries.pop((collection, doc_id), None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else None,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "collections": sorted(self.collections),
+        }
+
+
+def invalidation_payload(codec: JsonCodec, collection: str, doc_ids: Optional[Iterable[str]] = None) -> str:
+    """NOTIFY payload for an invalidation; falls back to the whole collection when too long."""
+    if doc_ids is not None:
+        payload = codec.dumps_text({"c": collection, "ids": list(doc_ids)})
+        if len(payload.encode()) <= MAX_NOTIFY_PAYLOAD:
+            return payload
+    return codec.dumps_text({"c": collection})
+
+
+def apply_invalidation(cache: DocumentCache, payload: str) -> None:
+    """Apply a NOTIFY payload from invalidation_payload(); unreadable payloads clear the cache."""
+    try:
+        message = cache.codec.loads(payload)
+        cache.invalidate(message["c"], message.get("ids"))
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Unreadable cache invalidation payload %r; clearing cache", payload)
+        cache.clear()
+
+
+class CacheInvalidationListener:
+    """Dedicated asyncpg connection LISTENing on CACHE_CHANNEL for one cache."""
+
+    def __init__(self, cache: DocumentCache, dsn: str):
+        self.cache = cache
+        self.dsn = dsn
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+    @property
+    def listening(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def ensure_started(self) -> bool:
+        """Connect and LISTEN if needed; returns False while no connection is available."""
+        if self.listening:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        async with self._lock:
+            if self.listening:
+                return True
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(CACHE_CHANNEL, self._on_notify)
+            except Exception:
+                logger.warning("Document cache LISTEN connection failed; reads bypass the cache", exc_info=True)
+                self._retry_at = time.monotonic() + LISTEN_RETRY_SEC
+                return False
+            connection.add_termination_listener(self._on_terminate)
+            # Writes made while nobody was listening were never seen
+            self.cache.clear()
+            self._connection = connection
+            return True
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        apply_invalidation(self.cache, payload)
+
+    def _on_terminate(self, connection) -> None:
+        logger.warning("Document cache LISTEN connection closed; reads bypass the cache until it reconnects")
+        self._connection = None
+        self.cache.clear()
+
+    async def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
@@ -0,0 +1,173 @@
+"""
+JSONB codec layer - how documents are serialised on their way to and from
+PostgreSQL.
+
+DBAdapter registers the configured codec directly on every asyncpg connection
+(binary `jsonb`/`json` format), so statements can bind Python dicts and lists
+to jsonb parameters and columns come back already decoded, without a
+json.dumps string and a text round trip in between.
+
+Codecs:
+    orjson   orjson encode/decode (default; falls back to json when not installed)
+    json     standard library json
+
+Both write datetimes/dates as ISO 8601 strings and UUIDs as their canonical
+string, which is how the services store them.
+
+Binding rules for jsonb parameters:
+    dict, list, number, bool   serialised by the codec
+    str / bytes                treated as already-serialised JSON text (SQLAlchemy's
+                               JSONB type and the filter/update compilers send text)
+So a bare JSON string value has to be serialised first (codec.dumps_text).
+"""
+import json
+import logging
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Type, Union
+
+from sqlalchemy import event
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# asyncpg binary jsonb starts with a format version byte
+JSONB_VERSION = b"\x01"
+# connection_record.info key of the per-connection ByteCounter set up by install_codec
+DECODED_BYTES_KEY = "decoded_bytes"
+
+
+def json_default(value: Any) -> Any:
+    """Serialise the non-JSON values documents commonly carry."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """Standard library codec; base class for pluggable codecs."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialise a value to UTF-8 JSON."""
+        return json.dumps(value, default=json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def dumps_text(self, value: Any) -> str:
+        """Serialise a value to JSON text."""
+        return self.dumps(value).decode()
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Deserialise JSON from bytes or text."""
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def encode_jsonb(self, value: Any) -> bytes:
+        """asyncpg binary jsonb encoder."""
+        if isinstance(value, str):
+            return JSONB_VERSION + value.encode()
+        if isinstance(value, (bytes, bytearray)):
+            return JSONB_VERSION + bytes(value)
+        return JSONB_VERSION + self.dumps(value)
+
+    def decode_jsonb(self, data: bytes) -> Any:
+        """asyncpg binary jsonb decoder."""
+        return self.loads(memoryview(data)[1:])
+
+    def encode_json(self, value: Any) -> bytes:
+        """asyncpg binary json encoder (plain json has no version byte)."""
+        if isinstance(value, str):
+            return value.encode()
+        if isinstance(value, (bytes, bytearray)):
+            return bytes(value)
+        return self.dumps(value)
+
+    def decode_json(self, data: bytes) -> Any:
+        """asyncpg binary json decoder."""
+        return self.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson codec; values orjson rejects (e.g. integers beyond 64 bits) go through json."""
+
+    name = "orjson"
+    OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, default=json_default, option=self.OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().dumps(value)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        return orjson.loads(data)
+
+
+CODECS: Dict[str, Type[JsonCodec]] = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_codec(name: str = "orjson") -> JsonCodec:
+    """Return a codec by name; raises ValueError for unknown names."""
+    name = (name or "orjson").lower()
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec {name!r}; expected one of {sorted(CODECS)}")
+    if name == OrjsonCodec.name and orjson is None:
+        logger.warning("orjson is not installed; using the standard library json codec")
+        name = JsonCodec.name
+    return CODECS[name]()
+
+
+class ByteCounter:
+    """Running total of JSON bytes decoded on one connection."""
+
+    __slots__ = ("total",)
+
+    def __init__(self):
+        self.total = 0
+
+
+async def register_codec(connection: Any, codec: JsonCodec, counter: Optional[ByteCounter] = None) -> None:
+    """
+    Register `codec` for json and jsonb on a raw asyncpg connection.
+    With a `counter`, every decoded value adds its size to counter.total.
+    """
+    decode_jsonb, decode_json = codec.decode_jsonb, codec.decode_json
+    if counter is not None:
+        def decode_jsonb(data: bytes) -> Any:
+            counter.total += len(data)
+            return codec.decode_jsonb(data)
+
+        def decode_json(data: bytes) -> Any:
+            counter.total += len(data)
+            return codec.decode_json(data)
+
+    await connection.set_type_codec(
+        "jsonb", schema="pg_catalog", format="binary",
+        encoder=codec.encode_jsonb, decoder=decode_jsonb,
+    )
+    await connection.set_type_codec(
+        "json", schema="pg_catalog", format="binary",
+        encoder=codec.encode_json, decoder=decode_json,
+    )
+
+
+def install_codec(engine: Any, codec: JsonCodec) -> None:
+    """
+    Register `codec` on every new connection of an async SQLAlchemy engine.
+    Runs after the dialect's own connect hooks, so it replaces their jsonb codec.
+    Each connection's ByteCounter is kept in connection_record.info[DECODED_BYTES_KEY].
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register(dbapi_connection, connection_record):
+        counter = connection_record.info[DECODED_BYTES_KEY] = ByteCounter()
+        dbapi_connection.run_async(lambda connection: register_codec(connection, codec, counter))
@@ -0,0 +1,556 @@
+"""
+Filter document compiler - translates Mongo-style filter documents into
+parameterised SQL over the JSONB `data` column of the documents table.
+
+Supported syntax:
+    {"language": "hi"}                                  equality
+    {"review_state.status": "pending"}                  dotted paths address nested objects
+    {"language": {"$in": ["hi", "ta"]}}                 $eq $ne $in $nin
+    {"item_number": {"$gt": 10, "$lte": 20}}            $gt $gte $lt $lte (numbers, strings, datetimes)
+    {"review_state.reviewed_by": {"$contains": "bob"}}  array contains element (partial objects allowed)
+    {"content": {"$icontains": "text"}}                 case-insensitive substring (string, or an object's values joined by spaces)
+    {"meta.source": {"$exists": True}}                  key presence
+    {"$or": [{...}, {...}], "$and": [...]}              boolean combinators, $not on operator dicts
+    {"$leased": True}                                   the document's ID holds a review lease (item_leases)
+
+Paths listed in a compiler's `column_map` (promoted, indexed columns of the
+documents table) compile equality/$ne/$in/$nin against the column instead of
+the JSONB document, so btree and partial indexes can serve them.
+
+FilterMatcher evaluates the same documents in Python with the semantics of the
+compiled SQL (jsonb containment and equality, NULL for missing paths), for
+storage backends that hold documents in memory.
+"""
+import json
+import uuid
+from datetime import datetime, date, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+COMPARISON_OPERATORS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+COLUMN_SQL_TYPES = {str: "text", bool: "boolean"}
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps fallback for values commonly found in filters."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json(value: Any) -> str:
+    """Serialise a filter value for a jsonb parameter."""
+    return json.dumps(value, default=_json_default)
+
+
+def split_path(path: str) -> List[str]:
+    """Split a dotted field path into its JSONB path elements."""
+    parts = path.split(".")
+    if not all(parts):
+        raise ValueError(f"Invalid field path: {path!r}")
+    return parts
+
+
+def nest(parts: Sequence[str], value: Any) -> Any:
+    """Build the nested object {"a": {"b": value}} for path ["a", "b"]."""
+    for part in reversed(parts):
+        value = {part: value}
+    return value
+
+
+class _Absent:
+    """Value of a path that doesn't exist: SQL NULL, as opposed to a JSON null."""
+
+    def __repr__(self) -> str:
+        return "ABSENT"
+
+
+ABSENT = _Absent()
+
+
+def extract_path(document: Any, parts: Sequence[str]) -> Any:
+    """Python `document #> path`: numeric elements index arrays; ABSENT if the path doesn't exist."""
+    for part in parts:
+        if isinstance(document, dict):
+            if part not in document:
+                return ABSENT
+            document = document[part]
+        elif isinstance(document, list):
+            try:
+                index = int(part)
+            except ValueError:
+                return ABSENT
+            if not -len(document) <= index < len(document):
+                return ABSENT
+            document = document[index]
+        else:
+            return ABSENT
+    return document
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def json_text(value: Any) -> Optional[str]:
+    """Python `->>`: strings as-is, other values as JSON text, None for null or ABSENT."""
+    if value is ABSENT or value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def json_equal(left: Any, right: Any) -> bool:
+    """jsonb equality: numbers compare by value, other types must match exactly."""
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if _is_number(left) and _is_number(right):
+        return left == right
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(json_equal(left[key], right[key]) for key in left)
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(map(json_equal, left, right))
+    if isinstance(left, str) and isinstance(right, str):
+        return left == right
+    return left is None and right is None
+
+
+def json_contains(container: Any, contained: Any, top_level: bool = True) -> bool:
+    """jsonb `@>`: structures must match, except that a top-level array contains its scalar elements."""
+    if isinstance(contained, dict):
+        return isinstance(container, dict) and all(
+            key in container and json_contains(container[key], value, False) for key, value in contained.items()
+        )
+    if isinstance(contained, list):
+        return isinstance(container, list) and all(
+            any(_contains_element(element, wanted) for element in container) for wanted in contained
+        )
+    if isinstance(container, list) and top_level:
+        return any(_contains_element(element, contained) for element in container)
+    return json_equal(container, contained)
+
+
+def _contains_element(element: Any, wanted: Any) -> bool:
+    if isinstance(wanted, (dict, list)):
+        return json_contains(element, wanted, False)
+    return not isinstance(element, (dict, list)) and json_equal(element, wanted)
+
+
+def json_sort_key(value: Any) -> Tuple:
+    """Sort key in jsonb order: null < string < number < boolean < array < object."""
+    if value is None:
+        return (0,)
+    if isinstance(value, str):
+        return (1, value)
+    if isinstance(value, bool):
+        return (3, value)
+    if _is_number(value):
+        return (2, value)
+    if isinstance(value, list):
+        return (4, len(value), [json_sort_key(element) for element in value])
+    keys = sorted(value, key=lambda key: (len(key.encode()), key))
+    return (5, len(value), [(len(key.encode()), key, json_sort_key(value[key])) for key in keys])
+
+
+def parse_timestamp(value: str) -> datetime:
+    """`value::timestamptz` for ISO timestamps; naive values are read as UTC. Raises ValueError."""
+    parsed = datetime.fromisoformat(value.strip())
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class FilterCompiler:
+    """
+    Compiles a filter document into a SQL boolean expression.
+
+    Parameters are collected in `params` under generated names
+    (`<prefix>0`, `<prefix>1`, ...) so several compiled filters can share
+    one statement as long as their prefixes differ.
+
+    `column_map` maps dotted paths to (column name, python type) for fields that
+    are also stored as typed columns; str and bool columns are supported.
+    """
+
+    def __init__(
+        self,
+        param_prefix: str = "f",
+        data_column: str = "data",
+        column_map: Optional[Dict[str, Tuple[str, type]]] = None,
+    ):
+        self.param_prefix = param_prefix
+        self.data_column = data_column
+        self.column_map = column_map or {}
+        self._table_prefix = data_column.rsplit(".", 1)[0] + "." if "." in data_column else ""
+        self.params: Dict[str, Any] = {}
+        self._counter = 0
+
+    def _param(self, value: Any) -> str:
+        name = f"{self.param_prefix}{self._counter}"
+        self._counter += 1
+        self.params[name] = value
+        return f":{name}"
+
+    def _path_param(self, parts: Sequence[str]) -> str:
+        return f"CAST({self._param(list(parts))} AS text[])"
+
+    def _column(self, parts: Sequence[str], *values: Any) -> Optional[Tuple[str, str]]:
+        """Return (column expression, SQL type) when all operands fit the promoted column."""
+        entry = self.column_map.get(".".join(parts))
+        if not entry:
+            return None
+        column, py_type = entry
+        for value in values:
+            if value is None:
+                continue
+            if type(value) is not py_type:
+                return None
+        return f"{self._table_prefix}{column}", COLUMN_SQL_TYPES[py_type]
+
+    def _json_expr(self, parts: Sequence[str]) -> str:
+        return f"{self.data_column} #> {self._path_param(parts)}"
+
+    def _text_expr(self, parts: Sequence[str]) -> str:
+        return f"{self.data_column} #>> {self._path_param(parts)}"
+
+    def compile(self, filters: Optional[Dict[str, Any]]) -> str:
+        """Compile a filter document; an empty document matches everything."""
+        if not filters:
+            return "TRUE"
+        if not isinstance(filters, dict):
+            raise ValueError(f"Filter must be a dict, got {type(filters).__name__}")
+
+        clauses = []
+        for key, value in filters.items():
+            if key == "$and":
+                clauses.append(self._combine(value, "AND"))
+            elif key == "$or":
+                clauses.append(self._combine(value, "OR"))
+            elif key == "$leased":
+                clauses.append(self._leased(value))
+            elif key.startswith("$"):
+                raise ValueError(f"Unsupported top-level filter operator: {key}")
+            else:
+                clauses.append(self._field(split_path(key), value))
+
+        if len(clauses) == 1:
+            return clauses[0]
+        return " AND ".join(f"({clause})" for clause in clauses)
+
+    def _leased(self, value: Any) -> str:
+        if not isinstance(value, bool):
+            raise ValueError("$leased expects true or false")
+        exists = f"EXISTS (SELECT 1 FROM item_leases lease WHERE lease.item_id = {self._table_prefix}doc_id)"
+        return exists if value else f"NOT {exists}"
+
+    def _combine(self, subfilters: Any, joiner: str) -> str:
+        if not isinstance(subfilters, (list, tuple)):
+            raise ValueError(f"${joiner.lower()} expects a list of filter documents")
+        if not subfilters:
+            return "TRUE" if joiner == "AND" else "FALSE"
+        return f" {joiner} ".join(f"({self.compile(sub)})" for sub in subfilters)
+
+    @staticmethod
+    def _is_operator_dict(value: Any) -> bool:
+        return isinstance(value, dict) and bool(value) and all(str(k).startswith("$") for k in value)
+
+    def _field(self, parts: List[str], value: Any) -> str:
+        if not self._is_operator_dict(value):
+            return self._eq(parts, value)
+
+        clauses = [self._operator(parts, op, operand) for op, operand in value.items()]
+        if len(clauses) == 1:
+            return clauses[0]
+        return " AND ".join(f"({clause})" for clause in clauses)
+
+    def _operator(self, parts: List[str], op: str, operand: Any) -> str:
+        if op == "$eq":
+            return self._eq(parts, operand)
+        if op == "$ne":
+            column = self._column(parts, operand)
+            if column:
+                if operand is None:
+                    return f"{column[0]} IS NOT NULL"
+                return f"{column[0]} IS DISTINCT FROM CAST({self._param(operand)} AS {column[1]})"
+            return f"NOT ({self._eq(parts, operand)})"
+        if op == "$in":
+            return self._in(parts, operand)
+        if op == "$nin":
+            return f"NOT ({self._in(parts, operand)})"
+        if op in COMPARISON_OPERATORS:
+            return self._compare(parts, COMPARISON_OPERATORS[op], operand)
+        if op == "$contains":
+            return f"{self.data_column} @> CAST({self._param(to_json(nest(parts, [operand])))} AS jsonb)"
+        if op == "$icontains":
+            return self._icontains(parts, operand)
+        if op == "$exists":
+            return f"{self._json_expr(parts)} IS {'NOT ' if operand else ''}NULL"
+        if op == "$not":
+            if not self._is_operator_dict(operand):
+                raise ValueError("$not expects an operator document, e.g. {'$not': {'$in': [...]}}")
+            return f"NOT COALESCE(({self._field(parts, operand)}), false)"
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+    def _eq(self, parts: List[str], value: Any) -> str:
+        column = self._column(parts, value)
+        if column:
+            if value is None:
+                return f"{column[0]} IS NULL"
+            return f"{column[0]} = CAST({self._param(value)} AS {column[1]})"
+        if value is None:
+            # Mongo semantics: null matches both explicit null and a missing key
+            return f"COALESCE({self._json_expr(parts)}, 'null'::jsonb) = 'null'::jsonb"
+        if isinstance(value, (dict, list, tuple)):
+            # Containment would also match supersets, so compare whole values
+            return f"{self._json_expr(parts)} = CAST({self._param(to_json(value))} AS jsonb)"
+        # Scalar equality as containment so the GIN index on data can serve it
+        return f"{self.data_column} @> CAST({self._param(to_json(nest(parts, value)))} AS jsonb)"
+
+    def _in(self, parts: List[str], values: Any) -> str:
+        if not isinstance(values, (list, tuple, set)):
+            raise ValueError("$in/$nin expect a list of values")
+        values = list(values)
+        if not values:
+            return "FALSE"
+        column = self._column(parts, *values)
+        if column:
+            non_null = [v for v in values if v is not None]
+            clauses = []
+            if len(non_null) < len(values):
+                clauses.append(f"{column[0]} IS NULL")
+            if non_null:
+                clauses.append(f"COALESCE({column[0]} = ANY(CAST({self._param(non_null)} AS {column[1]}[])), false)")
+            return clauses[0] if len(clauses) == 1 else f"({' OR '.join(clauses)})"
+        return (
+            f"CAST({self._param(to_json(values))} AS jsonb) @> "
+            f"jsonb_build_array(COALESCE({self._json_expr(parts)}, 'null'::jsonb))"
+        )
+
+    def _compare(self, parts: List[str], sql_op: str, value: Any) -> str:
+        json_expr = self._json_expr(parts)
+        text_expr = self._text_expr(parts)
+        if isinstance(value, bool) or value is None:
+            raise ValueError("Comparison operators require a number, string or datetime operand")
+        if isinstance(value, (int, float)):
+            return (
+                f"(jsonb_typeof({json_expr}) = 'number' AND "
+                f"({text_expr})::numeric {sql_op} CAST({self._param(value)} AS numeric))"
+            )
+        if isinstance(value, datetime):
+            return (
+                f"(jsonb_typeof({json_expr}) = 'string' AND "
+                f"({text_expr})::timestamptz {sql_op} {self._param(value)})"
+            )
+        if isinstance(value, str):
+            return (
+                f"(jsonb_typeof({json_expr}) = 'string' AND "
+                f"{text_expr} {sql_op} CAST({self._param(value)} AS text))"
+            )
+        raise ValueError(f"Unsupported comparison operand type: {type(value).__name__}")
+
+    def _icontains(self, parts: List[str], needle: Any) -> str:
+        if not isinstance(needle, str):
+            raise ValueError("$icontains expects a string")
+        escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = self._param(f"%{escaped}%")
+        json_expr = self._json_expr(parts)
+        # An object's non-empty values are joined in jsonb key order, so a needle can span values
+        return (
+            f"(CASE WHEN jsonb_typeof({json_expr}) = 'object' "
+            f"THEN (SELECT string_agg(kv.value, ' ' ORDER BY kv.n) "
+            f"FROM jsonb_each_text({json_expr}) WITH ORDINALITY AS kv(key, value, n) "
+            f"WHERE kv.value <> '') ILIKE {pattern} "
+            f"ELSE {self._text_expr(parts)} ILIKE {pattern} END)"
+        )
+
+
+def compile_filter(
+    filters: Optional[Dict[str, Any]],
+    param_prefix: str = "f",
+    data_column: str = "data",
+    column_map: Optional[Dict[str, Tuple[str, type]]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Compile a filter document into (sql_expression, params)."""
+    compiler = FilterCompiler(param_prefix=param_prefix, data_column=data_column, column_map=column_map)
+    sql = compiler.compile(filters)
+    return sql, compiler.params
+
+
+def _and(left: Optional[bool], right: Optional[bool]) -> Optional[bool]:
+    if left is False or right is False:
+        return False
+    if left is None or right is None:
+        return None
+    return True
+
+
+def _or(left: Optional[bool], right: Optional[bool]) -> Optional[bool]:
+    if left is True or right is True:
+        return True
+    if left is None or right is None:
+        return None
+    return False
+
+
+def _not(value: Optional[bool]) -> Optional[bool]:
+    return None if value is None else not value
+
+
+class FilterMatcher:
+    """
+    Evaluates a filter document against documents in Python, giving the result the
+    compiled SQL would: missing paths and untyped comparisons are NULL (unknown,
+    None here) and NULL propagates through NOT and AND/OR as in SQL, so a
+    document matches only if the filter is definitely true.
+
+    The filter is compiled once up front, so invalid filters raise the same
+    ValueError as with compile_filter. String comparisons use code point order
+    rather than the database collation.
+
+    `leased(doc_id)` tells whether a document holds a review lease, for $leased
+    (no document does without it).
+    """
+
+    def __init__(
+        self,
+        filters: Optional[Dict[str, Any]],
+        column_map: Optional[Dict[str, Tuple[str, type]]] = None,
+        leased: Optional[Callable[[str], bool]] = None,
+    ):
+        compile_filter(filters, column_map=column_map)
+        self.filters = filters or {}
+        self.column_map = column_map or {}
+        self.leased = leased
+
+    def matches(self, document: Dict[str, Any]) -> bool:
+        return self._evaluate(document, self.filters) is True
+
+    def _evaluate(self, document: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> Optional[bool]:
+        result: Optional[bool] = True
+        for key, value in (filters or {}).items():
+            if key == "$and":
+                clause: Optional[bool] = True
+                for sub in value:
+                    clause = _and(clause, self._evaluate(document, sub))
+            elif key == "$or":
+                clause = False
+                for sub in value:
+                    clause = _or(clause, self._evaluate(document, sub))
+            elif key == "$leased":
+                clause = bool(self.leased and self.leased(document.get("_id"))) is value
+            else:
+                clause = self._field(document, split_path(key), value)
+            result = _and(result, clause)
+        return result
+
+    def _field(self, document: Dict[str, Any], parts: List[str], value: Any) -> Optional[bool]:
+        if not FilterCompiler._is_operator_dict(value):
+            return self._eq(document, parts, value)
+        result: Optional[bool] = True
+        for op, operand in value.items():
+            result = _and(result, self._operator(document, parts, op, operand))
+        return result
+
+    def _column(self, document: Dict[str, Any], parts: Sequence[str], *values: Any) -> Tuple[bool, Any]:
+        """(True, column value) when the compiler would use the promoted column, else (False, None)."""
+        entry = self.column_map.get(".".join(parts))
+        if not entry or any(value is not None and type(value) is not entry[1] for value in values):
+            return False, None
+        raw = extract_path(document, parts)
+        if entry[1] is bool:
+            return True, raw if isinstance(raw, bool) else None
+        return True, json_text(raw)
+
+    def _operator(self, document: Dict[str, Any], parts: List[str], op: str, operand: Any) -> Optional[bool]:
+        if op == "$eq":
+            return self._eq(document, parts, operand)
+        if op == "$ne":
+            use_column, column = self._column(document, parts, operand)
+            if use_column:
+                return column is not None if operand is None else column != operand
+            return _not(self._eq(document, parts, operand))
+        if op == "$in":
+            return self._in(document, parts, operand)
+        if op == "$nin":
+            return _not(self._in(document, parts, operand))
+        if op in COMPARISON_OPERATORS:
+            return self._compare(extract_path(document, parts), op, operand)
+        if op == "$contains":
+            return json_contains(document, json.loads(to_json(nest(parts, [operand]))))
+        if op == "$icontains":
+            return self._icontains(extract_path(document, parts), operand)
+        if op == "$exists":
+            return (extract_path(document, parts) is not ABSENT) == bool(operand)
+        # $not
+        return _not(self._field(document, parts, operand) is True)
+
+    def _eq(self, document: Dict[str, Any], parts: List[str], value: Any) -> Optional[bool]:
+        use_column, column = self._column(document, parts, value)
+        if use_column:
+            if value is None:
+                return column is None
+            return None if column is None else column == value
+        raw = extract_path(document, parts)
+        if value is None:
+            return raw is ABSENT or raw is None
+        value = json.loads(to_json(value))
+        if isinstance(value, (dict, list)):
+            return None if raw is ABSENT else json_equal(raw, value)
+        # Containment of the nested value, as compiled: numeric path parts never index arrays
+        return json_contains(document, nest(parts, value))
+
+    def _in(self, document: Dict[str, Any], parts: List[str], values: Any) -> Optional[bool]:
+        values = list(values)
+        if not values:
+            return False
+        use_column, column = self._column(document, parts, *values)
+        if use_column:
+            if column is None:
+                return None in values
+            return column in [value for value in values if value is not None]
+        raw = extract_path(document, parts)
+        return json_contains(json.loads(to_json(values)), [None if raw is ABSENT else raw])
+
+    @staticmethod
+    def _compare(raw: Any, op: str, value: Any) -> Optional[bool]:
+        if raw is ABSENT:
+            return None
+        if isinstance(value, (int, float)):
+            if not _is_number(raw):
+                return False
+        elif not isinstance(raw, str):
+            return False
+        elif isinstance(value, datetime):
+            raw, value = parse_timestamp(raw), _as_utc(value)
+        return {
+            "$gt": raw > value,
+            "$gte": raw >= value,
+            "$lt": raw < value,
+            "$lte": raw <= value,
+        }[op]
+
+    @staticmethod
+    def _icontains(raw: Any, needle: str) -> Optional[bool]:
+        needle = needle.lower()
+        if isinstance(raw, dict):
+            # jsonb orders keys by byte length, then bytewise
+            keys = sorted(raw, key=lambda key: (len(key.encode()), key.encode()))
+            texts = (json_text(raw[key]) for key in keys)
+            return needle in " ".join(text for text in texts if text).lower()
+        text = json_text(raw)
+        return None if text is None else needle in text.lower()
+
+
+def match_filter(
+    document: Dict[str, Any],
+    filters: Optional[Dict[str, Any]],
+    column_map: Optional[Dict[str, Tuple[str, type]]] = None,
+) -> bool:
+    """True if `document` matches the filter document (see FilterMatcher)."""
+    return FilterMatcher(filters, column_map).matches(document)
@@ -0,0 +1,1230 @@
+"""
+In-memory storage backend - implements the StorageBackend interface over Python
+dicts, so services, routes and benchmarks can run in-process without PostgreSQL
+(STORAGE_TYPE=memory). Nothing is persisted.
+
+Documents behave as they do in the PostgreSQL backend:
+- they are stored as JSON (datetimes become ISO strings) and every read returns
+  a fresh copy;
+- filters, updates, aggregates and projections go through the Python evaluators
+  in db_filters, db_updates, db_aggregate and db_projection, including the
+  promoted-column semantics of `column_map`;
+- every write to an existing document bumps its version (VERSION_FIELD);
+- query_collection sorts by the same keys and pages with the same cursors.
+
+Transactions are read committed: writes stay private to their transaction until
+it commits, and a written (or get_for_update) document stays locked until then,
+so concurrent writers wait for it and claim_next_dataset_items skips it like
+FOR UPDATE SKIP LOCKED. Every adapter call yields to the event loop once, so
+concurrent tasks interleave between calls as they would between statements.
+
+Differences: count="estimate" counts exactly, search ranks by how often the
+query tokens occur instead of ts_rank_cd, strings sort by code point instead of
+the database collation, and there is no document cache.
+"""
+import asyncio
+import inspect
+import itertools
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from backend.app.config import config
+    from backend.app.db_aggregate import aggregate_documents
+    from backend.app.db_backend import (
+        LEASED_QUEUE_STATUS, VERSION_FIELD, StorageBackend, VersionConflict, claim_scope, decode_cursor,
+        document_version, encode_cursor, leased_item,
+    )
+    from backend.app.db_codec import get_codec
+    from backend.app.db_filters import (
+        ABSENT, FilterMatcher, extract_path, json_sort_key, json_text, parse_timestamp, split_path,
+    )
+    from backend.app.db_metrics import DBMetrics, db_operation
+    from backend.app.db_projection import normalize_projection, project
+    from backend.app.db_search import MAX_TOKEN_BYTES, SEARCH_FIELDS, document_text, tokenize
+    from backend.app.db_updates import apply_update, compile_update
+except ImportError:
+    from app.config import config
+    from app.db_aggregate import aggregate_documents
+    from app.db_backend import (
+        LEASED_QUEUE_STATUS, VERSION_FIELD, StorageBackend, VersionConflict, claim_scope, decode_cursor,
+        document_version, encode_cursor, leased_item,
+    )
+    from app.db_codec import get_codec
+    from app.db_filters import (
+        ABSENT, FilterMatcher, extract_path, json_sort_key, json_text, parse_timestamp, split_path,
+    )
+    from app.db_metrics import DBMetrics, db_operation
+    from app.db_projection import normalize_projection, project
+    from app.db_search import MAX_TOKEN_BYTES, SEARCH_FIELDS, document_text, tokenize
+    from app.db_updates import apply_update, compile_update
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str]
+# A review lease: (lock_owner, leased_at, expires_at)
+Lease = Tuple[str, datetime, datetime]
+# Queue counter group: (dataset_type_id, language, status, finalized)
+QueueGroup = Tuple[str, str, str, bool]
+
+
+class MemoryDeadlock(RuntimeError):
+    """Two transactions wait for documents the other one has locked."""
+
+
+class _Row:
+    """One stored document version; rows are never modified, writes replace them."""
+
+    __slots__ = ("id", "raw", "data", "created_at", "updated_at", "tokens")
+
+    def __init__(self, row_id: int, raw: bytes, data: Dict[str, Any], created_at: datetime, updated_at: datetime):
+        self.id = row_id
+        self.raw = raw
+        # Decoded once for matching and sorting; never handed to callers
+        self.data = data
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.tokens: Optional[List[str]] = None
+
+
+class MemoryTransaction:
+    """
+    A transaction on a MemoryAdapter. It is also the session object passed to
+    `session=` parameters and the unit of work's transaction.
+    """
+
+    def __init__(self, adapter: "MemoryAdapter"):
+        self.adapter = adapter
+        self.active = True
+        # Uncommitted writes: key -> new row, or None for a deleted document
+        self.writes: Dict[Key, Optional[_Row]] = {}
+        # Uncommitted lease changes: item_id -> lease, or None for a released one
+        self.lease_writes: Dict[str, Optional[Lease]] = {}
+        self.locked: set = set()
+        self.done = asyncio.Event()
+        self.waiting_for: Optional["MemoryTransaction"] = None
+        # Run once the transaction has committed
+        self.on_commit: List[Callable[[], None]] = []
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator["MemoryTransaction"]:
+        """Undo the block's writes if it raises (locks are kept until the transaction ends)."""
+        saved, saved_leases = dict(self.writes), dict(self.lease_writes)
+        try:
+            yield self
+        except BaseException:
+            self.writes, self.lease_writes = saved, saved_leases
+            raise
+
+    async def close(self, commit: bool) -> None:
+        self.adapter._finish(self, commit)
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    """documents_parse_ts(): None for missing or unparseable values."""
+    text = json_text(value)
+    if not text:
+        return None
+    try:
+        return parse_timestamp(text)
+    except ValueError:
+        return None
+
+
+def _int_value(value: Any) -> Optional[int]:
+    """`(data->>path)::int` (raises ValueError like the cast fails)."""
+    text = json_text(value)
+    return None if text is None else int(text)
+
+
+# query_collection sort keys (as db_adapter.QUERY_SORTS): name -> value of a row
+_SORT_VALUES: Dict[str, Callable[[_Row], Any]] = {
+    "created_at": lambda row: (
+        _parse_ts(row.data.get("created_at")) or row.created_at.replace(tzinfo=timezone.utc)
+    ),
+    "updated_at": lambda row: row.updated_at,
+    "item_number": lambda row: _int_value(extract_path(row.data, ["item_number"])),
+    "review_count": lambda row: _int_value(extract_path(row.data, ["review_state", "review_count"])),
+}
+
+
+def _cursor_value(sort_key: str, value: Any) -> Any:
+    """Cursor position value back in the type of its sort key."""
+    if value is None:
+        return None
+    if sort_key == "created_at":
+        return parse_timestamp(str(value))
+    if sort_key == "updated_at":
+        return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+    return int(value)
+
+
+def _order_key(value: Any, row_id: int) -> Tuple:
+    """(value, id) ordering with NULLs after values, as PostgreSQL sorts ascending."""
+    return (1, row_id) if value is None or value is ABSENT else (0, value, row_id)
+
+
+class MemoryAdapter(StorageBackend):
+    """
+    Storage backend keeping documents in process memory (see module docstring).
+    `column_map` is the promoted-column map of the PostgreSQL schema
+    (db_adapter.FILTER_COLUMNS), so filters treat those paths the same way.
+    """
+
+    def __init__(self, column_map: Optional[Dict[str, Tuple[str, type]]] = None):
+        self.codec = get_codec(config.JSON_CODEC)
+        self.metrics = DBMetrics(
+            enabled=config.DB_METRICS_ENABLED,
+            slow_query_ms=config.SLOW_QUERY_MS,
+        )
+        self.column_map = column_map or {}
+        # Committed documents: collection -> doc_id -> row
+        self._rows: Dict[str, Dict[str, _Row]] = {}
+        # Documents locked by an open transaction
+        self._locks: Dict[Key, MemoryTransaction] = {}
+        # Review leases (the item_leases table): item_id -> lease
+        self._leases: Dict[str, Lease] = {}
+        # Queue counters (see db_adapter.QUEUE_COUNTERS_SCHEMA), updated on commit
+        self._queue_counters: Dict[QueueGroup, int] = {}
+        # Stands in for the reaper's advisory lock
+        self._reaper_lock = asyncio.Lock()
+        # Claim watermarks: (lock_owner, scope) -> (queue position, rebuilt at)
+        self._claim_watermarks: Dict[Tuple[str, str], Tuple[Tuple[datetime, int], datetime]] = {}
+        self._ids = itertools.count(1)
+
+    # Lifecycle, sessions and transactions
+
+    async def _ensure_schema(self):
+        return None
+
+    async def startup(self) -> None:
+        """Nothing to prepare (application startup hook)."""
+
+    async def shutdown(self) -> None:
+        """Nothing to release (application shutdown hook)."""
+
+    def clear(self) -> None:
+        """Drop every document (between tests or benchmark runs)."""
+        self._rows.clear()
+        self._leases.clear()
+        self._queue_counters.clear()
+        self._claim_watermarks.clear()
+
+    def _new_unit_of_work(self) -> MemoryTransaction:
+        return MemoryTransaction(self)
+
+    @asynccontextmanager
+    async def _session(self, session: Optional[MemoryTransaction] = None) -> AsyncIterator[MemoryTransaction]:
+        """Transaction for one adapter call: `session`, the active unit of work's, or its own."""
+        await asyncio.sleep(0)
+        if session is None:
+            session = self._active_unit_of_work()
+        if session is not None:
+            yield session
+            return
+        async with self._own_transaction() as transaction:
+            yield transaction
+
+    @asynccontextmanager
+    async def _own_transaction(self) -> AsyncIterator[MemoryTransaction]:
+        transaction = MemoryTransaction(self)
+        try:
+            yield transaction
+        except BaseException:
+            self._finish(transaction, commit=False)
+            raise
+        else:
+            self._finish(transaction, commit=True)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[MemoryTransaction]:
+        """
+        Async transactional context yielding a shared session. Inside a unit of
+        work it is a savepoint on the unit's transaction, so the block still rolls
+        back on its own if it raises.
+        """
+        unit = self._active_unit_of_work()
+        if unit is None:
+            async with self._session() as session:
+                yield session
+            return
+        async with unit.savepoint():
+            yield unit
+
+    def _finish(self, transaction: MemoryTransaction, commit: bool) -> None:
+        if not transaction.active:
+            return
+        transaction.active = False
+        if commit:
+            deleted_items = set()
+            for (collection, doc_id), row in transaction.writes.items():
+                table = self._rows.setdefault(collection, {})
+                old = table.get(doc_id)
+                if row is None:
+                    table.pop(doc_id, None)
+                else:
+                    table[doc_id] = row
+                if collection == "dataset_items":
+                    self._count_item(old, row)
+                    if row is None:
+                        deleted_items.add(doc_id)
+            for item_id, lease in transaction.lease_writes.items():
+                if lease is not None and item_id not in deleted_items and item_id not in self._leases:
+                    self._count_lease(item_id, 1)
+                elif lease is None and item_id in self._leases:
+                    self._count_lease(item_id, -1)
+                if lease is None or item_id in deleted_items:
+                    self._leases.pop(item_id, None)
+                else:
+                    self._leases[item_id] = lease
+            for callback in transaction.on_commit:
+                callback()
+        for key in transaction.locked:
+            if self._locks.get(key) is transaction:
+                del self._locks[key]
+        transaction.writes = {}
+        transaction.lease_writes = {}
+        transaction.done.set()
+
+    @staticmethod
+    def _queue_group(data: Dict[str, Any], leased: bool = False) -> QueueGroup:
+        """Queue counter group of a dataset item (QUEUE_KEY_SQL / QUEUE_LEASED_KEY_SQL)."""
+        group = (
+            json_text(extract_path(data, ["dataset_type_id"])) or "",
+            json_text(extract_path(data, ["language"])) or "",
+        )
+        if leased:
+            return group + (LEASED_QUEUE_STATUS, False)
+        return group + (
+            json_text(extract_path(data, ["review_state", "status"])) or "",
+            extract_path(data, ["review_state", "finalized"]) is True,
+        )
+
+    def _add_count(self, group: QueueGroup, delta: int) -> None:
+        items = self._queue_counters.get(group, 0) + delta
+        if items:
+            self._queue_counters[group] = items
+        else:
+            self._queue_counters.pop(group, None)
+
+    def _count_item(self, old: Optional[_Row], new: Optional[_Row]) -> None:
+        """Committed write of a dataset item (old/new None when inserted/deleted): the queue triggers."""
+        if old is not None:
+            self._add_count(self._queue_group(old.data), -1)
+        if new is not None:
+            self._add_count(self._queue_group(new.data), 1)
+        if old is not None and old.data["_id"] in self._leases:
+            self._add_count(self._queue_group(old.data, leased=True), -1)
+            if new is not None:
+                self._add_count(self._queue_group(new.data, leased=True), 1)
+
+    def _count_lease(self, item_id: str, delta: int) -> None:
+        row = self._rows.get("dataset_items", {}).get(item_id)
+        if row is not None:
+            self._add_count(self._queue_group(row.data, leased=True), delta)
+
+    async def _lock(self, transaction: MemoryTransaction, key: Key) -> None:
+        """Lock a document for `transaction`, waiting while another transaction holds it."""
+        while True:
+            owner = self._locks.get(key)
+            if owner is None or owner is transaction or not owner.active:
+                self._locks[key] = transaction
+                transaction.locked.add(key)
+                return
+            waiter: Optional[MemoryTransaction] = owner
+            while waiter is not None:
+                if waiter is transaction:
+                    raise MemoryDeadlock(f"deadlock detected waiting for {key[0]}/{key[1]}")
+                waiter = waiter.waiting_for
+            transaction.waiting_for = owner
+            try:
+                await owner.done.wait()
+            finally:
+                transaction.waiting_for = None
+
+    def _skip_locked(self, transaction: MemoryTransaction, key: Key) -> bool:
+        """Whether another open transaction holds `key` (SKIP LOCKED)."""
+        owner = self._locks.get(key)
+        return owner is not None and owner is not transaction and owner.active
+
+    def _lookup(self, transaction: MemoryTransaction, collection: str, doc_id: str) -> Optional[_Row]:
+        key = (collection, doc_id)
+        if key in transaction.writes:
+            return transaction.writes[key]
+        return self._rows.get(collection, {}).get(doc_id)
+
+    def _lease(self, transaction: MemoryTransaction, item_id: str) -> Optional[Lease]:
+        if item_id in transaction.lease_writes:
+            return transaction.lease_writes[item_id]
+        return self._leases.get(item_id)
+
+    def _leases_of(self, transaction: MemoryTransaction) -> Dict[str, Lease]:
+        """Leases visible to `transaction`."""
+        leases = {**self._leases, **transaction.lease_writes}
+        return {item_id: lease for item_id, lease in leases.items() if lease is not None}
+
+    async def _locked_row(self, transaction: MemoryTransaction, collection: str, doc_id: str) -> Optional[_Row]:
+        """Current row of an existing document, locked for writing (None if it doesn't exist)."""
+        if self._lookup(transaction, collection, doc_id) is None:
+            return None
+        await self._lock(transaction, (collection, doc_id))
+        return self._lookup(transaction, collection, doc_id)
+
+    def _rows_of(self, transaction: MemoryTransaction, collection: str) -> List[_Row]:
+        """Rows of a collection visible to `transaction`, in id order."""
+        table = self._rows.get(collection, {})
+        own = {doc_id: row for (name, doc_id), row in transaction.writes.items() if name == collection}
+        if own:
+            table = dict(table)
+            for doc_id, row in own.items():
+                if row is None:
+                    table.pop(doc_id, None)
+                else:
+                    table[doc_id] = row
+        return sorted(table.values(), key=lambda row: row.id)
+
+    def _write(
+        self,
+        transaction: MemoryTransaction,
+        collection: str,
+        doc_id: str,
+        document: Dict[str, Any],
+        existing: Optional[_Row],
+    ) -> _Row:
+        """Store a new version of a locked document; rewriting an existing one bumps its version."""
+        now = datetime.utcnow()
+        if existing is not None:
+            document = {**document, VERSION_FIELD: document_version(existing.data) + 1}
+        raw = self.codec.dumps(document)
+        row = _Row(
+            existing.id if existing is not None else next(self._ids),
+            raw,
+            self.codec.loads(raw),
+            existing.created_at if existing is not None else now,
+            now,
+        )
+        transaction.writes[(collection, doc_id)] = row
+        return row
+
+    async def _put(self, transaction: MemoryTransaction, collection: str, document: Dict[str, Any]) -> _Row:
+        """Insert or replace a document (INSERT ... ON CONFLICT DO UPDATE)."""
+        doc_id = document["_id"]
+        await self._lock(transaction, (collection, doc_id))
+        return self._write(transaction, collection, doc_id, document, self._lookup(transaction, collection, doc_id))
+
+    def _read(self, row: Optional[_Row]) -> Optional[Dict[str, Any]]:
+        return self.codec.loads(row.raw) if row is not None else None
+
+    def _matcher(self, filters: Optional[Dict[str, Any]]) -> FilterMatcher:
+        return FilterMatcher(filters, self.column_map, leased=self._is_leased)
+
+    def _is_leased(self, item_id: str) -> bool:
+        """Whether an item holds a lease, as the active unit of work sees it ($leased)."""
+        transaction = self._active_unit_of_work()
+        if transaction is not None:
+            return self._lease(transaction, item_id) is not None
+        return item_id in self._leases
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """No document cache: documents are already in memory."""
+        return {"collections": [], "listening": False}
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """No connection pool."""
+        return {"storage": "memory"}
+
+    async def ping(self) -> float:
+        """Yield to the event loop once; returns seconds taken."""
+        started = time.perf_counter()
+        await asyncio.sleep(0)
+        return time.perf_counter() - started
+
+    # Single documents
+
+    @db_operation()
+    async def insert(self, collection: str, document: Dict[str, Any]) -> str:
+        """Insert document, generate ID if not present"""
+        doc_id = document.get("_id") or str(uuid.uuid4())
+        document["_id"] = doc_id
+        async with self._session() as transaction:
+            await self._put(transaction, collection, document)
+        return doc_id
+
+    @db_operation()
+    async def get(
+        self,
+        collection: str,
+        doc_id: str,
+        projection: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get document by ID, limited to `_id` and the `projection` paths if given."""
+        projection = normalize_projection(projection)
+        async with self._session() as transaction:
+            document = self._read(self._lookup(transaction, collection, doc_id))
+        return project(document, projection) if projection else document
+
+    @db_operation(rows=len)
+    async def get_many(self, collection: str, doc_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several documents by ID; IDs that don't exist are left out."""
+        doc_ids = list(dict.fromkeys(doc_id for doc_id in doc_ids if doc_id))
+        async with self._session() as transaction:
+            rows = {doc_id: self._lookup(transaction, collection, doc_id) for doc_id in doc_ids}
+        return {doc_id: self._read(row) for doc_id, row in rows.items() if row is not None}
+
+    @db_operation(rows=len)
+    async def get_by_prefix(self, collection: str, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        """Get all documents whose ID starts with `prefix`, as {doc_id: document}."""
+        async with self._session() as transaction:
+            rows = self._rows_of(transaction, collection)
+        return {row.data["_id"]: self._read(row) for row in rows if str(row.data.get("_id")).startswith(prefix)}
+
+    @db_operation(rows=len)
+    async def list_ids(self, collection: str, prefix: str = "") -> List[str]:
+        """IDs of the documents whose ID starts with `prefix`."""
+        async with self._session() as transaction:
+            rows = self._rows_of(transaction, collection)
+        return [row.data["_id"] for row in rows if str(row.data.get("_id")).startswith(prefix)]
+
+    @db_operation()
+    async def get_for_update(
+        self, session: MemoryTransaction, collection: str, doc_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get document by ID, locked until the session's transaction ends."""
+        async with self._session(session) as transaction:
+            return self._read(await self._locked_row(transaction, collection, doc_id))
+
+    @db_operation()
+    async def update_one(
+        self,
+        collection: str,
+        doc_id: str,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        push_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        session: Optional[MemoryTransaction] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Apply a partial update (see db_updates) and return the new document, None if missing."""
+        compile_update(set_fields, inc_fields, push_fields, unset_fields)
+        async with self._session(session) as transaction:
+            row = await self._locked_row(transaction, collection, doc_id)
+            if row is None:
+                return None
+            document = apply_update(self._read(row), set_fields, inc_fields, push_fields, unset_fields)
+            return self._read(self._write(transaction, collection, doc_id, document, row))
+
+    async def _write_if_version(
+        self,
+        session: Optional[MemoryTransaction],
+        collection: str,
+        doc_id: str,
+        expected_version: int,
+        build: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Write build(current document) if the document is at expected_version."""
+        async with self._session(session) as transaction:
+            row = await self._locked_row(transaction, collection, doc_id)
+            if row is None:
+                return None
+            if document_version(row.data) != int(expected_version):
+                raise VersionConflict(collection, doc_id, expected_version)
+            return self._read(self._write(transaction, collection, doc_id, build(self._read(row)), row))
+
+    @db_operation()
+    async def update_if_version(
+        self,
+        collection: str,
+        doc_id: str,
+        expected_version: int,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        push_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        session: Optional[MemoryTransaction] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Compare-and-swap partial update (see DBAdapter.update_if_version)."""
+        compile_update(set_fields, inc_fields, push_fields, unset_fields)
+        return await self._write_if_version(
+            session, collection, doc_id, expected_version,
+            lambda document: apply_update(document, set_fields, inc_fields, push_fields, unset_fields),
+        )
+
+    @db_operation()
+    async def replace_if_version(
+        self,
+        collection: str,
+        doc_id: str,
+        document: Dict[str, Any],
+        expected_version: int,
+        session: Optional[MemoryTransaction] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Compare-and-swap replacement of a whole document (semantics as update_if_version)."""
+        document["_id"] = doc_id
+        return await self._write_if_version(session, collection, doc_id, expected_version, lambda _: document)
+
+    @db_operation()
+    async def increment_counter(
+        self,
+        collection: str,
+        doc_id: str,
+        field: str,
+        amount: int = 1,
+        defaults: Optional[Dict[str, Any]] = None,
+        session: Optional[MemoryTransaction] = None,
+    ) -> int:
+        """Atomically add `amount` to a numeric field and return the new value (see DBAdapter)."""
+        parts = split_path(field)
+        async with self._session(session) as transaction:
+            await self._lock(transaction, (collection, doc_id))
+            row = self._lookup(transaction, collection, doc_id)
+            document = self._read(row) if row is not None else {**(defaults or {}), "_id": doc_id}
+            document = apply_update(document, inc_fields={field: amount})
+            row = self._write(transaction, collection, doc_id, document, row)
+        return int(extract_path(row.data, parts))
+
+    async def _upsert_with_session(
+        self, session: MemoryTransaction, collection: str, document: Dict[str, Any]
+    ) -> str:
+        document["_id"] = document.get("_id") or str(uuid.uuid4())
+        async with self._session(session) as transaction:
+            await self._put(transaction, collection, document)
+        return document["_id"]
+
+    @db_operation()
+    async def delete(self, collection: str, doc_id: str) -> bool:
+        """Delete document"""
+        async with self._session() as transaction:
+            if await self._locked_row(transaction, collection, doc_id) is None:
+                return False
+            transaction.writes[(collection, doc_id)] = None
+            return True
+
+    # Bulk writes
+
+    @db_operation(rows=lambda result: result["written"])
+    async def insert_many(
+        self,
+        collection: str,
+        documents: Sequence[Dict[str, Any]],
+        on_conflict: str = "error",
+        batch_size: Optional[int] = None,
+        session: Optional[MemoryTransaction] = None,
+    ) -> Dict[str, Any]:
+        """
+        Insert documents in batches in one transaction (the caller's when `session`
+        is given); on_conflict and the result are as in DBAdapter.insert_many. An
+        existing doc_id with on_conflict="error" raises ValueError.
+        """
+        if on_conflict not in ("error", "ignore", "update"):
+            raise ValueError(f"on_conflict must be 'error', 'ignore' or 'update', got {on_conflict!r}")
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        ids: List[str] = []
+        for document in documents:
+            document["_id"] = document.get("_id") or str(uuid.uuid4())
+            ids.append(document["_id"])
+        result: Dict[str, Any] = {"ids": ids, "written": 0, "batches": []}
+        if not ids:
+            return result
+
+        async with self._session(session) as transaction:
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+                if on_conflict != "error":
+                    by_id: Dict[str, Dict[str, Any]] = {}
+                    for document in batch:
+                        if on_conflict == "update" or document["_id"] not in by_id:
+                            by_id[document["_id"]] = document
+                    batch = list(by_id.values())
+                started = time.perf_counter()
+                written = 0
+                for document in batch:
+                    doc_id = document["_id"]
+                    await self._lock(transaction, (collection, doc_id))
+                    existing = self._lookup(transaction, collection, doc_id)
+                    if existing is not None:
+                        if on_conflict == "error":
+                            raise ValueError(f"Document {collection}/{doc_id} already exists")
+                        if on_conflict == "ignore":
+                            continue
+                    self._write(transaction, collection, doc_id, document, existing)
+                    written += 1
+                seconds = time.perf_counter() - started
+                result["written"] += written
+                result["batches"].append({
+                    "rows": len(batch), "written": written, "method": "memory", "seconds": seconds,
+                })
+        return result
+
+    @db_operation(rows=lambda result: result["affected"])
+    async def update_many(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+        progress: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Any]:
+        """Partially update every matching document in batches (see DBAdapter.update_many)."""
+        compile_update(set_fields, inc_fields, None, unset_fields)
+
+        def write(transaction: MemoryTransaction, row: _Row, doc_id: str) -> None:
+            document = apply_update(self._read(row), set_fields, inc_fields, None, unset_fields)
+            self._write(transaction, collection, doc_id, document, row)
+
+        return await self._run_batched(collection, filters, write, batch_size, pause_sec, progress)
+
+    @db_operation(rows=lambda result: result["affected"])
+    async def delete_many(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+        progress: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        id_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Delete every matching document in batches (see DBAdapter.delete_many)."""
+
+        def write(transaction: MemoryTransaction, row: _Row, doc_id: str) -> None:
+            transaction.writes[(collection, doc_id)] = None
+
+        return await self._run_batched(collection, filters, write, batch_size, pause_sec, progress, id_prefix)
+
+    async def _run_batched(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]],
+        write: Callable[[MemoryTransaction, _Row, str], None],
+        batch_size: Optional[int],
+        pause_sec: Optional[float],
+        progress: Optional[Callable[[Dict[str, Any]], Any]],
+        id_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Apply `write` to matching documents in id-ordered batches, one transaction each."""
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        pause_sec = config.BULK_PAUSE_SEC if pause_sec is None else pause_sec
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        matcher = self._matcher(self._shorthand_document(filters))
+
+        started = time.perf_counter()
+        after_id = 0
+        affected = 0
+        batches = 0
+        while True:
+            batch_started = time.perf_counter()
+            await asyncio.sleep(0)
+            async with self._own_transaction() as transaction:
+                batch = []
+                for row in self._rows_of(transaction, collection):
+                    if id_prefix and not str(row.data.get("_id")).startswith(id_prefix):
+                        continue
+                    if row.id > after_id and matcher.matches(row.data):
+                        batch.append(row)
+                        if len(batch) == batch_size:
+                            break
+                written = 0
+                for row in batch:
+                    doc_id = row.data["_id"]
+                    # The filter is checked again so rows changed after the batch was read are skipped
+                    current = await self._locked_row(transaction, collection, doc_id)
+                    if current is None or current.id != row.id or not matcher.matches(current.data):
+                        continue
+                    write(transaction, current, doc_id)
+                    written += 1
+            if not batch:
+                break
+            batches += 1
+            affected += written
+            after_id = batch[-1].id
+            if progress is not None:
+                report = progress({
+                    "batch": batches,
+                    "scanned": len(batch),
+                    "affected": written,
+                    "total_affected": affected,
+                    "seconds": time.perf_counter() - batch_started,
+                })
+                if inspect.isawaitable(report):
+                    await report
+            if len(batch) < batch_size:
+                break
+            if pause_sec:
+                await asyncio.sleep(pause_sec)
+
+        seconds = time.perf_counter() - started
+        logger.info("%s batched write: %d documents in %d batches (%.2fs)", collection, affected, batches, seconds)
+        return {"affected": affected, "batches": batches, "seconds": seconds}
+
+    @db_operation(rows=int)
+    async def patch_many(
+        self,
+        collection: str,
+        patches: Dict[str, Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+    ) -> int:
+        """Merge a different top-level patch into each document ({doc_id: patch}); returns updated documents."""
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        pause_sec = config.BULK_PAUSE_SEC if pause_sec is None else pause_sec
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        items = list(patches.items())
+        updated = 0
+        for start in range(0, len(items), batch_size):
+            if start and pause_sec:
+                await asyncio.sleep(pause_sec)
+            await asyncio.sleep(0)
+            async with self._own_transaction() as transaction:
+                for doc_id, patch in items[start:start + batch_size]:
+                    row = await self._locked_row(transaction, collection, doc_id)
+                    if row is None:
+                        continue
+                    self._write(transaction, collection, doc_id, {**self._read(row), **patch}, row)
+                    updated += 1
+        return updated
+
+    # Queries
+
+    @db_operation()
+    async def find(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_dir: str = "asc",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+        projection: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find documents matching a filter document (operators: see db_filters), ordered
+        by `sort_by` (dotted path) then id. `predicate` and `projection` work as in
+        DBAdapter.find.
+        """
+        if callable(filters):
+            predicate, filters = filters, None
+        matcher = self._matcher(filters)
+        projection = normalize_projection(projection)
+        sort_parts = split_path(sort_by) if sort_by else None
+
+        async with self._session() as transaction:
+            rows = [row for row in self._rows_of(transaction, collection) if matcher.matches(row.data)]
+        if sort_parts:
+            rows.sort(
+                key=lambda row: _order_key(self._json_order(extract_path(row.data, sort_parts)), row.id),
+                reverse=str(sort_dir).lower() == "desc",
+            )
+
+        end = offset + limit if limit is not None else None
+        if predicate is None:
+            documents = [self._read(row) for row in rows[offset:end]]
+        else:
+            logger.warning(
+                "Slow path: in-Python predicate scan over %s (%d candidate rows); use a filter document instead",
+                collection,
+                len(rows),
+            )
+            documents = [document for document in map(self._read, rows) if predicate(document)][offset:end]
+        if projection:
+            documents = [project(document, projection) for document in documents]
+        return documents
+
+    @staticmethod
+    def _json_order(value: Any) -> Any:
+        """jsonb sort key of a path value; missing values stay None (sorted as NULL)."""
+        return None if value is ABSENT else json_sort_key(value)
+
+    def _facet_matchers(self, count_filters: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, FilterMatcher]:
+        return {
+            name: self._matcher(self._shorthand_document(facet_filters))
+            for name, facet_filters in (count_filters or {}).items()
+        }
+
+    @db_operation(rows=lambda result: len(result["items"]))
+    async def query_collection(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+        count_filters: Optional[Dict[str, Dict[str, Any]]] = None,
+        projection: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Filtered, sorted, paginated query with the semantics of
+        DBAdapter.query_collection; count="estimate" counts exactly.
+        """
+        if count not in ("exact", "estimate", "none"):
+            raise ValueError(f"count must be 'exact', 'estimate' or 'none', got {count!r}")
+        if cursor and offset:
+            raise ValueError("Use either cursor or offset pagination, not both")
+        if (not filters and limit is None and offset == 0 and sort_by == "created_at"
+                and not cursor and not count_filters and not projection):
+            items = await self.list_collection(collection)
+            return {"items": items, "total": len(items), "next_cursor": None, "counts": {}}
+
+        matcher = self._matcher(self._shorthand_document(filters))
+        facets = self._facet_matchers(count_filters)
+        sort_key = sort_by if sort_by in _SORT_VALUES else "created_at"
+        descending = str(sort_dir).lower() == "desc"
+        sort_dir_sql = "DESC" if descending else "ASC"
+        position = None
+        if cursor:
+            position = decode_cursor(cursor, sort_key, sort_dir_sql)
+            position = _order_key(_cursor_value(sort_key, position["value"]), position["id"])
+        projection = normalize_projection(projection)
+        limit = limit if limit is not None else 1000
+
+        async with self._session() as transaction:
+            rows = [row for row in self._rows_of(transaction, collection) if matcher.matches(row.data)]
+        total: Optional[int] = None
+        counts: Dict[str, Optional[int]] = {name: None for name in facets}
+        if count != "none":
+            total = len(rows)
+            counts = {name: sum(1 for row in rows if facet.matches(row.data)) for name, facet in facets.items()}
+
+        value_of = _SORT_VALUES[sort_key]
+        keyed = sorted(((_order_key(value_of(row), row.id), row) for row in rows), key=lambda item: item[0],
+                       reverse=descending)
+        if position is not None:
+            keyed = [item for item in keyed if (item[0] < position if descending else item[0] > position)]
+        else:
+            keyed = keyed[offset:]
+        page = keyed[:limit + 1]
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            last_key, last_row = page[-1]
+            next_cursor = encode_cursor(sort_key, sort_dir_sql, value_of(last_row), last_row.id)
+        items = [self._read(row) for _, row in page]
+        if projection:
+            items = [project(item, projection) for item in items]
+        return {"items": items, "total": total, "next_cursor": next_cursor, "counts": counts}
+
+    @db_operation()
+    async def count_documents(self, collection: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count documents matching shorthand/DSL filters."""
+        matcher = self._matcher(self._shorthand_document(filters))
+        async with self._session() as transaction:
+            return sum(1 for row in self._rows_of(transaction, collection) if matcher.matches(row.data))
+
+    @db_operation()
+    async def aggregate(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Optional[Sequence[str]] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        lookup: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Group matching documents and compute metrics (see db_aggregate and DBAdapter.aggregate)."""
+        matcher = self._matcher(self._shorthand_document(filters))
+        async with self._session() as transaction:
+            documents = [row.data for row in self._rows_of(transaction, collection) if matcher.matches(row.data)]
+            join = None
+            if lookup:
+                lookup_collection, lookup_path = lookup
+                lookup_parts = split_path(lookup_path)
+                targets = {row.data.get("_id"): row.data for row in self._rows_of(transaction, lookup_collection)}
+
+                def join(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                    return targets.get(json_text(extract_path(document, lookup_parts)))
+
+        rows = aggregate_documents(documents, group_by, metrics, column_map=self.column_map, lookup=join)
+        # Group values and min/max may be stored objects; hand out copies
+        return self.codec.loads(self.codec.dumps(rows))
+
+    @db_operation(rows=int)
+    async def sync_search_index(self, batch_size: Optional[int] = None) -> int:
+        """Nothing to sync: search tokenises documents when it first reads them."""
+        return 0
+
+    def _search_tokens(self, row: _Row, path: Sequence[str]) -> List[str]:
+        if row.tokens is None:
+            value = extract_path(row.data, path)
+            row.tokens = [] if value is ABSENT else tokenize(document_text(value))
+        return row.tokens
+
+    @db_operation(rows=lambda result: len(result["items"]))
+    async def search(
+        self,
+        collection: str,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        count: str = "exact",
+        count_filters: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Full-text search as DBAdapter.search (every query token must start a word of
+        the indexed field); ranked by how often the query tokens occur.
+        """
+        if collection not in SEARCH_FIELDS:
+            raise ValueError(f"Collection {collection!r} has no search index")
+        if count not in ("exact", "estimate", "none"):
+            raise ValueError(f"count must be 'exact', 'estimate' or 'none', got {count!r}")
+        if limit < 1 or offset < 0:
+            raise ValueError("limit must be positive and offset non-negative")
+
+        facets = self._facet_matchers(count_filters)
+        tokens = [token for token in dict.fromkeys(tokenize(query)) if len(token.encode()) <= MAX_TOKEN_BYTES]
+        if not tokens:
+            zero = 0 if count != "none" else None
+            return {"items": [], "total": zero, "counts": {name: zero for name in facets}, "has_more": False}
+        matcher = self._matcher(self._shorthand_document(filters))
+        path = split_path(SEARCH_FIELDS[collection])
+
+        scored = []
+        async with self._session() as transaction:
+            for row in self._rows_of(transaction, collection):
+                words = self._search_tokens(row, path)
+                hits = [sum(1 for word in words if word.startswith(token)) for token in tokens]
+                if all(hits) and matcher.matches(row.data):
+                    scored.append((-sum(hits), row.id, row))
+        scored.sort(key=lambda item: item[:2])
+
+        total: Optional[int] = None
+        counts: Dict[str, Optional[int]] = {name: None for name in facets}
+        if count != "none":
+            total = len(scored)
+            counts = {name: sum(1 for *_, row in scored if facet.matches(row.data)) for name, facet in facets.items()}
+        page = scored[offset:offset + limit + 1]
+        items = [self._read(row) for *_, row in page[:limit]]
+        return {"items": items, "total": total, "counts": counts, "has_more": len(page) > limit}
+
+    @staticmethod
+    def _in_claim_scope(row: _Row, languages: List[str], dataset_type_id: Optional[str]) -> bool:
+        """CLAIM_SCOPE_SQL for one document of dataset_items."""
+        data = row.data
+        if dataset_type_id is not None and json_text(extract_path(data, ["dataset_type_id"])) != dataset_type_id:
+            return False
+        return not languages or json_text(extract_path(data, ["language"])) in languages
+
+    @staticmethod
+    def _open_to(row: _Row, lock_owner: str) -> bool:
+        """CLAIM_OPEN_SQL: not finalized, pending or in review, and not reviewed by lock_owner."""
+        data = row.data
+        if extract_path(data, ["review_state", "finalized"]) is True:
+            return False
+        if json_text(extract_path(data, ["review_state", "status"])) not in ("pending", "in_review"):
+            return False
+        reviewed_by = extract_path(data, ["review_state", "reviewed_by"])
+        # NOT (reviewed_by @> [owner]) is NULL, so never true, when reviewed_by is missing
+        return reviewed_by is not ABSENT and not (isinstance(reviewed_by, list) and lock_owner in reviewed_by)
+
+    @staticmethod
+    def _queue_position(row: _Row) -> Tuple[datetime, int]:
+        return _SORT_VALUES["created_at"](row), row.id
+
+    @db_operation(rows=len)
+    async def claim_next_dataset_items(
+        self,
+        languages: Optional[Sequence[str]],
+        lock_owner: str,
+        limit: int = 1,
+        lock_timeout_sec: int = 180,
+        dataset_type_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to `limit` eligible dataset items, oldest first
+        (eligibility, leases and claim watermarks as DBAdapter.claim_next_dataset_items).
+        Items locked by an open transaction are skipped, not waited for.
+        """
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        languages = list(languages) if languages else []
+        now = datetime.utcnow()
+        watermark_key = (lock_owner, claim_scope(languages, dataset_type_id))
+        use_watermark = config.CLAIM_WATERMARK_TTL_SEC > 0
+        rebuild_cutoff = now - timedelta(seconds=config.CLAIM_WATERMARK_TTL_SEC)
+        watermark = self._claim_watermarks.get(watermark_key) if use_watermark else None
+        start = watermark[0] if watermark is not None and watermark[1] >= rebuild_cutoff else None
+
+        claimed = []
+        async with self._session() as transaction:
+            scope = [
+                row for row in self._rows_of(transaction, "dataset_items")
+                if self._in_claim_scope(row, languages, dataset_type_id)
+                and (start is None or self._queue_position(row) >= start)
+            ]
+            scope.sort(key=self._queue_position)
+            for row in scope:
+                if not self._open_to(row, lock_owner):
+                    continue
+                if json_text(extract_path(row.data, ["review_state", "status"])) != "pending":
+                    continue
+                key = ("dataset_items", row.data["_id"])
+                if self._skip_locked(transaction, key):
+                    continue
+                lease = self._lease(transaction, key[1])
+                if lease is not None and lease[2] > now:
+                    continue
+                await self._lock(transaction, key)
+                await self._lock(transaction, ("item_leases", key[1]))
+                transaction.lease_writes[key[1]] = (lock_owner, now, now + timedelta(seconds=lock_timeout_sec))
+                claimed.append(leased_item(self._read(row), lock_owner, now))
+                if len(claimed) == limit:
+                    break
+
+            if use_watermark and scope:
+                # First item still open to the reviewer (claimed ones included), else the last one
+                current = [self._lookup(transaction, "dataset_items", row.data["_id"]) or row for row in scope]
+                position = next(
+                    (self._queue_position(row) for row in current if self._open_to(row, lock_owner)),
+                    self._queue_position(scope[-1]),
+                )
+                transaction.on_commit.append(
+                    lambda: self._advance_claim_watermark(watermark_key, position, now, rebuild_cutoff)
+                )
+        return claimed
+
+    def _advance_claim_watermark(
+        self, key: Tuple[str, str], position: Tuple[datetime, int], now: datetime, rebuild_cutoff: datetime
+    ) -> None:
+        current = self._claim_watermarks.get(key)
+        if current is None or current[1] < rebuild_cutoff:
+            self._claim_watermarks[key] = (position, now)
+        elif current[0] < position:
+            self._claim_watermarks[key] = (position, current[1])
+
+    @db_operation(rows=int)
+    async def release_leases(
+        self,
+        item_ids: Optional[Sequence[str]] = None,
+        lock_owner: Optional[str] = None,
+        expired_only: bool = False,
+        session: Optional[MemoryTransaction] = None,
+    ) -> int:
+        """Delete review leases (see DBAdapter.release_leases)."""
+        now = datetime.utcnow()
+        wanted = set(item_ids) if item_ids is not None else None
+        released = 0
+        async with self._session(session) as transaction:
+            for item_id, lease in self._leases_of(transaction).items():
+                if wanted is not None and item_id not in wanted:
+                    continue
+                if (lock_owner is not None and lease[0] != lock_owner) or (expired_only and lease[2] > now):
+                    continue
+                await self._lock(transaction, ("item_leases", item_id))
+                if self._lease(transaction, item_id) is not None:
+                    transaction.lease_writes[item_id] = None
+                    released += 1
+        return released
+
+    @db_operation()
+    async def reap_expired_leases(
+        self,
+        batch_size: Optional[int] = None,
+        pause_sec: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Delete expired review leases in batches, one reaper at a time (see DBAdapter.reap_expired_leases)."""
+        batch_size = batch_size or config.BULK_WRITE_BATCH_SIZE
+        pause_sec = config.BULK_PAUSE_SEC if pause_sec is None else pause_sec
+        report = {"reclaimed": 0, "batches": 0, "skipped": False,
+                  "oldest_sec": None, "mean_sec": None, "max_overdue_sec": None}
+        if self._reaper_lock.locked():
+            report["skipped"] = True
+            return report
+        ages, overdue = [], []
+        async with self._reaper_lock:
+            while True:
+                now = datetime.utcnow()
+                async with self._session() as transaction:
+                    expired = sorted(
+                        (lease[2], item_id) for item_id, lease in self._leases_of(transaction).items()
+                        if lease[2] <= now and not self._skip_locked(transaction, ("item_leases", item_id))
+                    )[:batch_size]
+                    for _, item_id in expired:
+                        await self._lock(transaction, ("item_leases", item_id))
+                        _, leased_at, expires_at = self._lease(transaction, item_id)
+                        transaction.lease_writes[item_id] = None
+                        ages.append((now - leased_at).total_seconds())
+                        overdue.append((now - expires_at).total_seconds())
+                if expired:
+                    report["batches"] += 1
+                if len(expired) < batch_size:
+                    break
+                if pause_sec:
+                    await asyncio.sleep(pause_sec)
+        if ages:
+            report.update(reclaimed=len(ages), oldest_sec=max(ages), mean_sec=sum(ages) / len(ages),
+                          max_overdue_sec=max(overdue))
+        return report
+
+    @db_operation()
+    async def queue_counts(
+        self,
+        languages: Optional[Sequence[str]] = None,
+        dataset_type_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Sizes of the review queue counter groups (see DBAdapter.queue_counts)."""
+        await asyncio.sleep(0)
+        return [
+            {"dataset_type_id": group[0], "language": group[1], "status": group[2], "finalized": group[3], "items": items}
+            for group, items in sorted(self._queue_counters.items())
+            if (not languages or group[1] in languages) and (dataset_type_id is None or group[0] == dataset_type_id)
+        ]
+
+    @db_operation()
+    async def reconcile_queue_counters(self) -> Dict[str, Any]:
+        """Recount every queue counter group and store the results (see DBAdapter.reconcile_queue_counters)."""
+        await asyncio.sleep(0)
+        rows = self._rows.get("dataset_items", {})
+        actual: Dict[QueueGroup, int] = {}
+        groups = [self._queue_group(row.data) for row in rows.values()]
+        groups += [self._queue_group(rows[item_id].data, leased=True) for item_id in self._leases if item_id in rows]
+        for group in groups:
+            actual[group] = actual.get(group, 0) + 1
+        errors = [actual.get(group, 0) - self._queue_counters.get(group, 0)
+                  for group in set(actual) | set(self._queue_counters)]
+        self._queue_counters = actual
+        return {
+            "groups": len(actual),
+            "corrected": sum(1 for error in errors if error),
+            "drift": sum(abs(error) for error in errors),
+            "skipped": False,
+        }
+
+    @db_operation()
+    async def count_leases(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count active review leases whose dataset item matches shorthand/DSL filters."""
+        matcher = self._matcher(self._shorthand_document(filters))
+        now = datetime.utcnow()
+        async with self._session() as transaction:
+            rows = [
+                self._lookup(transaction, "dataset_items", item_id)
+                for item_id, lease in self._leases_of(transaction).items() if lease[2] > now
+            ]
+            return sum(1 for row in rows if row is not None and matcher.matches(row.data))
+
+    @db_operation()
+    async def get_leases(self, item_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Review leases of `item_ids` (see DBAdapter.get_leases)."""
+        async with self._session() as transaction:
+            leases = {item_id: self._lease(transaction, item_id) for item_id in item_ids}
+        return {
+            item_id: {"lock_owner": lease[0], "leased_at": lease[1], "expires_at": lease[2]}
+            for item_id, lease in leases.items() if lease is not None
+        }
+
+    async def migrate_to_partitioned(self, batch_size: int = 5000, pause_sec: float = 0.0) -> Dict[str, Any]:
+        """Nothing to migrate in memory."""
+        return {"migrated": False, "rows": 0, "batches": 0, "seconds": 0.0}
@@ -0,0 +1,362 @@
+"""
+Instrumentation for DBAdapter operations.
+
+Every decorated adapter method (see `db_operation`) records its op name,
+collection, rows returned, bytes of JSON decoded, statements run and wall
+time into an in-process DBMetrics registry: per (op, collection) totals plus
+a latency histogram. Nested adapter calls (find_one -> find, ...) count
+towards the outermost operation only.
+
+Statement-level numbers come from SQLAlchemy cursor events installed by
+`install_metrics`. Statements slower than the slow-query threshold are logged
+and kept in a short ring buffer; with `explain` enabled the plan is captured
+too: `EXPLAIN (ANALYZE, BUFFERS)` for read-only statements (which runs them a
+second time), plain `EXPLAIN` for writes.
+
+`start_request()` opens a per-request summary (ops, statements, DB time) that
+the debug middleware in main.py turns into response headers.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import re
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+try:
+    from backend.app.db_codec import DECODED_BYTES_KEY
+except ImportError:
+    from app.db_codec import DECODED_BYTES_KEY
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# Slow statements kept for inspection
+SLOW_QUERY_LOG_SIZE = 50
+# Statement text is truncated to this many characters in the slow-query log
+MAX_STATEMENT_CHARS = 2000
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|VALUES)\b", re.IGNORECASE)
+# Statements that change something (or take row locks) must not be run twice by EXPLAIN ANALYZE
+_NOT_READ_ONLY = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|nextval|setval|pg_notify|pg_(try_)?advisory\w*"
+    r"|FOR\s+(UPDATE|SHARE|NO\s+KEY\s+UPDATE|KEY\s+SHARE))\b",
+    re.IGNORECASE,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets_ms: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max for the unbounded bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}" for bound in self.buckets_ms] + ["inf"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class OpRecord:
+    """Numbers collected while one adapter operation runs."""
+
+    __slots__ = ("op", "collection", "started", "seconds", "rows", "statements", "db_seconds", "decoded_bytes")
+
+    def __init__(self, op: str, collection: Optional[str]):
+        self.op = op
+        self.collection = collection
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.rows = 0
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.decoded_bytes = 0
+
+
+class RequestSummary:
+    """Database work done while serving one request."""
+
+    __slots__ = ("ops", "statements", "db_seconds")
+
+    def __init__(self):
+        self.ops = 0
+        self.statements = 0
+        self.db_seconds = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        db_ms = self.db_seconds * 1000
+        return {
+            "X-DB-Summary": f"ops={self.ops}; queries={self.statements}; db_ms={db_ms:.2f}",
+            "Server-Timing": f'db;dur={db_ms:.2f};desc="{self.statements} queries"',
+        }
+
+
+_current_op: contextvars.ContextVar[Optional[OpRecord]] = contextvars.ContextVar("db_current_op", default=None)
+_current_request: contextvars.ContextVar[Optional[RequestSummary]] = contextvars.ContextVar(
+    "db_request_summary", default=None
+)
+
+
+def start_request() -> Tuple[RequestSummary, contextvars.Token]:
+    """Begin collecting a request summary in the current context; pass the token to end_request()."""
+    summary = RequestSummary()
+    return summary, _current_request.set(summary)
+
+
+def end_request(token: contextvars.Token) -> None:
+    _current_request.reset(token)
+
+
+class DBMetrics:
+    """In-process registry of per-operation statistics and recent slow statements."""
+
+    def __init__(self, enabled: bool = True, slow_query_ms: float = 500.0, explain: bool = False):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self._ops: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+    def record(self, record: OpRecord, error: bool = False) -> None:
+        key = (record.op, record.collection or "")
+        stats = self._ops.get(key)
+        if stats is None:
+            stats = self._ops[key] = {
+                "calls": 0, "errors": 0, "rows": 0, "statements": 0,
+                "db_ms": 0.0, "decoded_bytes": 0, "latency": LatencyHistogram(),
+            }
+        stats["calls"] += 1
+        stats["errors"] += int(error)
+        stats["rows"] += record.rows
+        stats["statements"] += record.statements
+        stats["db_ms"] += record.db_seconds * 1000
+        stats["decoded_bytes"] += record.decoded_bytes
+        stats["latency"].observe(record.seconds * 1000)
+        summary = _current_request.get()
+        if summary is not None:
+            summary.ops += 1
+
+    def record_slow(self, entry: Dict[str, Any]) -> None:
+        self.slow_queries.append(entry)
+        logger.warning(
+            "Slow query (%.1f ms) in %s(%s): %s",
+            entry["ms"], entry["op"], entry["collection"], entry["statement"],
+        )
+        if entry.get("plan"):
+            logger.warning("Plan:\n%s", entry["plan"])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-operation stats (slowest total first) and the recent slow statements."""
+        operations = []
+        for (op, collection), stats in self._ops.items():
+            operations.append({
+                "op": op,
+                "collection": collection or None,
+                **{name: value for name, value in stats.items() if name != "latency"},
+                "db_ms": round(stats["db_ms"], 3),
+                "latency": stats["latency"].snapshot(),
+            })
+        operations.sort(key=lambda row: row["latency"]["total_ms"], reverse=True)
+        return {
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "explain": self.explain,
+            "operations": operations,
+            "slow_queries": list(self.slow_queries),
+        }
+
+    def reset(self) -> None:
+        self._ops.clear()
+        self.slow_queries.clear()
+
+
+def count_rows(result: Any) -> int:
+    """Default row count of an operation result: list length, 0 for None, else 1."""
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+def db_operation(rows: Callable[[Any], int] = count_rows) -> Callable:
+    """
+    Instrument a DBAdapter method (coroutine or async generator). The collection
+    is the first positional argument when it is a string, or the `collection`
+    keyword; `rows` maps the result to the number of rows it carries
+    (async generators count yielded items).
+    """
+    def decorate(func: Callable) -> Callable:
+        op = func.__name__
+
+        def collection_of(args: tuple, kwargs: Dict[str, Any]) -> Optional[str]:
+            if "collection" in kwargs:
+                return kwargs["collection"]
+            for arg in args:
+                if isinstance(arg, str):
+                    return arg
+            return None
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def generator_wrapper(self, *args, **kwargs):
+                metrics = getattr(self, "metrics", None)
+                if metrics is None or not metrics.enabled or _current_op.get() is not None:
+                    async for item in func(self, *args, **kwargs):
+                        yield item
+                    return
+                record = OpRecord(op, collection_of(args, kwargs))
+                iterator = func(self, *args, **kwargs)
+                error = False
+                try:
+                    while True:
+                        token = _current_op.set(record)
+                        started = time.perf_counter()
+                        try:
+                            item = await iterator.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        finally:
+                            # Only time spent inside the generator counts, not the consumer's
+                            record.seconds += time.perf_counter() - started
+                            _current_op.reset(token)
+                        record.rows += 1
+                        yield item
+                except (GeneratorExit, asyncio.CancelledError):
+                    # The consumer stopped early or the request went away; not an error
+                    raise
+                except BaseException:
+                    error = True
+                    raise
+                finally:
+                    await iterator.aclose()
+                    metrics.record(record, error)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, "metrics", None)
+            if metrics is None or not metrics.enabled or _current_op.get() is not None:
+                return await func(self, *args, **kwargs)
+            record = OpRecord(op, collection_of(args, kwargs))
+            token = _current_op.set(record)
+            error = False
+            try:
+                result = await func(self, *args, **kwargs)
+                record.rows = rows(result)
+                return result
+            except asyncio.CancelledError:
+                raise
+            except BaseException:
+                error = True
+                raise
+            finally:
+                _current_op.reset(token)
+                record.seconds = time.perf_counter() - record.started
+                metrics.record(record, error)
+        return wrapper
+    return decorate
+
+
+def _explain(dbapi_connection: Any, statement: str, parameters: Any) -> Optional[str]:
+    """Plan of a just-executed statement, captured inside a savepoint on the same connection."""
+    if not _EXPLAINABLE.match(statement):
+        return None
+    options = "(FORMAT TEXT)" if _NOT_READ_ONLY.search(statement) else "(ANALYZE, BUFFERS, FORMAT TEXT)"
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT db_metrics_explain")
+        try:
+            cursor.execute(f"EXPLAIN {options} {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as exc:
+            cursor.execute("ROLLBACK TO SAVEPOINT db_metrics_explain")
+            return f"EXPLAIN failed: {exc}"
+        cursor.execute("RELEASE SAVEPOINT db_metrics_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+def install_metrics(engine: Any, metrics: DBMetrics) -> None:
+    """Time every statement of an async SQLAlchemy engine and attribute it to the current operation."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if not metrics.enabled:
+            return
+        counter = conn.connection.info.get(DECODED_BYTES_KEY)
+        context._db_metrics_start = (time.perf_counter(), counter.total if counter else 0)
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_db_metrics_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start[0]
+        counter = conn.connection.info.get(DECODED_BYTES_KEY)
+        record = _current_op.get()
+        if record is not None:
+            record.statements += 1
+            record.db_seconds += elapsed
+            if counter is not None:
+                record.decoded_bytes += counter.total - start[1]
+        summary = _current_request.get()
+        if summary is not None:
+            summary.statements += 1
+            summary.db_seconds += elapsed
+
+        elapsed_ms = elapsed * 1000
+        if metrics.slow_query_ms and elapsed_ms >= metrics.slow_query_ms:
+            plan = None
+            if metrics.explain and not executemany:
+                plan = _explain(conn.connection.dbapi_connection, statement, parameters)
+            metrics.record_slow({
+                "at": time.time(),
+                "ms": round(elapsed_ms, 3),
+                "op": record.op if record else None,
+                "collection": record.collection if record else None,
+                "statement": " ".join(statement.split())[:MAX_STATEMENT_CHARS],
+                "plan": plan,
+            })
@@ -0,0 +1,161 @@
+"""
+Connection pool setup and monitoring for DBAdapter's engine.
+
+`engine_options()` turns the DB_POOL_* / DB_STATEMENT_CACHE_SIZE / DB_PGBOUNCER
+settings into create_async_engine keyword arguments:
+
+    pool      MonitoredQueuePool (an AsyncAdaptedQueuePool) with the configured
+              size, overflow, checkout timeout, pre-ping and recycle age
+    caching   every connection keeps an LRU of prepared statements keyed by SQL
+              text, so the adapter's fixed statements are parsed and planned
+              once per connection instead of on every call
+    pgbouncer PgBouncer in transaction mode can hand each transaction a different
+              server connection, so prepared-statement caches are disabled and
+              statements get unique names
+
+`pool_status()` reports pool occupancy, checkout wait times and the
+prepared-statement cache hit rate for /api/health/db.
+"""
+import time
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+try:
+    from backend.app.db_metrics import LatencyHistogram
+except ImportError:
+    from app.db_metrics import LatencyHistogram
+
+
+class PoolStats:
+    """Checkout wait times and prepared-statement cache lookups of one engine."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait = LatencyHistogram()
+        self.statement_cache_lookups = 0
+        self.statement_cache_misses = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.statement_cache_lookups
+        hits = max(lookups - self.statement_cache_misses, 0)
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait": self.wait.snapshot(),
+            "statement_cache": {
+                "hits": hits,
+                "misses": self.statement_cache_misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+            },
+        }
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool timing every checkout: waiting for a free connection,
+    opening a new one within the overflow and the pre-ping all count as wait.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.checkouts += 1
+            self.stats.wait.observe((time.perf_counter() - started) * 1000)
+
+    def recreate(self) -> "MonitoredQueuePool":
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+class StatementNamer:
+    """
+    prepared_statement_name_func that counts prepares as statement-cache misses.
+
+    The asyncpg dialect asks for a name only when it prepares a statement, i.e.
+    when the SQL text is not in the connection's cache (or the cache is off).
+    """
+
+    def __init__(self, unique: bool = False):
+        self.unique = unique
+        self.stats = None
+
+    def __call__(self):
+        if self.stats is not None:
+            self.stats.statement_cache_misses += 1
+        # None lets asyncpg pick its own name
+        return _unique_statement_name() if self.unique else None
+
+
+def engine_options(settings: Any) -> Dict[str, Any]:
+    """create_async_engine keyword arguments for the pool and statement-cache settings."""
+    pgbouncer = settings.DB_PGBOUNCER
+    cache_size = 0 if pgbouncer else settings.DB_STATEMENT_CACHE_SIZE
+    connect_args: Dict[str, Any] = {
+        # SQLAlchemy's per-connection prepared statement LRU (keyed by SQL text)
+        "prepared_statement_cache_size": cache_size,
+        # asyncpg's own cache, used by executemany and COPY
+        "statement_cache_size": cache_size,
+        # called on every prepare, which is how cache misses are counted
+        "prepared_statement_name_func": StatementNamer(unique=pgbouncer),
+    }
+    return {
+        "poolclass": MonitoredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "connect_args": connect_args,
+    }
+
+
+def install_pool_metrics(engine: Any, options: Dict[str, Any]) -> None:
+    """Count prepared-statement cache lookups/misses of an engine built with `options`."""
+    stats = getattr(engine.sync_engine.pool, "stats", None)
+    namer = options["connect_args"].get("prepared_statement_name_func")
+    if stats is None or not isinstance(namer, StatementNamer):
+        return
+    namer.stats = stats
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _lookup(conn, cursor, statement, parameters, context, executemany):
+        # executemany goes straight to asyncpg and never consults the cache
+        if not executemany:
+            stats.statement_cache_lookups += 1
+
+
+def pool_status(engine: Any) -> Dict[str, Any]:
+    """Pool occupancy plus the PoolStats snapshot (when the pool is monitored)."""
+    pool = engine.sync_engine.pool
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout_sec": pool.timeout(),
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,111 @@
+"""
+Projection compiler - selects a few dotted paths of each document server-side,
+so DBAdapter reads given `projection=[...]` transfer only those values instead
+of whole documents (OCR `full_text`/`blocks` payloads can be large).
+
+    projection=["language", "review_state.status"]
+    -> {"_id": "item-1", "language": "hi", "review_state": {"status": "pending"}}
+
+`_id` is always included. Paths that are missing or null are left out (as in
+the filter DSL, where {"x": None} matches both), and a path inside another
+projected path adds nothing. Numeric path elements index arrays, as in
+PostgreSQL's `#>` operator.
+
+compile_projection() builds the `jsonb_build_object(...)` select expression,
+keyed by path; expand_projection() turns such a row back into a nested
+document. project() applies the same projection to a document already in
+memory (cache hits, in-Python predicate scans).
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from backend.app.db_filters import split_path
+except ImportError:
+    from app.db_filters import split_path
+
+# jsonb_build_object takes at most 100 arguments; larger projections are merged with ||
+_PAIRS_PER_CALL = 40
+
+
+def normalize_projection(paths: Optional[Sequence[str]]) -> Optional[List[str]]:
+    """
+    Validated projection paths without duplicates, `_id` or paths covered by another
+    projected path. None (or empty) means the whole document.
+    """
+    if not paths:
+        return None
+    if isinstance(paths, str):
+        raise ValueError("projection must be a list of paths, not a string")
+    for path in paths:
+        split_path(path)
+    unique = sorted(set(paths) - {"_id"}, key=lambda path: (path.count("."), path))
+    kept: List[str] = []
+    for path in unique:
+        if not any(path.startswith(parent + ".") for parent in kept):
+            kept.append(path)
+    return kept
+
+
+def compile_projection(
+    paths: Sequence[str],
+    data_column: str = "data",
+    param_prefix: str = "proj",
+) -> Tuple[str, Dict[str, Any]]:
+    """Select expression (jsonb keyed by path, plus _id) and its params for normalised paths."""
+    pairs = [f"'_id', {data_column}->'_id'"]
+    params: Dict[str, Any] = {}
+    for index, path in enumerate(paths):
+        key, value = f"{param_prefix}{index}k", f"{param_prefix}{index}"
+        pairs.append(f"CAST(:{key} AS text), {data_column} #> CAST(:{value} AS text[])")
+        params[key] = path
+        params[value] = split_path(path)
+    calls = [
+        f"jsonb_build_object({', '.join(pairs[start:start + _PAIRS_PER_CALL])})"
+        for start in range(0, len(pairs), _PAIRS_PER_CALL)
+    ]
+    return " || ".join(calls), params
+
+
+def _assign(document: Dict[str, Any], parts: Sequence[str], value: Any) -> None:
+    for part in parts[:-1]:
+        document = document.setdefault(part, {})
+    document[parts[-1]] = value
+
+
+def expand_projection(row: Optional[Dict[str, Any]], paths: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """Nested document from a compile_projection() row."""
+    if row is None:
+        return None
+    document: Dict[str, Any] = {"_id": row.get("_id")}
+    for path in paths:
+        value = row.get(path)
+        if value is not None:
+            _assign(document, split_path(path), value)
+    return document
+
+
+def _lookup(document: Any, parts: Sequence[str]) -> Any:
+    for part in parts:
+        if isinstance(document, dict):
+            document = document.get(part)
+        elif isinstance(document, list):
+            try:
+                index = int(part)
+            except ValueError:
+                return None
+            if not -len(document) <= index < len(document):
+                return None
+            document = document[index]
+        else:
+            return None
+    return document
+
+
+def project(document: Optional[Dict[str, Any]], paths: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """Apply normalised projection paths to an in-memory document."""
+    if document is None:
+        return None
+    return expand_projection(
+        {"_id": document.get("_id"), **{path: _lookup(document, split_path(path)) for path in paths}},
+        paths,
+    )
@@ -0,0 +1,222 @@
+"""
+Full-text search over dataset item content for DBAdapter.search.
+
+PostgreSQL's text search parser splits words at characters it doesn't classify
+as letters, which includes the vowel signs and viramas of Indic scripts, and
+`lower()`/ILIKE do nothing useful for them either. Text is therefore
+tokenised here, in Python, and stored pre-tokenised:
+
+    normalize_text   Unicode NFC + casefold, so visually identical strings typed
+                     with different code point sequences compare equal
+    tokenize         words are runs of letters, combining marks and digits; a
+                     word also ends where the script changes ("Hindiहिंदी" is two
+                     tokens), ZWJ/ZWNJ are dropped and native digits (१२, ௧௨)
+                     become ASCII digits
+
+documents_search holds one row per indexed document: the normalised token text
+(for substring matching through pg_trgm, when the extension is available) and
+a tsvector built from the tokens with their positions (for @@ matching and
+ts_rank_cd). Triggers on `documents` queue a document in documents_search_queue
+whenever it is inserted, deleted or its indexed field changes; DBAdapter drains
+the queue before searching, so writers only pay for one small insert.
+"""
+import unicodedata
+from typing import Any, Dict, List, Sequence
+
+# Indexed collections: collection -> dotted path of the searchable field
+SEARCH_FIELDS = {
+    "dataset_items": "content",
+}
+
+SEARCH_TABLE = "documents_search"
+SEARCH_QUEUE_TABLE = "documents_search_queue"
+
+# tsvector limits: positions are 1..16383, at most 256 per lexeme, lexemes < 2KB
+MAX_POSITION = 16383
+MAX_POSITIONS_PER_TOKEN = 256
+MAX_TOKEN_BYTES = 2046
+
+# Zero-width (non-)joiners shape Indic conjuncts but are typed inconsistently
+_JOINERS = {"\u200c", "\u200d"}
+
+# One statement per entry for asyncpg
+SEARCH_SCHEMA = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        collection_name VARCHAR(255) NOT NULL,
+        doc_id VARCHAR(255) NOT NULL,
+        search_text TEXT NOT NULL,
+        tsv TSVECTOR NOT NULL,
+        indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (collection_name, doc_id)
+    )
+    """,
+    f"CREATE INDEX IF NOT EXISTS idx_documents_search_tsv ON {SEARCH_TABLE} USING GIN (tsv)",
+    f"""
+    CREATE TABLE IF NOT EXISTS {SEARCH_QUEUE_TABLE} (
+        collection_name VARCHAR(255) NOT NULL,
+        doc_id VARCHAR(255) NOT NULL,
+        PRIMARY KEY (collection_name, doc_id)
+    )
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION documents_search_enqueue() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        doc record;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            doc := OLD;
+        ELSE
+            doc := NEW;
+        END IF;
+        INSERT INTO {SEARCH_QUEUE_TABLE} (collection_name, doc_id)
+        VALUES (doc.collection_name, doc.doc_id)
+        ON CONFLICT DO NOTHING;
+        RETURN NULL;
+    END
+    $$
+    """,
+)
+
+# Used only when pg_trgm can be installed: substring matches and similarity ranking
+SEARCH_TRIGRAM_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS idx_documents_search_trgm ON {SEARCH_TABLE} "
+    f"USING GIN (search_text gin_trgm_ops)"
+)
+
+
+def field_path_literal(path: str) -> str:
+    """Dotted path as a text[] literal for `data #> '...'`."""
+    return "'{" + ",".join(path.split(".")) + "}'"
+
+
+def search_triggers(table: str = "documents") -> Dict[str, str]:
+    """CREATE TRIGGER statements that queue changed documents: trigger name -> statement."""
+    triggers = {}
+    for collection, path in SEARCH_FIELDS.items():
+        field = f"data #> {field_path_literal(path)}"
+        events = {
+            "ins": ("INSERT", f"NEW.collection_name = '{collection}'"),
+            "upd": (
+                "UPDATE OF data",
+                f"NEW.collection_name = '{collection}' AND OLD.{field} IS DISTINCT FROM NEW.{field}",
+            ),
+            "del": ("DELETE", f"OLD.collection_name = '{collection}'"),
+        }
+        for suffix, (event, condition) in events.items():
+            name = f"documents_search_{collection}_{suffix}"
+            triggers[name] = (
+                f"CREATE TRIGGER {name} AFTER {event} ON {table} FOR EACH ROW "
+                f"WHEN ({condition}) EXECUTE FUNCTION documents_search_enqueue()"
+            )
+    return triggers
+
+
+def normalize_text(value: str) -> str:
+    """NFC-normalised, casefolded text (casefolding can decompose, so normalise again)."""
+    return unicodedata.normalize("NFC", unicodedata.normalize("NFC", value).casefold())
+
+
+def _script(char: str) -> str:
+    """Script of a letter, from its Unicode name ("DEVANAGARI LETTER KA" -> "DEVANAGARI")."""
+    name = unicodedata.name(char, "")
+    return name.split(" ", 1)[0]
+
+
+def tokenize(value: str) -> List[str]:
+    """Split text into normalised, script-aware tokens (see the module docstring)."""
+    tokens: List[str] = []
+    current: List[str] = []
+    current_script = None
+
+    def flush():
+        nonlocal current_script
+        if current:
+            tokens.append("".join(current))
+            current.clear()
+        current_script = None
+
+    for char in normalize_text(value):
+        if char in _JOINERS:
+            continue
+        category = unicodedata.category(char)
+        if category[0] == "M":
+            # Vowel signs, viramas and nuktas belong to the letter before them
+            if current:
+                current.append(char)
+            continue
+        if category[0] == "N":
+            digit = unicodedata.digit(char, None)
+            current.append(str(digit) if digit is not None else char)
+            continue
+        if category[0] == "L":
+            script = _script(char)
+            if current_script is not None and script != current_script:
+                flush()
+            current_script = script
+            current.append(char)
+            continue
+        flush()
+    flush()
+    return tokens
+
+
+def document_text(value: Any) -> str:
+    """All string/number leaves of a JSON value, one per line (keys are not indexed)."""
+    parts: List[str] = []
+
+    def walk(node: Any):
+        if isinstance(node, dict):
+            for child in node.values():
+                walk(child)
+        elif isinstance(node, (list, tuple)):
+            for child in node:
+                walk(child)
+        elif isinstance(node, str):
+            parts.append(node)
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            parts.append(str(node))
+
+    walk(value)
+    return "\n".join(parts)
+
+
+def _quote_lexeme(token: str) -> str:
+    return "'" + token.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _indexable(token: str) -> bool:
+    return len(token.encode("utf-8")) <= MAX_TOKEN_BYTES
+
+
+def to_tsvector_literal(tokens: Sequence[str]) -> str:
+    """tsvector input text for tokens, keeping positions so ts_rank_cd can rank by proximity."""
+    positions: Dict[str, List[int]] = {}
+    for position, token in enumerate(tokens, start=1):
+        if not _indexable(token):
+            continue
+        seen = positions.setdefault(token, [])
+        if len(seen) < MAX_POSITIONS_PER_TOKEN:
+            seen.append(min(position, MAX_POSITION))
+    return " ".join(
+        f"{_quote_lexeme(token)}:{','.join(map(str, sorted(set(found))))}"
+        for token, found in positions.items()
+    )
+
+
+def to_tsquery_literal(tokens: Sequence[str]) -> str:
+    """tsquery text matching documents containing every token as a word prefix."""
+    return " & ".join(f"{_quote_lexeme(token)}:*" for token in dict.fromkeys(tokens) if _indexable(token))
+
+
+def like_pattern(value: str) -> str:
+    """LIKE pattern matching `value` anywhere (backslash is LIKE's default escape)."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def index_entry(value: Any) -> Dict[str, str]:
+    """documents_search row values for the indexed field's value."""
+    tokens = tokenize(document_text(value))
+    return {"search_text": " ".join(tokens), "tsv": to_tsvector_literal(tokens)}
@@ -0,0 +1,243 @@
+"""
+Update document compiler - translates partial updates into a single SQL
+expression over the JSONB `data` column, so DBAdapter can apply them with one
+`UPDATE ... SET data = <expr> RETURNING data` instead of read-modify-write.
+
+Supported operations (applied in this order):
+    set_fields   {"review_state.status": "pending"}    set value, creating missing parent objects
+    inc_fields   {"current": 1}                        numeric increment, missing fields start at 0
+    push_fields  {"flags": {...}}                      append one element, missing/non-array starts as []
+    unset_fields ["review_state.lock_owner"]           remove key
+
+Dotted paths address nested objects. Consecutive top-level sets are merged
+with `data || patch`; nested paths go through the helper functions in
+UPDATE_FUNCTIONS, which DBAdapter creates with the schema.
+
+apply_update() applies the same update to a document in Python, following the
+SQL helpers (jsonb_set path rules, numeric increments), for in-memory storage.
+"""
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from backend.app.db_filters import ABSENT, extract_path, split_path, to_json
+except ImportError:
+    from app.db_filters import ABSENT, extract_path, split_path, to_json
+
+# SQL helpers used by compiled updates (one statement per entry for asyncpg)
+UPDATE_FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION documents_set_path(doc jsonb, path text[], value jsonb) RETURNS jsonb
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN
+        -- jsonb_set only creates the last path element, so create missing parents first
+        FOR i IN 1 .. coalesce(array_length(path, 1), 0) - 1 LOOP
+            IF doc #> path[1:i] IS NULL THEN
+                doc := jsonb_set(doc, path[1:i], '{}'::jsonb, true);
+            END IF;
+        END LOOP;
+        RETURN jsonb_set(doc, path, value, true);
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION documents_inc_path(doc jsonb, path text[], amount numeric) RETURNS jsonb
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT documents_set_path(doc, path, to_jsonb(COALESCE((doc #>> path)::numeric, 0) + amount))
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION documents_push_path(doc jsonb, path text[], value jsonb) RETURNS jsonb
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT documents_set_path(
+            doc, path,
+            CASE WHEN jsonb_typeof(doc #> path) = 'array' THEN doc #> path ELSE '[]'::jsonb END
+                || jsonb_build_array(value)
+        )
+    $$
+    """,
+)
+
+
+class UpdateCompiler:
+    """
+    Compiles partial updates into a jsonb expression over `data_column`.
+
+    Parameters are collected in `params` under generated names
+    (`<prefix>0`, `<prefix>1`, ...) so the expression can share a statement
+    with a compiled filter as long as the prefixes differ.
+    """
+
+    def __init__(self, param_prefix: str = "u", data_column: str = "data"):
+        self.param_prefix = param_prefix
+        self.data_column = data_column
+        self.params: Dict[str, Any] = {}
+        self._counter = 0
+
+    def _param(self, value: Any) -> str:
+        name = f"{self.param_prefix}{self._counter}"
+        self._counter += 1
+        self.params[name] = value
+        return f":{name}"
+
+    def _path_param(self, parts: Sequence[str]) -> str:
+        return f"CAST({self._param(list(parts))} AS text[])"
+
+    def _json_param(self, value: Any) -> str:
+        return f"CAST({self._param(to_json(value))} AS jsonb)"
+
+    def compile(
+        self,
+        set_fields: Optional[Dict[str, Any]] = None,
+        inc_fields: Optional[Dict[str, Any]] = None,
+        push_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Sequence[str]] = None,
+    ) -> str:
+        """Compile the update; raises ValueError if it changes nothing or is malformed."""
+        if not (set_fields or inc_fields or push_fields or unset_fields):
+            raise ValueError("Update must set, increment, push or unset at least one field")
+
+        expr = self.data_column
+        patch: Dict[str, Any] = {}
+        for field, value in (set_fields or {}).items():
+            parts = split_path(field)
+            if len(parts) == 1:
+                patch[parts[0]] = value
+                continue
+            # Flush pending top-level keys first so later nested sets see them
+            expr = self._merge(expr, patch)
+            patch = {}
+            expr = f"documents_set_path({expr}, {self._path_param(parts)}, {self._json_param(value)})"
+        expr = self._merge(expr, patch)
+
+        for field, amount in (inc_fields or {}).items():
+            if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+                raise ValueError(f"Increment for {field!r} must be a number")
+            expr = f"documents_inc_path({expr}, {self._path_param(split_path(field))}, CAST({self._param(amount)} AS numeric))"
+
+        for field, value in (push_fields or {}).items():
+            expr = f"documents_push_path({expr}, {self._path_param(split_path(field))}, {self._json_param(value)})"
+
+        if isinstance(unset_fields, str):
+            raise ValueError("unset_fields expects a list of field paths")
+        for field in unset_fields or []:
+            expr = f"({expr} #- {self._path_param(split_path(field))})"
+        return expr
+
+    def _merge(self, expr: str, patch: Dict[str, Any]) -> str:
+        if not patch:
+            return expr
+        return f"({expr} || {self._json_param(patch)})"
+
+
+def compile_update(
+    set_fields: Optional[Dict[str, Any]] = None,
+    inc_fields: Optional[Dict[str, Any]] = None,
+    push_fields: Optional[Dict[str, Any]] = None,
+    unset_fields: Optional[Sequence[str]] = None,
+    param_prefix: str = "u",
+    data_column: str = "data",
+) -> Tuple[str, Dict[str, Any]]:
+    """Compile a partial update into (jsonb_expression, params)."""
+    compiler = UpdateCompiler(param_prefix=param_prefix, data_column=data_column)
+    sql = compiler.compile(set_fields, inc_fields, push_fields, unset_fields)
+    return sql, compiler.params
+
+
+def _array_index(part: str, depth: int) -> int:
+    try:
+        return int(part)
+    except ValueError:
+        raise ValueError(f"path element at position {depth + 1} is not an integer: {part!r}") from None
+
+
+def _jsonb_set(document: Any, parts: Sequence[str], value: Any) -> None:
+    """In-place jsonb_set(document, parts, value, create_missing => true)."""
+    target = document
+    for depth, part in enumerate(parts):
+        last = depth == len(parts) - 1
+        if isinstance(target, dict):
+            if last:
+                target[part] = value
+            elif part in target:
+                target = target[part]
+                continue
+            return
+        if not isinstance(target, list):
+            return
+        index = _array_index(part, depth)
+        in_range = -len(target) <= index < len(target)
+        if not last:
+            if not in_range:
+                return
+            target = target[index]
+        elif in_range:
+            target[index] = value
+        elif index < 0:
+            target.insert(0, value)
+        else:
+            target.append(value)
+
+
+def _set_path(document: Dict[str, Any], parts: List[str], value: Any) -> None:
+    """documents_set_path: create missing parent objects, then jsonb_set."""
+    for depth in range(1, len(parts)):
+        if extract_path(document, parts[:depth]) is ABSENT:
+            _jsonb_set(document, parts[:depth], {})
+    _jsonb_set(document, parts, value)
+
+
+def _to_numeric(value: Any) -> Decimal:
+    """`(doc #>> path)::numeric` for an existing value."""
+    if isinstance(value, bool) or isinstance(value, (dict, list)):
+        raise ValueError(f"invalid input syntax for type numeric: {value!r}")
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"invalid input syntax for type numeric: {value!r}") from None
+
+
+def from_numeric(value: Decimal) -> Any:
+    """JSON number for a numeric result: int without a fractional scale, else float (as read back from jsonb)."""
+    return int(value) if value.as_tuple().exponent >= 0 else float(value)
+
+
+def apply_update(
+    document: Dict[str, Any],
+    set_fields: Optional[Dict[str, Any]] = None,
+    inc_fields: Optional[Dict[str, Any]] = None,
+    push_fields: Optional[Dict[str, Any]] = None,
+    unset_fields: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Apply a partial update to `document` in place and return it, with the result the
+    compiled expression gives. Raises ValueError as compile_update does.
+    """
+    compile_update(set_fields, inc_fields, push_fields, unset_fields)
+
+    for field, value in (set_fields or {}).items():
+        _set_path(document, split_path(field), json.loads(to_json(value)))
+
+    for field, amount in (inc_fields or {}).items():
+        parts = split_path(field)
+        current = extract_path(document, parts)
+        base = Decimal(0) if current is ABSENT or current is None else _to_numeric(current)
+        _set_path(document, parts, from_numeric(base + Decimal(repr(amount))))
+
+    for field, value in (push_fields or {}).items():
+        parts = split_path(field)
+        current = extract_path(document, parts)
+        items = list(current) if isinstance(current, list) else []
+        _set_path(document, parts, items + [json.loads(to_json(value))])
+
+    for field in unset_fields or []:
+        parts = split_path(field)
+        parent = extract_path(document, parts[:-1])
+        if isinstance(parent, dict):
+            parent.pop(parts[-1], None)
+        elif isinstance(parent, list):
+            index = _array_index(parts[-1], len(parts) - 1)
+            if -len(parent) <= index < len(parent):
+                del parent[index]
+    return document
@@ -1,11 +1,15 @@
 """FastAPI application entry point."""
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 
 from backend.app.config import config
+from backend.app.db_adapter import db_adapter
+from backend.app.db_metrics import start_request, end_request
+from backend.app.services.queue_maintenance import lease_reaper, queue_counter_reconciler
 from backend.app.routes import (
     routes_auth,
     routes_users,
@@ -21,9 +25,23 @@ from backend.app.routes import (
     routes_homepage
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialise the database schema and start the queue maintenance tasks before serving; stop them on shutdown."""
+    await db_adapter.startup()
+    lease_reaper.start()
+    queue_counter_reconciler.start()
+    yield
+    await queue_counter_reconciler.stop()
+    await lease_reaper.stop()
+    await db_adapter.shutdown()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=config.APP_NAME,
+    lifespan=lifespan,
     debug=config.DEBUG,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
@@ -39,6 +57,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Debug mode: per-request database summary (X-DB-Summary / Server-Timing headers).
+# Streaming bodies query after the headers are sent, so their work isn't included.
+if config.DEBUG:
+    @app.middleware("http")
+    async def db_summary_headers(request: Request, call_next):
+        summary, token = start_request()
+        try:
+            response = await call_next(request)
+        finally:
+            end_request(token)
+        response.headers.update(summary.headers())
+        return response
+
 # Include routers
 app.include_router(routes_auth.router, prefix="/api")
 app.include_router(routes_users.router, prefix="/api")
@@ -60,10 +91,27 @@ def health_check():
     return {
         "status": "ok",
         "storage": config.STORAGE_TYPE,
-        "app": config.APP_NAME
+        "app": config.APP_NAME,
+        "document_cache": db_adapter.cache_stats()
     }
 
 
+@app.get("/api/health/db")
+async def db_health_check():
+    """Database health: round-trip latency, pool usage and statement-cache hit rate."""
+    try:
+        latency_ms = round(await db_adapter.ping() * 1000, 3)
+        status_code, db_status = 200, "ok"
+    except Exception as e:
+        latency_ms, status_code, db_status = None, 503, f"unavailable: {type(e).__name__}"
+    return JSONResponse(status_code=status_code, content={
+        "status": db_status,
+        "latency_ms": latency_ms,
+        "pool": db_adapter.pool_stats(),
+        "document_cache": db_adapter.cache_stats(),
+    })
+
+
 # Serve static files from frontend build (for production deployment)
 frontend_build_path = Path(__file__).parent.parent.parent / "frontend" / "dist"
 if frontend_build_path.exists():
@@ -38,6 +38,11 @@ class DatasetItemCreate(BaseModel):
     modality: Optional[str] = Field(None, description="Dataset modality (auto-populated from dataset_type)")
 
 
+class ReleaseItemsRequest(BaseModel):
+    """Schema for giving back leased items."""
+    item_ids: Optional[List[str]] = Field(None, description="Items to release (default: every item leased by the caller)")
+
+
 class DatasetItemResponse(BaseModel):
     """Response schema for dataset item."""
     id: str = Field(alias="_id", serialization_alias="_id")
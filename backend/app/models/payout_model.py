@@ -74,5 +74,5 @@ class Payout:
     
     @classmethod
     def from_dict(cls, data: dict) -> "Payout":
-        """Create from dictionary."""
-        return cls(**data)
+        """Create from dictionary (ignores the storage `_id` key)."""
+        return cls(**{key: value for key, value in data.items() if key != "_id"})
@@ -31,6 +31,12 @@ asr_service = ASRService()
 logger = logging.getLogger(__name__)
 
 
+async def _save_job_fields(job_id: str, job: AudioJob, *fields: str) -> None:
+    """Persist only the given job fields with a single partial update."""
+    job_dict = job.to_dict()
+    await db_adapter.update("audio_jobs", job_id, {field: job_dict[field] for field in fields})
+
+
 async def run_audio_job_worker(job_id: str, language: str = "en") -> bool:
     """
     Worker entrypoint to process a queued audio job.
@@ -51,7 +57,7 @@ async def run_audio_job_worker(job_id: str, language: str = "en") -> bool:
     job.started_at = datetime.utcnow()
     job.error = None
     job.language = language or job.language or "en"
-    await db_adapter.update("audio_jobs", job_id, job.to_dict())
+    await _save_job_fields(job_id, job, "status", "started_at", "error", "language")
     logger.info("Audio job started", extra={"job_id": job_id, "uploader": job.uploader_id})
 
     try:
@@ -92,7 +98,7 @@ async def run_audio_job_worker(job_id: str, language: str = "en") -> bool:
                 job_failed.status = AudioJobStatus.FAILED
             job_failed.error = str(exc)
             job_failed.completed_at = datetime.utcnow()
-            await db_adapter.update("audio_jobs", job_id, job_failed.to_dict())
+            await _save_job_fields(job_id, job_failed, "status", "error", "completed_at")
         return False
 
 
@@ -149,12 +155,14 @@ async def list_audio_jobs(
     current_user: dict = Depends(get_operator_user)
 ):
     """List all audio transcription jobs (platform operator only)."""
-    jobs = await db_adapter.list_collection("audio_jobs")
-    if status_filter:
-        jobs = [j for j in jobs if j.get("status") == status_filter]
-    
-    jobs_sorted = sorted(jobs, key=lambda x: x.get("created_at", ""), reverse=True)
-    sliced = jobs_sorted[offset:offset + limit]
+    sliced = await db_adapter.find(
+        "audio_jobs",
+        {"status": status_filter} if status_filter else None,
+        sort_by="created_at",
+        sort_dir="desc",
+        limit=limit,
+        offset=offset
+    )
 
     response = []
     for job_data in sliced:
@@ -217,16 +225,24 @@ async def get_audio_job(
 @router.get("/jobs/stats")
 async def get_audio_job_stats(current_user: dict = Depends(get_operator_user)):
     """Basic counts for audio jobs by status plus recent failures."""
-    jobs = await db_adapter.list_collection("audio_jobs")
-    counts = {}
-    for job in jobs:
-        status = job.get("status", "unknown")
-        counts[status] = counts.get(status, 0) + 1
+    rows = await db_adapter.aggregate("audio_jobs", group_by=["status"], metrics={"jobs": ("count", None)})
+    counts = {row["status"] or "unknown": row["jobs"] for row in rows}
+    # Newest failures first; failures without completed_at come last
+    failed = await db_adapter.find(
+        "audio_jobs",
+        {"status": AudioJobStatus.FAILED.value, "completed_at": {"$ne": None}},
+        sort_by="completed_at",
+        sort_dir="desc",
+        limit=10,
+    )
+    if len(failed) < 10:
+        failed += await db_adapter.find(
+            "audio_jobs", {"status": AudioJobStatus.FAILED.value, "completed_at": None}, limit=10 - len(failed)
+        )
     recent_failures = [
         {"_id": job.get("_id"), "error": job.get("error"), "completed_at": job.get("completed_at")}
-        for job in sorted(jobs, key=lambda j: j.get("completed_at") or "", reverse=True)
-        if job.get("status") == AudioJobStatus.FAILED
-    ][:10]
+        for job in failed
+    ]
     return {"counts": counts, "recent_failures": recent_failures}
 
 
@@ -257,7 +273,7 @@ async def transcribe_audio_job(
     job.completed_at = None
     job.started_at = None
     job.status = AudioJobStatus.PENDING
-    await db_adapter.update("audio_jobs", job_id, job.to_dict())
+    await _save_job_fields(job_id, job, "status", "language", "error", "completed_at", "started_at")
     logger.info("Audio job enqueued", extra={"job_id": job_id, "language": job.language})
 
     return {
@@ -364,7 +380,7 @@ async def cancel_audio_job(
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     job.started_at = job.started_at or datetime.utcnow()
     job.completed_at = datetime.utcnow()
-    await db_adapter.update("audio_jobs", job_id, job.to_dict())
+    await _save_job_fields(job_id, job, "status", "started_at", "completed_at")
     
     return {"message": "Audio job cancelled"}
 
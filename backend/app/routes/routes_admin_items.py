@@ -112,7 +112,6 @@ async def bulk_upload_zip(
                                     
                                     item = dataset_item_to_dict({
                                         "dataset_type_id": dataset_type_id,
-                                        "item_number": await item_number_service.get_next_number(dataset_type_id),
                                         "content": content,
                                         "language": language,
                                         "metadata": {
@@ -162,7 +161,6 @@ async def bulk_upload_zip(
                                     
                                     item = dataset_item_to_dict({
                                         "dataset_type_id": dataset_type_id,
-                                        "item_number": await item_number_service.get_next_number(dataset_type_id),
                                         "content": content,
                                         "language": data.get("language", language),
                                         "metadata": {
@@ -216,12 +214,15 @@ async def bulk_upload_zip(
             detail={"message": "Upload failed validation", "errors": errors[:50]}
         )
 
-    # Write all items in a single transaction for atomicity
-    created_items: List[str] = []
+    # Write all items in a single transaction for atomicity. Item numbers are reserved as one
+    # block in the same transaction, so a failed upload doesn't leave a gap in the sequence.
     async with db_adapter.transaction() as session:
-        for item in prepared_items:
-            item_id = await db_adapter.insert_document(session, "dataset_items", item)
-            created_items.append(item_id)
+        if prepared_items:
+            first_number = await item_number_service.reserve(dataset_type_id, len(prepared_items), session=session)
+            for offset, item in enumerate(prepared_items):
+                item["item_number"] = first_number + offset
+        inserted = await db_adapter.insert_many("dataset_items", prepared_items, session=session)
+        created_items: List[str] = inserted["ids"]
         if idempotency_key:
             await db_adapter.upsert_document(session, "upload_batches", {
                 "_id": idempotency_key,
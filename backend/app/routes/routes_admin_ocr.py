@@ -47,6 +47,12 @@ def get_operator_user(current_user: dict = Depends(get_current_user)) -> dict:
     return current_user
 
 
+async def _save_job_fields(job_id: str, job_obj: OcrJob, *fields: str) -> None:
+    """Persist only the given job fields with a single partial update."""
+    job_dict = job_obj.to_dict()
+    await db_adapter.update("ocr_jobs", job_id, {field: job_dict[field] for field in fields})
+
+
 async def run_ocr_job_worker(job_id: str) -> bool:
     """
     Worker entrypoint to process a queued OCR job.
@@ -66,7 +72,7 @@ async def run_ocr_job_worker(job_id: str) -> bool:
 
     job_obj.started_at = datetime.utcnow()
     job_obj.error = None
-    await db_adapter.update("ocr_jobs", job_id, job_obj.to_dict())
+    await _save_job_fields(job_id, job_obj, "status", "started_at", "error")
     logger.info("OCR job started", extra={"job_id": job_id, "uploader": job_obj.uploader_id})
 
     try:
@@ -99,7 +105,7 @@ async def run_ocr_job_worker(job_id: str) -> bool:
                 job_failed.status = OcrJobStatus.FAILED
             job_failed.error = str(exc)
             job_failed.completed_at = datetime.utcnow()
-            await db_adapter.update("ocr_jobs", job_id, job_failed.to_dict())
+            await _save_job_fields(job_id, job_failed, "status", "error", "completed_at")
         return False
 
 
@@ -151,14 +157,14 @@ async def get_ocr_jobs(
     current_user: dict = Depends(get_operator_user)
 ):
     """Get all OCR jobs with optional status filter (platform operator only)."""
-    def predicate(job: dict) -> bool:
-        if status_filter:
-            return job.get("status") == status_filter
-        return True
-    
-    jobs = await db_adapter.find("ocr_jobs", predicate)
-    jobs_sorted = sorted(jobs, key=lambda x: x.get("created_at", ""), reverse=True)
-    sliced = jobs_sorted[offset:offset + limit]
+    sliced = await db_adapter.find(
+        "ocr_jobs",
+        {"status": status_filter} if status_filter else None,
+        sort_by="created_at",
+        sort_dir="desc",
+        limit=limit,
+        offset=offset
+    )
     
     return [OcrJobResponse(**_job_dict_to_response(job)) for job in sliced]
 
@@ -166,16 +172,24 @@ async def get_ocr_jobs(
 @router.get("/jobs/stats")
 async def get_ocr_job_stats(current_user: dict = Depends(get_operator_user)):
     """Return basic counts of OCR jobs by status for observability."""
-    jobs = await db_adapter.list_collection("ocr_jobs")
-    counts = {}
-    for job in jobs:
-        status = job.get("status", "unknown")
-        counts[status] = counts.get(status, 0) + 1
+    rows = await db_adapter.aggregate("ocr_jobs", group_by=["status"], metrics={"jobs": ("count", None)})
+    counts = {row["status"] or "unknown": row["jobs"] for row in rows}
+    # Newest failures first; failures without completed_at come last
+    failed = await db_adapter.find(
+        "ocr_jobs",
+        {"status": OcrJobStatus.FAILED.value, "completed_at": {"$ne": None}},
+        sort_by="completed_at",
+        sort_dir="desc",
+        limit=10,
+    )
+    if len(failed) < 10:
+        failed += await db_adapter.find(
+            "ocr_jobs", {"status": OcrJobStatus.FAILED.value, "completed_at": None}, limit=10 - len(failed)
+        )
     recent_failures = [
         {"_id": job.get("_id"), "error": job.get("error"), "completed_at": job.get("completed_at")}
-        for job in sorted(jobs, key=lambda j: j.get("completed_at") or "", reverse=True)
-        if job.get("status") == OcrJobStatus.FAILED
-    ][:10]
+        for job in failed
+    ]
     return {"counts": counts, "recent_failures": recent_failures}
 
 
@@ -193,11 +207,13 @@ async def get_ocr_job_detail(
         )
     
     results = []
-    for result_id in job.get("results_ref", []):
-        result_data = await db_adapter.get("ocr_results", result_id)
+    results_ref = job.get("results_ref", [])
+    result_docs = await db_adapter.get_many("ocr_results", results_ref)
+    max_chars = getattr(config, "OCR_RESULT_PREVIEW_CHARS", 2000)
+    for result_id in results_ref:
+        result_data = result_docs.get(result_id)
         if result_data:
             res_obj = ocr_result_from_dict(result_data)
-            max_chars = getattr(config, "OCR_RESULT_PREVIEW_CHARS", 2000)
             if res_obj.full_text and len(res_obj.full_text) > max_chars:
                 res_obj.full_text = res_obj.full_text[:max_chars] + "..."
                 res_obj.metadata = {**res_obj.metadata, "truncated": True}
@@ -235,7 +251,7 @@ async def slice_ocr_to_dataset_items(
             detail="Dataset type not found"
         )
     
-    created_items = []
+    items = []
     for slice_data in request.slices:
         item_content = slice_data.get("content", {})
         item_content["source_job_id"] = job_id
@@ -251,9 +267,10 @@ async def slice_ocr_to_dataset_items(
                 "page_index": slice_data.get("page_index", 0)
             }
         })
-        
-        item_id = await db_adapter.insert("dataset_items", item)
-        created_items.append({"id": item_id, "content": item_content})
+        items.append(item)
+    
+    await db_adapter.insert_many("dataset_items", items)
+    created_items = [{"id": item["_id"], "content": item["content"]} for item in items]
     
     return {
         "message": f"Created {len(created_items)} dataset items from OCR job",
@@ -292,7 +309,7 @@ async def retry_ocr_job(
     job_obj.error = None
     job_obj.completed_at = None
     job_obj.started_at = None
-    await db_adapter.update("ocr_jobs", job_id, job_obj.to_dict())
+    await _save_job_fields(job_id, job_obj, "status", "error", "completed_at", "started_at")
     
     return OcrJobResponse(**_job_dict_to_response(job_obj.to_dict()))
 
@@ -327,7 +344,7 @@ async def cancel_ocr_job(
         ) from exc
     job_obj.completed_at = datetime.utcnow()
     job_obj.started_at = job_obj.started_at or datetime.utcnow()
-    await db_adapter.update("ocr_jobs", job_id, job_obj.to_dict())
+    await _save_job_fields(job_id, job_obj, "status", "completed_at", "started_at")
     
     return OcrJobResponse(**_job_dict_to_response(job_obj.to_dict()))
 
@@ -345,9 +362,8 @@ async def bulk_upload_dataset_items(
             detail="Dataset type not found"
         )
     
-    created_items = []
-    for item_data in request.items:
-        item = dataset_item_to_dict({
+    items = [
+        dataset_item_to_dict({
             "dataset_type_id": request.dataset_type_id,
             "content": item_data.get("content", {}),
             "language": item_data.get("language", "en"),
@@ -356,9 +372,11 @@ async def bulk_upload_dataset_items(
                 "uploaded_by": current_user["username"]
             }
         })
-        
-        item_id = await db_adapter.insert("dataset_items", item)
-        created_items.append(item_id)
+        for item_data in request.items
+    ]
+    
+    inserted = await db_adapter.insert_many("dataset_items", items)
+    created_items = inserted["ids"]
     
     return {
         "message": f"Successfully uploaded {len(created_items)} items",
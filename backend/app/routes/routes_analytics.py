@@ -20,185 +20,265 @@ def get_operator_user(current_user: dict = Depends(get_current_user)) -> dict:
     return current_user
 
 
+class ReviewerStatsAccumulator:
+    """
+    Single-pass reviewer stats: feed review logs and dataset items in any order,
+    then call `results(users)`. Only per-reviewer counters are kept in memory.
+    """
+
+    def __init__(self):
+        self.logs = defaultdict(lambda: {
+            "total": 0, "approve": 0, "edit": 0, "skip": 0,
+            "review_time_sum": 0, "review_time_count": 0, "last_review": None,
+        })
+        self.gold_items = defaultdict(int)
+        self.flags_submitted = defaultdict(int)
+
+    def add_review_log(self, log: dict) -> None:
+        reviewer_id = log.get("reviewer_id")
+        if not reviewer_id:
+            return
+        stats = self.logs[reviewer_id]
+        stats["total"] += 1
+        if log.get("action") in ("approve", "edit", "skip"):
+            stats[log["action"]] += 1
+        if log.get("review_time"):
+            stats["review_time_sum"] += log["review_time"]
+            stats["review_time_count"] += 1
+        timestamp = log.get("timestamp")
+        if timestamp and (stats["last_review"] is None or timestamp > stats["last_review"]):
+            stats["last_review"] = timestamp
+
+    def add_dataset_item(self, item: dict) -> None:
+        review_state = item.get("review_state", {})
+        is_gold = item.get("is_gold", False) or review_state.get("is_gold", False)
+        for reviewer_id in review_state.get("reviewed_by", []):
+            if is_gold:
+                self.gold_items[reviewer_id] += 1
+            if item.get("flagged", False) and any(
+                f.get("reviewer_id") == reviewer_id for f in item.get("flags", [])
+            ):
+                self.flags_submitted[reviewer_id] += 1
+
+    def add_log_totals(self, reviewer_id: str, totals: dict) -> None:
+        """Merge review log counters already aggregated per reviewer (see REVIEW_LOG_METRICS)."""
+        stats = self.logs[reviewer_id]
+        for key in ("total", "approve", "edit", "skip", "review_time_sum", "review_time_count"):
+            stats[key] += totals.get(key) or 0
+        last_review = totals.get("last_review")
+        if last_review and (stats["last_review"] is None or last_review > stats["last_review"]):
+            stats["last_review"] = last_review
+
+    def results(self, users: Dict[str, dict]) -> List[Dict[str, Any]]:
+        reviewer_stats: List[Dict[str, Any]] = []
+        for username, user_data in (users or {}).items():
+            stats = self.logs.get(username) or self.logs.default_factory()
+            payout_balance = user_data.get("payout_balance", 0.0)
+            review_time_count = stats["review_time_count"]
+            avg_review_time = stats["review_time_sum"] / review_time_count if review_time_count else 0
+
+            reviewer_stats.append({
+                "username": username,
+                "email": user_data.get("email", ""),
+                "roles": list(user_data.get("roles", [])),
+                "languages": list(user_data.get("languages", [])),
+                "total_reviews": stats["total"],
+                "approvals": stats["approve"],
+                "edits": stats["edit"],
+                "skips": stats["skip"],
+                "flags_submitted": self.flags_submitted.get(username, 0),
+                "gold_items_reviewed": self.gold_items.get(username, 0),
+                "total_earnings": round(payout_balance, 2),
+                "avg_review_time_seconds": round(avg_review_time, 1),
+                "last_review": stats["last_review"],
+                "is_active": user_data.get("is_active", True)
+            })
+
+        reviewer_stats.sort(key=lambda x: x["total_reviews"], reverse=True)
+        return reviewer_stats
+
+
 def compute_reviewer_stats_from_data(
     users: Dict[str, dict],
     review_logs: List[dict],
     dataset_items: List[dict]
 ) -> List[Dict[str, Any]]:
     """Aggregate reviewer stats from users, review logs, and dataset items."""
-    logs_by_user = defaultdict(list)
+    accumulator = ReviewerStatsAccumulator()
     for log in review_logs or []:
-        reviewer_id = log.get("reviewer_id")
-        if reviewer_id:
-            logs_by_user[reviewer_id].append(log)
-
-    items_by_reviewer = defaultdict(list)
+        accumulator.add_review_log(log)
     for item in dataset_items or []:
-        for reviewer_id in item.get("review_state", {}).get("reviewed_by", []):
-            items_by_reviewer[reviewer_id].append(item)
-
-    reviewer_stats: List[Dict[str, Any]] = []
-    for username, user_data in (users or {}).items():
-        user_logs = logs_by_user.get(username, [])
-        items_reviewed = items_by_reviewer.get(username, [])
-
-        total_reviews = len(user_logs)
-        payout_balance = user_data.get("payout_balance", 0.0)
-
-        approvals = sum(1 for r in user_logs if r.get("action") == "approve")
-        edits = sum(1 for r in user_logs if r.get("action") == "edit")
-        skips = sum(1 for r in user_logs if r.get("action") == "skip")
-
-        gold_items_reviewed = [
-            item for item in items_reviewed
-            if item.get("is_gold", False) or item.get("review_state", {}).get("is_gold", False)
-        ]
-
-        flags_submitted = sum(
-            1 for item in items_reviewed
-            if item.get("flagged", False)
-            and any(f.get("reviewer_id") == username for f in item.get("flags", []))
-        )
+        accumulator.add_dataset_item(item)
+    return accumulator.results(users)
 
-        review_times = [r.get("review_time", 0) for r in user_logs if r.get("review_time")]
-        avg_review_time = sum(review_times) / len(review_times) if review_times else 0
 
-        last_review_ts = max(
-            [r.get("timestamp") for r in user_logs if r.get("timestamp")],
-            default=None
-        )
+class DatasetAnalyticsAccumulator:
+    """
+    Single-pass dataset analytics: feed all dataset items first, then review logs,
+    then call `results(dataset_types)`. Keeps per-dataset counters plus an
+    item id -> dataset type id map used to attribute review logs.
+    """
 
-        reviewer_stats.append({
-            "username": username,
-            "email": user_data.get("email", ""),
-            "roles": list(user_data.get("roles", [])),
-            "languages": list(user_data.get("languages", [])),
-            "total_reviews": total_reviews,
-            "approvals": approvals,
-            "edits": edits,
-            "skips": skips,
-            "flags_submitted": flags_submitted,
-            "gold_items_reviewed": len(gold_items_reviewed),
-            "total_earnings": round(payout_balance, 2),
-            "avg_review_time_seconds": round(avg_review_time, 1),
-            "last_review": last_review_ts,
-            "is_active": user_data.get("is_active", True)
+    def __init__(self):
+        self.item_dataset: Dict[str, str] = {}
+        self.datasets = defaultdict(lambda: {
+            "total_items": 0, "finalized": 0, "gold": 0, "flagged": 0,
+            "review_count_state": 0, "skip_count_state": 0, "item_reviewers": set(),
+            "skip_reasons": defaultdict(int),
+            "log_reviews": 0, "log_skips": 0, "log_reviewers": set(), "payout": 0.0,
         })
 
-    reviewer_stats.sort(key=lambda x: x["total_reviews"], reverse=True)
-    return reviewer_stats
-
-
-def compute_dataset_analytics_from_data(
-    dataset_types: List[dict],
-    dataset_items: List[dict],
-    review_logs: List[dict]
-) -> List[Dict[str, Any]]:
-    """Aggregate dataset analytics using review logs and dataset items."""
-    items_by_dataset = defaultdict(list)
-    for item in dataset_items or []:
+    def add_dataset_item(self, item: dict) -> None:
         dt_id = item.get("dataset_type_id")
-        if dt_id:
-            items_by_dataset[dt_id].append(item)
-
-    logs_by_item = defaultdict(list)
-    for log in review_logs or []:
-        item_id = log.get("dataset_item_id")
-        if item_id:
-            logs_by_item[item_id].append(log)
-
-    analytics: List[Dict[str, Any]] = []
+        if not dt_id:
+            return
+        if "_id" in item:
+            self.item_dataset[item["_id"]] = dt_id
+        stats = self.datasets[dt_id]
+        review_state = item.get("review_state", {})
+        stats["total_items"] += 1
+        if review_state.get("finalized", False):
+            stats["finalized"] += 1
+        if item.get("is_gold", False) or review_state.get("is_gold", False):
+            stats["gold"] += 1
+        if item.get("flagged", False):
+            stats["flagged"] += 1
+        stats["review_count_state"] += review_state.get("review_count", 0)
+        stats["skip_count_state"] += review_state.get("skip_count", 0)
+        stats["item_reviewers"].update(review_state.get("reviewed_by", []))
+        for feedback in item.get("skip_feedback", []):
+            if feedback.get("feedback"):
+                stats["skip_reasons"][feedback["feedback"]] += 1
+
+    def add_item_totals(self, dt_id: str, totals: dict) -> None:
+        """Merge dataset item counters already aggregated per dataset type (see DATASET_ITEM_METRICS)."""
+        stats = self.datasets[dt_id]
+        for key in ("total_items", "finalized", "gold", "flagged", "review_count_state", "skip_count_state"):
+            stats[key] += totals.get(key) or 0
+
+    def add_log_totals(self, dt_id: str, reviewer_id: Optional[str], reviews: int, skips: int, payout: float) -> None:
+        """Merge review log counters already aggregated per (dataset type, reviewer)."""
+        stats = self.datasets[dt_id]
+        stats["log_reviews"] += reviews
+        stats["log_skips"] += skips
+        if reviewer_id:
+            stats["log_reviewers"].add(reviewer_id)
+        stats["payout"] += payout or 0.0
+
+    def add_review_log(self, log: dict) -> None:
+        dt_id = self.item_dataset.get(log.get("dataset_item_id"))
+        if not dt_id:
+            return
+        stats = self.datasets[dt_id]
+        stats["log_reviews"] += 1
+        if log.get("action") == "skip":
+            stats["log_skips"] += 1
+        if log.get("reviewer_id"):
+            stats["log_reviewers"].add(log["reviewer_id"])
+        stats["payout"] += log.get("payout_amount", 0.0) or 0.0
+
+    def results(self, dataset_types: List[dict]) -> List[Dict[str, Any]]:
+        analytics: List[Dict[str, Any]] = []
+
+        for dt in dataset_types:
+            if not dt:
+                continue
 
-    for dt in dataset_types:
-        if not dt:
-            continue
+            dt_id = dt["_id"]
+            stats = self.datasets.get(dt_id) or self.datasets.default_factory()
+            total_items = stats["total_items"]
+
+            if total_items == 0:
+                analytics.append({
+                    "dataset_type_id": dt_id,
+                    "name": dt.get("name", ""),
+                    "modality": dt.get("modality", "text"),
+                    "total_items": 0,
+                    "finalized_count": 0,
+                    "finalized_pct": 0,
+                    "gold_count": 0,
+                    "gold_pct": 0,
+                    "flagged_count": 0,
+                    "flagged_pct": 0,
+                    "avg_reviews_per_item": 0,
+                    "avg_skips_per_item": 0,
+                    "total_payout": 0,
+                    "unique_reviewers": 0,
+                    "skip_reasons": {},
+                    "payout_rate": dt.get("payout_rate", 0.002),
+                    "languages": list(dt.get("languages", [])),
+                })
+                continue
 
-        dt_id = dt["_id"]
-        all_items = items_by_dataset.get(dt_id, [])
-        total_items = len(all_items)
+            log_review_count = stats["log_reviews"]
+            total_reviews = log_review_count if log_review_count else stats["review_count_state"]
+            total_skips = stats["log_skips"] if log_review_count else stats["skip_count_state"]
+            unique_reviewers = stats["log_reviewers"] or stats["item_reviewers"]
 
-        if total_items == 0:
             analytics.append({
                 "dataset_type_id": dt_id,
                 "name": dt.get("name", ""),
                 "modality": dt.get("modality", "text"),
-                "total_items": 0,
-                "finalized_count": 0,
-                "finalized_pct": 0,
-                "gold_count": 0,
-                "gold_pct": 0,
-                "flagged_count": 0,
-                "flagged_pct": 0,
-                "avg_reviews_per_item": 0,
-                "avg_skips_per_item": 0,
-                "total_payout": 0,
-                "unique_reviewers": 0,
-                "skip_reasons": {},
-                "payout_rate": dt.get("payout_rate", 0.002),
                 "languages": list(dt.get("languages", [])),
+                "total_items": total_items,
+                "finalized_count": stats["finalized"],
+                "finalized_pct": round(stats["finalized"] / total_items * 100, 1),
+                "gold_count": stats["gold"],
+                "gold_pct": round(stats["gold"] / total_items * 100, 1),
+                "flagged_count": stats["flagged"],
+                "flagged_pct": round(stats["flagged"] / total_items * 100, 1),
+                "avg_reviews_per_item": round(total_reviews / total_items, 2),
+                "avg_skips_per_item": round(total_skips / total_items, 2),
+                "total_payout": round(stats["payout"], 2),
+                "unique_reviewers": len(unique_reviewers),
+                "skip_reasons": dict(stats["skip_reasons"]),
+                "payout_rate": dt.get("payout_rate", 0.002)
             })
-            continue
-
-        item_ids = {i["_id"] for i in all_items if "_id" in i}
-        logs_for_dt = [
-            log for item_id in item_ids for log in logs_by_item.get(item_id, [])
-        ]
-
-        finalized_items = [i for i in all_items if i.get("review_state", {}).get("finalized", False)]
-        gold_items = [
-            i for i in all_items
-            if i.get("is_gold", False) or i.get("review_state", {}).get("is_gold", False)
-        ]
-        flagged_items = [i for i in all_items if i.get("flagged", False)]
-
-        log_review_count = len(logs_for_dt)
-        review_count_state = sum(i.get("review_state", {}).get("review_count", 0) for i in all_items)
-        total_reviews = log_review_count if log_review_count else review_count_state
-
-        log_skip_count = sum(1 for log in logs_for_dt if log.get("action") == "skip")
-        skip_count_state = sum(i.get("review_state", {}).get("skip_count", 0) for i in all_items)
-        total_skips = log_skip_count if log_review_count else skip_count_state
-
-        unique_reviewers = {
-            log.get("reviewer_id") for log in logs_for_dt if log.get("reviewer_id")
-        }
-        if not unique_reviewers:
-            for item in all_items:
-                unique_reviewers.update(item.get("review_state", {}).get("reviewed_by", []))
-
-        total_payout = round(
-            sum(log.get("payout_amount", 0.0) or 0.0 for log in logs_for_dt),
-            2
-        )
 
-        skip_reasons = defaultdict(int)
-        for item in all_items:
-            for feedback in item.get("skip_feedback", []):
-                if feedback.get("feedback"):
-                    skip_reasons[feedback["feedback"]] += 1
+        analytics.sort(key=lambda x: x["total_items"], reverse=True)
+        return analytics
 
-        analytics.append({
-            "dataset_type_id": dt_id,
-            "name": dt.get("name", ""),
-            "modality": dt.get("modality", "text"),
-            "languages": list(dt.get("languages", [])),
-            "total_items": total_items,
-            "finalized_count": len(finalized_items),
-            "finalized_pct": round(len(finalized_items) / total_items * 100, 1),
-            "gold_count": len(gold_items),
-            "gold_pct": round(len(gold_items) / total_items * 100, 1) if total_items > 0 else 0,
-            "flagged_count": len(flagged_items),
-            "flagged_pct": round(len(flagged_items) / total_items * 100, 1) if total_items > 0 else 0,
-            "avg_reviews_per_item": round(total_reviews / total_items, 2) if total_items > 0 else 0,
-            "avg_skips_per_item": round(total_skips / total_items, 2) if total_items > 0 else 0,
-            "total_payout": total_payout,
-            "unique_reviewers": len(unique_reviewers),
-            "skip_reasons": dict(skip_reasons),
-            "payout_rate": dt.get("payout_rate", 0.002)
-        })
 
-    analytics.sort(key=lambda x: x["total_items"], reverse=True)
-    return analytics
+def compute_dataset_analytics_from_data(
+    dataset_types: List[dict],
+    dataset_items: List[dict],
+    review_logs: List[dict]
+) -> List[Dict[str, Any]]:
+    """Aggregate dataset analytics using review logs and dataset items."""
+    accumulator = DatasetAnalyticsAccumulator()
+    for item in dataset_items or []:
+        accumulator.add_dataset_item(item)
+    for log in review_logs or []:
+        accumulator.add_review_log(log)
+    return accumulator.results(dataset_types)
+
+
+# aggregate() metrics mirroring ReviewerStatsAccumulator.add_review_log
+TIMED_REVIEW = {"review_time": {"$nin": [0, None]}}
+REVIEW_LOG_METRICS = {
+    "total": ("count", None),
+    "approve": ("count", None, {"action": "approve"}),
+    "edit": ("count", None, {"action": "edit"}),
+    "skip": ("count", None, {"action": "skip"}),
+    "review_time_sum": ("sum", "review_time", TIMED_REVIEW),
+    "review_time_count": ("count", "review_time", TIMED_REVIEW),
+    "last_review": ("max", "timestamp"),
+}
+
+# aggregate() metrics mirroring DatasetAnalyticsAccumulator.add_dataset_item
+GOLD_ITEM = {"$or": [{"is_gold": True}, {"review_state.is_gold": True}]}
+DATASET_ITEM_METRICS = {
+    "total_items": ("count", None),
+    "finalized": ("count", None, {"review_state.finalized": True}),
+    "gold": ("count", None, GOLD_ITEM),
+    "flagged": ("count", None, {"flagged": True}),
+    "review_count_state": ("sum", "review_state.review_count"),
+    "skip_count_state": ("sum", "review_state.skip_count"),
+}
+
+# Projections: the fields DatasetAnalyticsAccumulator.results and get_flagged_items read
+DATASET_TYPE_ANALYTICS_FIELDS = ["name", "modality", "payout_rate", "languages"]
+FLAGGED_ITEM_FIELDS = ["dataset_type_id", "language", "content", "flags", "review_state", "created_at"]
 
 
 @router.get("/reviewers")
@@ -208,10 +288,33 @@ async def get_reviewer_stats(current_user: dict = Depends(get_operator_user)) ->
     Returns review counts, accuracy, earnings, and activity metrics.
     """
     all_users = await users_db.get_all() or {}
-    review_logs = await db_adapter.list_collection("review_logs") or []
-    dataset_items = await db_adapter.list_collection("dataset_items") or []
 
-    reviewer_stats = compute_reviewer_stats_from_data(all_users, review_logs, dataset_items)
+    # Counters are aggregated in SQL; only per-reviewer rows come back
+    accumulator = ReviewerStatsAccumulator()
+    log_rows = await db_adapter.aggregate(
+        "review_logs", {"reviewer_id": {"$nin": [None, ""]}}, group_by=["reviewer_id"], metrics=REVIEW_LOG_METRICS
+    )
+    for row in log_rows:
+        accumulator.add_log_totals(row["reviewer_id"], row)
+
+    gold_rows = await db_adapter.aggregate(
+        "dataset_items", GOLD_ITEM, group_by=["review_state.reviewed_by[]"], metrics={"items": ("count", None)}
+    )
+    for row in gold_rows:
+        accumulator.gold_items[row["review_state.reviewed_by[]"]] += row["items"]
+
+    # Flagged items per (reviewer, flagging reviewer); an item counts when the two match
+    flag_rows = await db_adapter.aggregate(
+        "dataset_items",
+        {"flagged": True},
+        group_by=["review_state.reviewed_by[]", "flags[].reviewer_id"],
+        metrics={"items": ("count_distinct", "_id")},
+    )
+    for row in flag_rows:
+        if row["review_state.reviewed_by[]"] == row["flags[].reviewer_id"]:
+            accumulator.flags_submitted[row["review_state.reviewed_by[]"]] += row["items"]
+
+    reviewer_stats = accumulator.results(all_users)
     return reviewer_stats
 
 
@@ -225,7 +328,7 @@ async def get_dataset_analytics(
     Returns progress, quality metrics, and performance data.
     """
     if dataset_type_id:
-        dt = await db_adapter.get("dataset_types", dataset_type_id)
+        dt = await db_adapter.get("dataset_types", dataset_type_id, projection=DATASET_TYPE_ANALYTICS_FIELDS)
         if not dt:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -233,22 +336,46 @@ async def get_dataset_analytics(
             )
         dataset_types = [dt]
     else:
-        dataset_types = await db_adapter.list_collection("dataset_types") or []
-
-    dataset_items = await db_adapter.list_collection("dataset_items") or []
-    review_logs = await db_adapter.list_collection("review_logs") or []
-
-    if dataset_type_id:
-        dataset_items = [
-            item for item in dataset_items or []
-            if item and item.get("dataset_type_id") == dataset_type_id
-        ]
-        review_logs = [
-            log for log in review_logs or []
-            if log and log.get("dataset_item_id") in {i.get("_id") for i in dataset_items}
-        ]
-
-    analytics = compute_dataset_analytics_from_data(dataset_types, dataset_items, review_logs)
+        dataset_types = await db_adapter.find("dataset_types", projection=DATASET_TYPE_ANALYTICS_FIELDS)
+
+    # Counters are aggregated in SQL; rows come back per dataset type (and reviewer / skip reason)
+    accumulator = DatasetAnalyticsAccumulator()
+    item_filters = {"dataset_type_id": dataset_type_id}
+    for row in await db_adapter.aggregate(
+        "dataset_items", item_filters, group_by=["dataset_type_id"], metrics=DATASET_ITEM_METRICS
+    ):
+        if row["dataset_type_id"]:
+            accumulator.add_item_totals(row["dataset_type_id"], row)
+    for row in await db_adapter.aggregate(
+        "dataset_items", item_filters, group_by=["dataset_type_id", "review_state.reviewed_by[]"]
+    ):
+        if row["dataset_type_id"]:
+            accumulator.datasets[row["dataset_type_id"]]["item_reviewers"].add(row["review_state.reviewed_by[]"])
+    for row in await db_adapter.aggregate(
+        "dataset_items",
+        item_filters,
+        group_by=["dataset_type_id", "skip_feedback[].feedback"],
+        metrics={"count": ("count", None)},
+    ):
+        if row["dataset_type_id"] and row["skip_feedback[].feedback"]:
+            accumulator.datasets[row["dataset_type_id"]]["skip_reasons"][row["skip_feedback[].feedback"]] += row["count"]
+
+    # Review logs are attributed to the dataset type of their item
+    for row in await db_adapter.aggregate(
+        "review_logs",
+        group_by=["$lookup.dataset_type_id", "reviewer_id"],
+        metrics={
+            "reviews": ("count", None),
+            "skips": ("count", None, {"action": "skip"}),
+            "payout": ("sum", "payout_amount"),
+        },
+        lookup=("dataset_items", "dataset_item_id"),
+    ):
+        dt_id = row["$lookup.dataset_type_id"]
+        if dt_id and (not dataset_type_id or dt_id == dataset_type_id):
+            accumulator.add_log_totals(dt_id, row["reviewer_id"], row["reviews"], row["skips"], row["payout"])
+
+    analytics = accumulator.results(dataset_types)
     return analytics
 
 
@@ -265,42 +392,30 @@ async def get_flagged_items(
     Get all flagged items with filters for review.
     Returns flagged items with original content and reviewer feedback.
     """
-    # Build predicate
-    def predicate(item: dict) -> bool:
-        if not item.get("flagged", False):
-            return False
-        
-        if dataset_type_id and item.get("dataset_type_id") != dataset_type_id:
-            return False
-        
-        if language and item.get("language") != language:
-            return False
-        
-        if reason:
-            # Check if any flag has this reason
-            flags = item.get("flags", [])
-            if not any(f.get("reason") == reason for f in flags):
-                return False
-        
-        return True
-    
+    query_filters = {"dataset_type_id": dataset_type_id, "language": language, "flagged": True}
+    if reason:
+        # Only items with at least one flag for this reason
+        query_filters["flags"] = {"$contains": {"reason": reason}}
+
     result = await db_adapter.query_collection(
         "dataset_items",
-        filters={"dataset_type_id": dataset_type_id, "language": language, "flagged": True},
+        filters=query_filters,
         sort_by="created_at",
         sort_dir="desc",
         limit=limit,
-        offset=offset
+        offset=offset,
+        projection=FLAGGED_ITEM_FIELDS,
     )
 
     flagged_items = result["items"]
     total_count = result["total"]
 
-    # Enrich with dataset type name
+    # Enrich with dataset type name (one lookup for the whole page)
+    dataset_types = await db_adapter.get_many("dataset_types", [item.get("dataset_type_id") for item in flagged_items])
     enriched_items = []
     for item in flagged_items:
         dt_id = item.get("dataset_type_id")
-        dt = await db_adapter.get("dataset_types", dt_id)
+        dt = dataset_types.get(dt_id)
         flags = list(item.get("flags", []))
         if reason:
             flags = [f for f in flags if f.get("reason") == reason]
@@ -75,11 +75,7 @@ async def login(credentials: UserLogin):
     
     # If not found by username, try to find by email
     if not user_data:
-        all_users = await users_db.get_all()
-        for username, user in all_users.items():
-            if user.get("email") == credentials.username:
-                user_data = user
-                break
+        user_data = await users_db.find_one({"email": credentials.username})
     
     if not user_data:
         raise HTTPException(
@@ -2,9 +2,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Dict, Any
 from backend.app.routes.routes_auth import get_current_user
+from backend.app.utils.unit_of_work import request_unit_of_work
 from backend.app.db_adapter import db_adapter
 
-router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"], dependencies=[request_unit_of_work])
 
 
 @router.get("/assigned-datasets")
@@ -34,55 +35,56 @@ async def get_assigned_datasets(current_user: dict = Depends(get_current_user))
     user_languages = user_data.get("languages", ["en"])
     
     # Get all active dataset types
-    all_dataset_types = await db_adapter.find("dataset_types", lambda dt: dt.get("active", True))
+    all_dataset_types = await db_adapter.find("dataset_types", {"active": {"$ne": False}})
     
     # Filter dataset types by language match
+    matching_types = [
+        dt for dt in all_dataset_types
+        if any(lang in user_languages for lang in dt.get("languages", ["en"]))
+    ]
+
+    # Item totals and this user's reviewed items for every matching type in one query
+    item_counts = {}
+    if matching_types:
+        rows = await db_adapter.aggregate(
+            "dataset_items",
+            {"dataset_type_id": [dt["_id"] for dt in matching_types]},
+            group_by=["dataset_type_id"],
+            metrics={
+                "total_items": ("count", None),
+                "items_reviewed": ("count", None, {"review_state.reviewed_by": {"$contains": user_id}}),
+            },
+        )
+        item_counts = {row["dataset_type_id"]: row for row in rows}
+
     assigned_datasets = []
     
-    for dt in all_dataset_types:
+    for dt in matching_types:
         dt_languages = dt.get("languages", ["en"])
+        counts = item_counts.get(dt["_id"], {})
+        total_items = counts.get("total_items", 0)
+        items_reviewed = counts.get("items_reviewed", 0)
+
+        # Calculate user earnings from this dataset
+        user_earnings = items_reviewed * dt.get("payout_rate", 0.002)
         
-        # Check if there's a language overlap
-        if any(lang in user_languages for lang in dt_languages):
-            # Get stats for this dataset type
-            all_items = await db_adapter.find(
-                "dataset_items",
-                lambda item: item.get("dataset_type_id") == dt["_id"]
-            )
-            
-            # Get items reviewed by this user
-            user_reviewed = await db_adapter.find(
-                "dataset_items",
-                lambda item: (
-                    item.get("dataset_type_id") == dt["_id"] and
-                    user_id in item.get("review_state", {}).get("reviewed_by", [])
-                )
-            )
-            
-            # Calculate stats
-            total_items = len(all_items)
-            items_reviewed = len(user_reviewed)
-            
-            # Calculate user earnings from this dataset
-            user_earnings = items_reviewed * dt.get("payout_rate", 0.002)
-            
-            # Calculate progress percentage
-            progress_pct = (items_reviewed / total_items * 100) if total_items > 0 else 0
-            
-            assigned_datasets.append({
-                "_id": dt["_id"],
-                "name": dt["name"],
-                "description": dt.get("description", ""),
-                "modality": dt.get("modality", "text"),
-                "languages": dt_languages,
-                "payout_rate": dt.get("payout_rate", 0.002),
-                "total_items": total_items,
-                "items_reviewed": items_reviewed,
-                "progress_pct": round(progress_pct, 1),
-                "user_earnings": round(user_earnings, 3),
-                "review_guidelines": dt.get("review_guidelines")
-            })
-    
+        # Calculate progress percentage
+        progress_pct = (items_reviewed / total_items * 100) if total_items > 0 else 0
+        
+        assigned_datasets.append({
+            "_id": dt["_id"],
+            "name": dt["name"],
+            "description": dt.get("description", ""),
+            "modality": dt.get("modality", "text"),
+            "languages": dt_languages,
+            "payout_rate": dt.get("payout_rate", 0.002),
+            "total_items": total_items,
+            "items_reviewed": items_reviewed,
+            "progress_pct": round(progress_pct, 1),
+            "user_earnings": round(user_earnings, 3),
+            "review_guidelines": dt.get("review_guidelines")
+        })
+
     # Sort by progress (least complete first to encourage completion)
     assigned_datasets.sort(key=lambda x: x["progress_pct"])
     
@@ -2,17 +2,39 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from typing import List, Optional
 
+from backend.app.config import config
 from backend.app.db_adapter import db_adapter
 from backend.app.models.dataset_type_model import DatasetTypeCreate, DatasetTypeUpdate, DatasetTypeResponse, dataset_type_to_dict
-from backend.app.models.dataset_item_model import DatasetItemCreate, DatasetItemResponse, dataset_item_to_dict
+from backend.app.models.dataset_item_model import (
+    DatasetItemCreate,
+    DatasetItemResponse,
+    ReleaseItemsRequest,
+    dataset_item_to_dict,
+)
 from backend.app.routes.routes_auth import get_current_user
+from backend.app.utils.unit_of_work import request_unit_of_work
 from backend.app.services.queue_service import QueueService
 from backend.app.services.item_number_service import item_number_service
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
 
-@router.get("/next")
+def _review_languages(langs: str, current_user: dict) -> List[str]:
+    """Requested languages, limited to the user's languages if they have them set."""
+    languages = [lang.strip() for lang in langs.split(",")]
+    user_languages = current_user.get("languages", [])
+    if user_languages:
+        languages = [lang for lang in languages if lang in user_languages]
+    return languages
+
+
+async def _lock_timeout_sec() -> int:
+    """Lock timeout from the system config."""
+    system_config = await db_adapter.get("system_config", "config")
+    return system_config.get("lock_timeout_sec", 180) if system_config else 180
+
+
+@router.get("/next", dependencies=[request_unit_of_work])
 async def get_next_item(
     langs: str = Query(..., description="Comma-separated language codes, e.g., 'en,hi'"),
     current_user: dict = Depends(get_current_user)
@@ -21,23 +43,10 @@ async def get_next_item(
     Fetch next item for review with language filtering.
     Requires authentication.
     """
-    # Parse languages
-    languages = [lang.strip() for lang in langs.split(",")]
-    
-    # Get user's ID
-    user_id = current_user.get("username")
-    user_languages = current_user.get("languages", [])
-    
-    # Filter by user's languages if they have them set
-    if user_languages:
-        languages = [lang for lang in languages if lang in user_languages]
-    
-    # Get system config for lock timeout
-    system_config = await db_adapter.get("system_config", "config")
-    lock_timeout_sec = system_config.get("lock_timeout_sec", 180) if system_config else 180
+    languages = _review_languages(langs, current_user)
     
     # Fetch next item
-    item = await QueueService.get_next_item(user_id, languages, lock_timeout_sec)
+    item = await QueueService.get_next_item(current_user.get("username"), languages, await _lock_timeout_sec())
     
     if not item:
         return {"message": "No items available in queue"}
@@ -45,7 +54,34 @@ async def get_next_item(
     return item
 
 
-@router.get("/items/{item_id}")
+@router.get("/next-batch", dependencies=[request_unit_of_work])
+async def get_next_items(
+    langs: str = Query(..., description="Comma-separated language codes, e.g., 'en,hi'"),
+    count: int = Query(default=10, ge=1, le=config.CLAIM_BATCH_MAX, description="Items to lease"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Lease up to `count` items for review in one call (oldest first).
+    Each item's lease expires lease_sec after its review_state.lock_time; give back
+    the ones left unreviewed with POST /datasets/release.
+    """
+    languages = _review_languages(langs, current_user)
+    lock_timeout_sec = await _lock_timeout_sec()
+    items = await QueueService.get_next_items(current_user.get("username"), languages, count, lock_timeout_sec)
+    return {"items": items, "lease_sec": lock_timeout_sec}
+
+
+@router.post("/release")
+async def release_items(
+    request: ReleaseItemsRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Give back leased items that won't be reviewed (all of the caller's leases by default)."""
+    released = await QueueService.release_items(current_user.get("username"), request.item_ids)
+    return {"released_count": released}
+
+
+@router.get("/items/{item_id}", dependencies=[request_unit_of_work])
 async def get_dataset_item(item_id: str):
     """Get dataset item by ID."""
     item = await db_adapter.get("dataset_items", item_id)
@@ -80,7 +116,7 @@ async def create_dataset_item(
     return {"_id": item_id, "item_number": item["item_number"], "message": "Item created successfully"}
 
 
-@router.get("/type/{dataset_type_id}")
+@router.get("/type/{dataset_type_id}", dependencies=[request_unit_of_work])
 async def get_dataset_type_schema(
     dataset_type_id: str,
     current_user: dict = Depends(get_current_user)
@@ -95,7 +131,7 @@ async def get_dataset_type_schema(
     return dataset_type
 
 
-@router.get("/stats")
+@router.get("/stats", dependencies=[request_unit_of_work])
 async def get_dataset_stats(
     langs: Optional[str] = Query(None, description="Comma-separated language codes")
 ):
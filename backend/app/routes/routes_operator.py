@@ -265,8 +265,8 @@ async def create_dataset_type(
 ):
     """Create a new dataset type (platform operator only)."""
     # Check if name already exists
-    existing_types = await db_adapter.find("dataset_types", lambda dt: dt.get("name") == dataset_type.name)
-    if existing_types:
+    existing_type = await db_adapter.find_one("dataset_types", {"name": dataset_type.name})
+    if existing_type:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Dataset type with name '{dataset_type.name}' already exists"
@@ -344,9 +344,11 @@ async def update_dataset_type(
     
     # If name is being updated, check for conflicts
     if "name" in update_data and update_data["name"] != existing.get("name"):
-        conflicts = await db_adapter.find("dataset_types", 
-                                   lambda dt: dt.get("name") == update_data["name"] and dt.get("_id") != dataset_type_id)
-        if conflicts:
+        conflict = await db_adapter.find_one(
+            "dataset_types",
+            {"name": update_data["name"], "_id": {"$ne": dataset_type_id}}
+        )
+        if conflict:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Dataset type with name '{update_data['name']}' already exists"
@@ -391,12 +393,11 @@ async def delete_dataset_type(
     dataset_type = _migrate_legacy_dataset_type(dataset_type)
     
     # Check if any items exist for this dataset type
-    existing_items = await db_adapter.find("dataset_items", 
-                                    lambda item: item.get("dataset_type_id") == dataset_type_id)
+    existing_items = await db_adapter.count("dataset_items", {"dataset_type_id": dataset_type_id})
     if existing_items:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot delete dataset type. {len(existing_items)} items exist. Set active=false instead."
+            detail=f"Cannot delete dataset type. {existing_items} items exist. Set active=false instead."
         )
     
     # Safe to delete
@@ -415,6 +416,8 @@ async def list_dataset_items(
     sort_order: Optional[str] = "desc",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    totals: str = "exact",
     current_user: dict = Depends(get_operator_user)
 ):
     """
@@ -422,60 +425,58 @@ async def list_dataset_items(
     Returns items paginated to prevent performance issues.
     
     Query params:
-    - search: Search in item content (case-insensitive)
+    - status: Review status; leased items count as in_review, not pending
+    - search: Ranked full-text search over item content (Unicode/Indic aware; best matches
+      first, so sort_by/sort_order and cursor don't apply)
     - sort_by: Field to sort by (created_at, item_number, review_count)
     - sort_order: Sort direction (asc, desc)
+    - cursor: `next_cursor` from the previous page (replaces offset; cheap for deep pages)
+    - totals: exact, estimate (planner estimate) or none (skip counting)
     """
     max_limit = 200
     limit = min(limit, max_limit)
 
-    if search:
-        # Legacy fallback with in-Python search
-        def predicate(item: dict) -> bool:
-            if dataset_type_id and item.get("dataset_type_id") != dataset_type_id:
-                return False
-            if language and item.get("language") != language:
-                return False
-            if status and item.get("review_state", {}).get("status") != status:
-                return False
-            if finalized is not None and item.get("review_state", {}).get("finalized", False) != finalized:
-                return False
-            search_lower = search.lower()
-            content = item.get("content", {})
-            content_str = " ".join(str(v).lower() for v in content.values() if v)
-            return search_lower in content_str
-
-        all_items = await db_adapter.find("dataset_items", predicate)
-        reverse = (sort_order == "desc")
-        if sort_by == "item_number":
-            all_items.sort(key=lambda x: x.get("item_number") or 0, reverse=reverse)
-        elif sort_by == "review_count":
-            all_items.sort(key=lambda x: x.get("review_state", {}).get("review_count", 0), reverse=reverse)
-        elif sort_by == "created_at":
-            all_items.sort(key=lambda x: x.get("created_at", ""), reverse=reverse)
-        total_count = len(all_items)
-        paginated_items = all_items[offset:offset + limit]
-        pending_count = sum(1 for item in all_items if item.get("review_state", {}).get("status") == "pending")
-        finalized_count = sum(1 for item in all_items if item.get("review_state", {}).get("finalized", False))
-    else:
-        query_filters = {
-            "dataset_type_id": dataset_type_id,
-            "language": language,
-            "status": status,
-            "finalized": finalized,
-        }
-        result = await db_adapter.query_collection(
-            "dataset_items",
-            filters=query_filters,
-            sort_by=sort_by or "created_at",
-            sort_dir=sort_order or "desc",
-            limit=limit,
-            offset=offset
-        )
-        paginated_items = result["items"]
-        total_count = result["total"]
-        pending_count = await db_adapter.count_documents("dataset_items", {**query_filters, "status": "pending"})
-        finalized_count = await db_adapter.count_documents("dataset_items", {**query_filters, "finalized": True})
+    query_filters = {
+        "dataset_type_id": dataset_type_id,
+        "language": language,
+        "status": status,
+        "finalized": finalized,
+    }
+    count_filters = {"pending": {"status": "pending"}, "finalized": {"finalized": True}}
+
+    try:
+        if search:
+            if cursor:
+                raise ValueError("cursor pagination is not available with search; use offset")
+            result = await db_adapter.search(
+                "dataset_items",
+                search,
+                filters=query_filters,
+                limit=limit,
+                offset=offset,
+                count=totals,
+                count_filters=count_filters,
+            )
+            result["next_cursor"] = None
+        else:
+            result = await db_adapter.query_collection(
+                "dataset_items",
+                filters=query_filters,
+                sort_by=sort_by or "created_at",
+                sort_dir=sort_order or "desc",
+                limit=limit,
+                offset=0 if cursor else offset,
+                cursor=cursor,
+                count=totals,
+                count_filters=count_filters,
+            )
+            result["has_more"] = result["next_cursor"] is not None
+    except ValueError as exc:
+        # 400; the `status` query param shadows fastapi.status in this handler
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    # Leased items are stored as pending; show them the way their reviewer sees them
+    paginated_items = await db_adapter.with_leases(result["items"])
+    total_count = result["total"]
     
     # Normalize modality for legacy items missing this field
     normalized_items = []
@@ -489,11 +490,12 @@ async def list_dataset_items(
         "total": total_count,
         "limit": limit,
         "offset": offset,
-        "has_more": (offset + limit) < total_count,
+        "has_more": result["has_more"],
+        "next_cursor": result["next_cursor"],
         "stats": {
             "total": total_count,
-            "pending": pending_count,
-            "finalized": finalized_count
+            "pending": result["counts"]["pending"],
+            "finalized": result["counts"]["finalized"]
         }
     }
 
@@ -510,6 +512,10 @@ class ExportFilters(BaseModel):
     reviewer_id: Optional[str] = None
 
 
+# CSV export columns taken from review_state rather than the item root
+EXPORT_REVIEW_STATE_FIELDS = {"review_count", "skip_count", "correct_skips", "finalized", "status"}
+
+
 class ExportRequest(BaseModel):
     """Request schema for data export."""
     format: str = Field(..., description="csv or jsonl")
@@ -546,14 +552,25 @@ async def export_dataset_items(
         "is_gold": filters.is_gold,
     }
 
-    result = await db_adapter.query_collection(
-        "dataset_items",
-        filters=query_filters,
-        sort_by="created_at",
-        sort_dir="desc",
-        limit=getattr(config, "EXPORT_ROW_LIMIT", 5000),
-        offset=0
-    )
+    # Load only the requested fields; CSV status/count columns are read from review_state
+    projection = None
+    if projection_fields:
+        projection = sorted(projection_fields | {
+            f"review_state.{field}" for field in projection_fields & EXPORT_REVIEW_STATE_FIELDS
+        })
+
+    try:
+        result = await db_adapter.query_collection(
+            "dataset_items",
+            filters=query_filters,
+            sort_by="created_at",
+            sort_dir="desc",
+            limit=getattr(config, "EXPORT_ROW_LIMIT", 5000),
+            offset=0,
+            projection=projection,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     items = result["items"]
     max_rows = getattr(config, "EXPORT_ROW_LIMIT", 5000)
     capped = result["total"] > len(items)
@@ -681,3 +698,41 @@ async def migrate_item_numbers(current_user: dict = Depends(get_operator_user)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Migration failed: {str(e)}"
         )
+
+
+@router.post("/release-stale-locks")
+async def release_stale_locks(current_user: dict = Depends(get_operator_user)):
+    """Return items whose review lock has expired to the pending queue."""
+    from backend.app.services.queue_service import QueueService
+    
+    system_config = await db_adapter.get("system_config", "config")
+    lock_timeout_sec = system_config.get("lock_timeout_sec", 180) if system_config else 180
+    report = await QueueService.reap_stale_locks(lock_timeout_sec)
+    released_count = report["reclaimed"]
+    
+    # Audit log
+    await AuditService.log_action(
+        admin_username=current_user.get("username"),
+        action="release_stale_locks",
+        resource_type="dataset_items",
+        resource_id="queue",
+        details={**report, "released_count": released_count, "lock_timeout_sec": lock_timeout_sec}
+    )
+    
+    return {
+        "message": f"Released {released_count} stale locks",
+        "released_count": released_count,
+        "report": report
+    }
+
+
+@router.get("/db-metrics")
+async def get_db_metrics(
+    reset: bool = Query(False, description="Clear the collected numbers after reading them"),
+    current_user: dict = Depends(get_operator_user)
+):
+    """Per-operation database timings and recent slow queries for this worker."""
+    snapshot = db_adapter.metrics.snapshot()
+    if reset:
+        db_adapter.metrics.reset()
+    return snapshot
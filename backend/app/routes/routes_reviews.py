@@ -6,6 +6,7 @@ from datetime import datetime
 
 from backend.app.models.review_log_model import ReviewSubmit
 from backend.app.routes.routes_auth import get_current_user
+from backend.app.utils.unit_of_work import request_unit_of_work
 from backend.app.services.review_service import ReviewService
 from backend.app.db_adapter import db_adapter
 
@@ -48,20 +49,21 @@ async def submit_review(
         )
 
 
-@router.get("/stats")
+@router.get("/stats", dependencies=[request_unit_of_work])
 async def get_review_stats(current_user: dict = Depends(get_current_user)):
     """Get current user's review statistics."""
     return await ReviewService.get_user_stats(current_user["username"])
 
 
-@router.get("/my-reviews")
+@router.get("/my-reviews", dependencies=[request_unit_of_work])
 async def get_my_reviews(current_user: dict = Depends(get_current_user)):
     """Get current user's review history."""
-    def predicate(log: dict) -> bool:
-        return log.get("reviewer_id") == current_user["username"]
-    
-    reviews = await db_adapter.find("review_logs", predicate)
-    return sorted(reviews, key=lambda r: r.get("timestamp", ""), reverse=True)
+    return await db_adapter.find(
+        "review_logs",
+        {"reviewer_id": current_user["username"]},
+        sort_by="timestamp",
+        sort_dir="desc"
+    )
 
 
 class FlagItemRequest(BaseModel):
@@ -82,17 +84,6 @@ async def flag_item(
     Reasons: offensive, corrupt, unclear, other
     """
     try:
-        # Get item
-        item = await db_adapter.get("dataset_items", flag_data.item_id)
-        if not item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Item not found"
-            )
-        
-        # Mark item as flagged
-        item["flagged"] = True
-        
         # Add flag log
         flag_log = {
             "item_id": flag_data.item_id,
@@ -102,13 +93,18 @@ async def flag_item(
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        # Store flag in item's metadata
-        flags = item.get("flags", [])
-        flags.append(flag_log)
-        item["flags"] = flags
-        
-        # Update item
-        await db_adapter.update("dataset_items", flag_data.item_id, item)
+        # Mark item as flagged and append the flag to its metadata in one statement
+        item = await db_adapter.update_one(
+            "dataset_items",
+            flag_data.item_id,
+            set_fields={"flagged": True},
+            push_fields={"flags": flag_log},
+        )
+        if not item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found"
+            )
         
         return {
             "success": True,
@@ -77,28 +77,30 @@ class AuditService:
         Returns:
             Dict with logs, total count, and pagination info
         """
-        def predicate(log: dict) -> bool:
-            if admin_username and log.get("admin_username") != admin_username:
-                return False
-            if action and log.get("action") != action:
-                return False
-            if resource_type and log.get("resource_type") != resource_type:
-                return False
-            if success is not None and log.get("success") != success:
-                return False
-            return True
+        filters = {}
+        if admin_username:
+            filters["admin_username"] = admin_username
+        if action:
+            filters["action"] = action
+        if resource_type:
+            filters["resource_type"] = resource_type
+        if success is not None:
+            filters["success"] = success
         
         try:
-            all_logs = await db_adapter.find("admin_audit_logs", predicate)
+            paginated_logs = await db_adapter.find(
+                "admin_audit_logs",
+                filters,
+                sort_by="timestamp",
+                sort_dir="desc",
+                limit=limit,
+                offset=offset
+            )
+            total_count = await db_adapter.count("admin_audit_logs", filters)
         except Exception as exc:
             logger.error("Failed to fetch audit logs: %s", exc)
             raise
         
-        all_logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        
-        total_count = len(all_logs)
-        paginated_logs = all_logs[offset:offset + limit]
-        
         return {
             "logs": paginated_logs,
             "total": total_count,
@@ -111,14 +113,13 @@ class AuditService:
     async def get_recent_activity(admin_username: str, limit: int = 10):
         """Get recent activity for a specific admin."""
         try:
-            all_logs = await db_adapter.find(
+            return await db_adapter.find(
                 "admin_audit_logs",
-                lambda log: log.get("admin_username") == admin_username
+                {"admin_username": admin_username},
+                sort_by="timestamp",
+                sort_dir="desc",
+                limit=limit
             )
         except Exception as exc:
             logger.error("Failed to fetch recent audit activity for %s: %s", admin_username, exc)
             raise
-        
-        all_logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        
-        return all_logs[:limit]
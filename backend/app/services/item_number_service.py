@@ -1,7 +1,9 @@
 """Service for managing sequential item numbers per dataset type."""
 try:
+    from backend.app.config import config
     from backend.app.db_adapter import db_adapter
 except ModuleNotFoundError:
+    from app.config import config
     from app.db_adapter import db_adapter
 
 
@@ -9,29 +11,30 @@ class ItemNumberService:
     """Manages sequential item numbering for dataset items."""
     
     @staticmethod
-    async def get_next_number(dataset_type_id: str) -> int:
+    async def reserve(dataset_type_id: str, count: int, session=None) -> int:
         """
-        Get the next sequential number for a dataset type.
-        Uses a counter stored in DB with key: item_counter:{dataset_type_id}
+        Reserve `count` consecutive numbers for a dataset type in one atomic statement.
+        Returns the first number of the block; the counter (key item_counter:{dataset_type_id})
+        holds the last number handed out. With `session`, the counter row stays locked
+        until that transaction ends, so a rolled-back upload leaves no gap.
         """
+        if count < 1:
+            raise ValueError("count must be positive")
         counter_key = f"item_counter:{dataset_type_id}"
-        counter_doc = await db_adapter.get("counters", counter_key)
-        
-        if not counter_doc:
-            # Initialize counter at 1
-            counter_doc = {
-                "_id": counter_key,
-                "dataset_type_id": dataset_type_id,
-                "current": 1
-            }
-            await db_adapter.insert("counters", counter_doc)
-            return 1
-        
-        # Increment and return
-        current = counter_doc.get("current", 0)
-        next_num = current + 1
-        await db_adapter.update("counters", counter_key, {"current": next_num})
-        return next_num
+        last = await db_adapter.increment_counter(
+            "counters",
+            counter_key,
+            "current",
+            count,
+            defaults={"dataset_type_id": dataset_type_id},
+            session=session,
+        )
+        return last - count + 1
+
+    @staticmethod
+    async def get_next_number(dataset_type_id: str, session=None) -> int:
+        """Get the next sequential number for a dataset type."""
+        return await ItemNumberService.reserve(dataset_type_id, 1, session=session)
     
     @staticmethod
     async def assign_numbers_to_existing_items():
@@ -39,30 +42,32 @@ class ItemNumberService:
         One-time migration: Assign numbers to items that don't have them.
         Groups by dataset_type_id and assigns sequential numbers.
         """
-        all_items = await db_adapter.find("dataset_items", lambda x: True)
-        
-        # Group by dataset type
-        by_type = {}
-        for item in all_items:
+        # Stream items in chronological order, numbering each type as we go;
+        # new numbers are written in batches rather than one UPDATE per item
+        numbers_by_type = {}
+        patches = {}
+        updated_count = 0
+        async for item in db_adapter.iter_collection(
+            "dataset_items",
+            {"dataset_type_id": {"$exists": True}},
+            sort_by="created_at",
+            sort_dir="asc",
+        ):
             type_id = item.get("dataset_type_id")
-            if type_id:
-                if type_id not in by_type:
-                    by_type[type_id] = []
-                by_type[type_id].append(item)
+            if not type_id:
+                continue
+            idx = numbers_by_type.get(type_id, 0) + 1
+            numbers_by_type[type_id] = idx
+            if item.get("item_number") is None:
+                patches[item["_id"]] = {"item_number": idx}
+                if len(patches) >= config.BULK_WRITE_BATCH_SIZE:
+                    updated_count += await db_adapter.patch_many("dataset_items", patches)
+                    patches = {}
+        if patches:
+            updated_count += await db_adapter.patch_many("dataset_items", patches)
         
-        # Assign numbers per type (sorted by created_at if available)
-        updated_count = 0
-        for type_id, items in by_type.items():
-            # Sort by created_at to maintain chronological order
-            items.sort(key=lambda x: x.get("created_at", ""))
-            
-            for idx, item in enumerate(items, start=1):
-                if item.get("item_number") is None:
-                    await db_adapter.update("dataset_items", item["_id"], {"item_number": idx})
-                    updated_count += 1
-            
+        for type_id, max_number in numbers_by_type.items():
             # Update counter to highest number + 1
-            max_number = len(items)
             counter_key = f"item_counter:{type_id}"
             await db_adapter.upsert("counters", counter_key, {
                 "_id": counter_key,
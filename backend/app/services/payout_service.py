@@ -67,25 +67,17 @@ class PayoutService:
     @staticmethod
     async def list_user_payouts(username: str) -> List[Payout]:
         """List all payouts for a user."""
-        all_payouts = await payouts_db.get_all()
-        user_payouts = []
-        
-        for payout_data in all_payouts.values():
-            if payout_data.get("username") == username:
-                user_payouts.append(Payout.from_dict(payout_data))
-        
+        user_payouts = [
+            Payout.from_dict(payout_data)
+            for payout_data in await payouts_db.find({"username": username})
+        ]
         return sorted(user_payouts, key=lambda p: p.requested_at, reverse=True)
     
     @staticmethod
     async def list_all_payouts(status: Optional[str] = None) -> List[Payout]:
         """List all payouts, optionally filtered by status."""
-        all_payouts = await payouts_db.get_all()
-        payouts = []
-        
-        for payout_data in all_payouts.values():
-            if status is None or payout_data.get("status") == status:
-                payouts.append(Payout.from_dict(payout_data))
-        
+        filters = {"status": status} if status is not None else None
+        payouts = [Payout.from_dict(payout_data) for payout_data in await payouts_db.find(filters)]
         return sorted(payouts, key=lambda p: p.requested_at, reverse=True)
     
     @staticmethod
@@ -0,0 +1,107 @@
+"""Background tasks keeping the review queue in shape: lease reaping and counter reconciliation."""
+import abc
+import asyncio
+import logging
+from typing import Optional
+
+try:
+    from backend.app.config import config
+    from backend.app.db_adapter import db_adapter
+    from backend.app.services.queue_service import QueueService
+except ImportError:
+    from app.config import config
+    from app.db_adapter import db_adapter
+    from app.services.queue_service import QueueService
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask(abc.ABC):
+    """Runs `run_once` every `interval_sec` in this worker (0 disables it); failures are logged."""
+
+    name = "periodic task"
+
+    def __init__(self, interval_sec: float):
+        self.interval_sec = interval_sec
+        self.last_report: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the periodic task (no-op if running or interval_sec is 0)."""
+        if self.interval_sec > 0 and not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @abc.abstractmethod
+    async def run_once(self) -> dict:
+        """One pass of the task; returns its report (kept as last_report)."""
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_sec)
+            try:
+                self.last_report = await self.run_once()
+            except Exception:
+                logger.exception("%s pass failed", self.name.capitalize())
+
+
+class LeaseReaper(PeriodicTask):
+    """
+    Runs QueueService.reap_stale_locks periodically. Every worker can run one: the
+    reaper's advisory lock lets a single one work at a time.
+    """
+
+    name = "lease reaper"
+
+    def __init__(self, interval_sec: float, batch_size: Optional[int] = None):
+        super().__init__(interval_sec)
+        self.batch_size = batch_size
+
+    async def run_once(self) -> dict:
+        """One reaping pass with the lock timeout from the system config; returns its report."""
+        system_config = await db_adapter.get("system_config", "config")
+        lock_timeout_sec = system_config.get("lock_timeout_sec", 180) if system_config else 180
+        report = await QueueService.reap_stale_locks(lock_timeout_sec, self.batch_size)
+        if report["reclaimed"]:
+            logger.info(
+                "Lease reaper reclaimed %d items (%d expired leases: oldest %.0fs, mean %.0fs, "
+                "up to %.0fs past expiry; %d legacy locks)",
+                report["reclaimed"],
+                report["reclaimed"] - report["legacy_reset"],
+                report["oldest_sec"] or 0.0,
+                report["mean_sec"] or 0.0,
+                report["max_overdue_sec"] or 0.0,
+                report["legacy_reset"],
+            )
+        return report
+
+
+class QueueCounterReconciler(PeriodicTask):
+    """Corrects drift in the queue counters periodically (see reconcile_queue_counters)."""
+
+    name = "queue counter reconciler"
+
+    async def run_once(self) -> dict:
+        report = await db_adapter.reconcile_queue_counters()
+        if report["corrected"]:
+            logger.warning(
+                "Queue counters drifted: corrected %d of %d groups (off by %d items in total)",
+                report["corrected"], report["groups"], report["drift"],
+            )
+        return report
+
+
+lease_reaper = LeaseReaper(config.LEASE_REAPER_INTERVAL_SEC)
+queue_counter_reconciler = QueueCounterReconciler(config.QUEUE_COUNTER_RECONCILE_SEC)
@@ -1,7 +1,7 @@
 """Queue service - fetches next review item with language filtering."""
 from typing import Optional, List
-from datetime import datetime
-from backend.app.db_adapter import db_adapter
+from datetime import datetime, timedelta
+from backend.app.db_adapter import LEASED_QUEUE_STATUS, db_adapter, document_version, retry_on_conflict
 from backend.app.models.dataset_item_model import (
     DatasetItemStatus,
     validate_dataset_status_transition,
@@ -33,63 +33,155 @@ class QueueService:
         if not claimed:
             return None
 
-        # Populate modality from parent dataset_type if missing
-        if "modality" not in claimed:
-            dataset_type_id = claimed.get("dataset_type_id")
-            if dataset_type_id:
-                dataset_type = await db_adapter.get("dataset_types", dataset_type_id)
-                if dataset_type:
-                    modality = dataset_type.get("modality", "text")
-                    await db_adapter.update("dataset_items", claimed["_id"], {"modality": modality})
-                    claimed["modality"] = modality
-        
+        await QueueService._populate_modality([claimed])
+        return claimed
+
+    @staticmethod
+    async def get_next_items(
+        user_id: str,
+        user_languages: List[str],
+        count: int,
+        lock_timeout_sec: int = 180,
+    ) -> List[dict]:
+        """
+        Lease up to `count` items for review in one claim (same predicates as get_next_item),
+        oldest first. Each lease expires lock_timeout_sec after the claim, item by item;
+        leases the reviewer won't use should be given back with release_items.
+        """
+        claimed = await db_adapter.claim_next_dataset_items(
+            languages=user_languages,
+            lock_owner=user_id,
+            limit=count,
+            lock_timeout_sec=lock_timeout_sec,
+        )
+        await QueueService._populate_modality(claimed)
         return claimed
+
+    @staticmethod
+    async def _populate_modality(items: List[dict]) -> None:
+        """Populate modality from the parent dataset_type where it is missing."""
+        missing = [item for item in items if "modality" not in item and item.get("dataset_type_id")]
+        if not missing:
+            return
+        dataset_types = await db_adapter.get_many("dataset_types", [item["dataset_type_id"] for item in missing])
+        for item in missing:
+            dataset_type = dataset_types.get(item["dataset_type_id"])
+            if dataset_type:
+                modality = dataset_type.get("modality", "text")
+                await db_adapter.update("dataset_items", item["_id"], {"modality": modality})
+                item["modality"] = modality
+
+    @staticmethod
+    async def release_items(user_id: str, item_ids: Optional[List[str]] = None) -> int:
+        """
+        Give back items leased by user_id and not reviewed yet (all of them, or only
+        item_ids). Returns the number of items released.
+        """
+        if item_ids is not None and not item_ids:
+            return 0
+        released = await db_adapter.release_leases(item_ids=item_ids, lock_owner=user_id)
+        # Items locked in the document before leases existed
+        filters = {
+            "review_state.status": DatasetItemStatus.IN_REVIEW.value,
+            "review_state.lock_owner": user_id,
+        }
+        if item_ids is not None:
+            filters["_id"] = {"$in": list(item_ids)}
+        result = await db_adapter.update_many(
+            "dataset_items",
+            filters,
+            set_fields={
+                "review_state.status": DatasetItemStatus.PENDING.value,
+                "review_state.lock_owner": None,
+                "review_state.lock_time": None,
+            },
+        )
+        return released + result["affected"]
     
     @staticmethod
     async def unlock_item(item_id: str) -> bool:
-        """Unlock an item (set back to pending)."""
+        """Unlock an item: end its lease (the document is only written for a legacy in_review lock)."""
+        return await retry_on_conflict(QueueService._unlock_item_once, item_id)
+
+    @staticmethod
+    async def _unlock_item_once(item_id: str) -> bool:
         item = await db_adapter.get("dataset_items", item_id)
         if not item:
             return False
         
         review_state = item.get("review_state", {})
         validate_dataset_status_transition(review_state.get("status"), DatasetItemStatus.PENDING.value)
-        review_state["status"] = DatasetItemStatus.PENDING.value
-        review_state["lock_owner"] = None
-        review_state["lock_time"] = None
         
-        return await db_adapter.update("dataset_items", item_id, {"review_state": review_state})
+        await db_adapter.release_leases(item_ids=[item_id])
+        if review_state.get("status") != DatasetItemStatus.IN_REVIEW.value:
+            return True
+        
+        # Only applied if the status validated above is still current (VersionConflict otherwise)
+        return await db_adapter.update_if_version("dataset_items", item_id, document_version(item), set_fields={
+            "review_state.status": DatasetItemStatus.PENDING.value,
+            "review_state.lock_owner": None,
+            "review_state.lock_time": None,
+        }) is not None
+    
+    @staticmethod
+    async def release_stale_locks(lock_timeout_sec: int = 180, batch_size: Optional[int] = None) -> int:
+        """Return every item whose lease or lock has expired to the queue; returns how many (see reap_stale_locks)."""
+        return (await QueueService.reap_stale_locks(lock_timeout_sec, batch_size))["reclaimed"]
+
+    @staticmethod
+    async def reap_stale_locks(lock_timeout_sec: int = 180, batch_size: Optional[int] = None) -> dict:
+        """
+        Delete expired leases (see DBAdapter.reap_expired_leases), then set in_review items
+        whose lock predates leases and is older than lock_timeout_sec back to pending, in
+        batches. Claims only take pending items, so nothing else returns them to the queue.
+        Returns the lease report with "reclaimed" including the reset items ("legacy_reset").
+        """
+        report = await db_adapter.reap_expired_leases(batch_size)
+        report["legacy_reset"] = 0
+        if report["skipped"]:
+            # Another worker is reaping
+            return report
+        cutoff = datetime.utcnow() - timedelta(seconds=lock_timeout_sec)
+        result = await db_adapter.update_many(
+            "dataset_items",
+            {
+                "review_state.status": DatasetItemStatus.IN_REVIEW.value,
+                "$or": [
+                    {"review_state.lock_time": {"$lt": cutoff}},
+                    {"review_state.lock_time": None},
+                ],
+            },
+            set_fields={
+                "review_state.status": DatasetItemStatus.PENDING.value,
+                "review_state.lock_owner": None,
+                "review_state.lock_time": None,
+            },
+            batch_size=batch_size,
+        )
+        report["legacy_reset"] = result["affected"]
+        report["reclaimed"] += result["affected"]
+        return report
     
     @staticmethod
     async def get_queue_stats(languages: Optional[List[str]] = None) -> dict:
-        """Get queue statistics, optionally filtered by language - optimized for large datasets."""
-        # Optimized: Use efficient counting instead of loading all items
-        all_items = await db_adapter.list_collection("dataset_items")
-        
-        total = 0
-        pending = 0
-        in_review = 0
-        
-        # Process items efficiently
-        for item in all_items:
-            if not item:
-                continue
-            
-            # Skip finalized items
-            review_state = item.get("review_state", {})
-            if review_state.get("finalized", False):
-                continue
-            
-            # Filter by language if specified
-            if languages and item.get("language") not in languages:
-                continue
-            
-            total += 1
-            status = review_state.get("status", "pending")
-            if status == "pending":
-                pending += 1
-            elif status == "in_review":
-                in_review += 1
+        """
+        Get queue statistics, optionally filtered by language, from the queue counters (no item scan).
+        Leases count as in review until the lease reaper deletes them, so expired leases
+        show up here for up to LEASE_REAPER_INTERVAL_SEC.
+        """
+        total = pending = in_review = leased = 0
+        for group in await db_adapter.queue_counts(languages):
+            if group["status"] == LEASED_QUEUE_STATUS:
+                leased += group["items"]
+            elif not group["finalized"]:
+                total += group["items"]
+                # Items without a status are pending
+                if group["status"] in (DatasetItemStatus.PENDING.value, ""):
+                    pending += group["items"]
+                elif group["status"] == DatasetItemStatus.IN_REVIEW.value:
+                    in_review += group["items"]
+        # Leased items are stored as pending
+        pending, in_review = max(pending - leased, 0), in_review + leased
         
         return {
             "total_items": total,
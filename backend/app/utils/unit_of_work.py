@@ -0,0 +1,32 @@
+"""Request-scoped database unit of work."""
+from fastapi import Depends
+
+from backend.app.db_adapter import db_adapter
+
+
+async def unit_of_work():
+    """
+    Dependency running the request's adapter calls in one transaction
+    (see DBAdapter.unit_of_work): one connection checkout and one commit per
+    request, rolled back if the endpoint raises.
+    """
+    async with db_adapter.unit_of_work() as unit:
+        yield unit
+
+
+def _request_unit_of_work():
+    # The commit must happen before the response is sent. FastAPI 0.106-0.117 does that for
+    # every dependency with yield; later versions only for scope="function".
+    try:
+        return Depends(unit_of_work, scope="function")
+    except TypeError:
+        return Depends(unit_of_work)
+
+
+# Add to a route's `dependencies` to run the request as one unit of work. Only for read
+# and claim routes: every write then commits after the handler returns, so row locks
+# (e.g. the compare-and-swap in ReviewService.submit_review) are held for the rest of the
+# request and an HTTPException raised late rolls back writes made earlier. Routes that
+# write (review submit/flag, item creation, lease release) run each write in its own
+# transaction instead.
+request_unit_of_work = _request_unit_of_work()
@@ -3,45 +3,54 @@
 Clean slate script - Removes all dummy data while preserving system structure.
 Keeps: Users, System Config, Audit Logs
 Deletes: Dataset Types, Dataset Items, Counters, Payouts, OCR Jobs, Audio Jobs
+
+Deletes run in batches (DBAdapter.delete_many) so a large cleanup doesn't hold
+one long transaction against live traffic.
 """
+import asyncio
+import os
 import sys
-sys.path.insert(0, '/home/runner/workspace')
+from dotenv import load_dotenv
+
+# Ensure local .env is loaded before importing config/db adapter
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend.app.db_adapter import db_adapter
+
+COLLECTIONS_TO_CLEAN = {
+    'dataset_types': 'Dataset Types',
+    'dataset_items': 'Dataset Items',
+    'counters': 'Item Number Counters',
+    'payout': 'Payout Records',
+    'ocr_jobs': 'OCR Jobs',
+    'audio_jobs': 'Audio Jobs'
+}
 
-from app.db_adapter import db_adapter
+PRESERVED = {
+    'user': 'User Accounts',
+    'system_config': 'System Configuration',
+    'admin_audit_logs': 'Audit Logs'
+}
 
-def cleanup_all_data():
+
+async def cleanup_all_data():
     """Remove all data for fresh start while preserving users and config."""
     
     print("=" * 60)
     print("🧹 CLEAN SLATE - Data Cleanup Script")
     print("=" * 60)
     
-    collections_to_clean = {
-        'dataset_types': 'Dataset Types',
-        'dataset_items': 'Dataset Items',
-        'counters': 'Item Number Counters',
-        'payouts': 'Payout Records',
-        'ocr_jobs': 'OCR Jobs',
-        'audio_jobs': 'Audio Jobs'
-    }
-    
-    preserved = {
-        'users': 'User Accounts',
-        'system_config': 'System Configuration',
-        'audit_logs': 'Audit Logs'
-    }
-    
     print("\n📦 Collections to PRESERVE:")
-    for key, name in preserved.items():
-        items = db_adapter.find(key)
-        print(f"  ✓ {name}: {len(items)} items")
+    for key, name in PRESERVED.items():
+        count = await db_adapter.count(key)
+        print(f"  ✓ {name}: {count} items")
     
     print("\n🗑️  Collections to DELETE:")
     deletion_summary = {}
     
-    for collection, name in collections_to_clean.items():
-        items = db_adapter.find(collection)
-        count = len(items)
+    for collection, name in COLLECTIONS_TO_CLEAN.items():
+        count = await db_adapter.count(collection)
         deletion_summary[name] = count
         print(f"  ✗ {name}: {count} items")
     
@@ -58,37 +67,34 @@ def cleanup_all_data():
     
     print("\n🔥 Starting deletion...")
     
-    for collection, name in collections_to_clean.items():
-        items = db_adapter.find(collection)
-        deleted = 0
-        
-        for item in items:
-            if db_adapter.delete(collection, item['_id']):
-                deleted += 1
+    for collection, name in COLLECTIONS_TO_CLEAN.items():
+        def report(batch, name=name):
+            print(f"    … {name}: batch {batch['batch']}, {batch['total_affected']} deleted")
         
-        print(f"  ✓ Deleted {deleted} {name}")
+        result = await db_adapter.delete_many(collection, progress=report)
+        print(f"  ✓ Deleted {result['affected']} {name}")
     
     print("\n✅ Cleanup complete!")
     print("\n📊 Summary:")
     print(f"  Total items deleted: {sum(deletion_summary.values())}")
     
     print("\n🔍 Verification:")
-    for collection, name in collections_to_clean.items():
-        remaining = db_adapter.find(collection)
-        status = "✓" if len(remaining) == 0 else "⚠️"
-        print(f"  {status} {name}: {len(remaining)} remaining")
+    for collection, name in COLLECTIONS_TO_CLEAN.items():
+        remaining = await db_adapter.count(collection)
+        status = "✓" if remaining == 0 else "⚠️"
+        print(f"  {status} {name}: {remaining} remaining")
     
     print("\n🛡️  Preserved collections:")
-    for key, name in preserved.items():
-        items = db_adapter.find(key)
-        print(f"  ✓ {name}: {len(items)} items preserved")
+    for key, name in PRESERVED.items():
+        count = await db_adapter.count(key)
+        print(f"  ✓ {name}: {count} items preserved")
     
     print("\n🎉 Clean slate ready! You can now add fresh data.")
     return True
 
 if __name__ == "__main__":
     try:
-        cleanup_all_data()
+        asyncio.run(cleanup_all_data())
     except Exception as e:
         print(f"\n❌ Error during cleanup: {str(e)}")
         sys.exit(1)
@@ -0,0 +1,130 @@
+"""
+Micro-benchmark for the JSONB codec layer.
+
+Compares the previous binding path (json.dumps to text, `CAST(:data AS jsonb)`,
+stdlib json decoding) with the configured codec binding dicts natively.
+Documents look like dataset items with Indic text.
+
+`python -m backend.scripts.benchmark_jsonb_codec [--docs N] [--rounds N] [--database]`
+
+Without --database only client-side encode/decode is timed. With --database
+each path also writes and reads N documents through a temporary table on
+DATABASE_URL; nothing outside that table is touched.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import text
+
+from backend.app.db_adapter import db_adapter
+from backend.app.db_codec import JSONB_VERSION, get_codec
+
+SAMPLE_TEXT = "यह एक उदाहरण वाक्य है जिसकी समीक्षा की जानी है। இது ஒரு மாதிரி வாக்கியம். "
+
+
+def make_documents(count: int) -> List[Dict[str, Any]]:
+    """Dataset-item shaped documents (datetimes already stored as ISO strings)."""
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "_id": str(uuid.uuid4()),
+            "dataset_type_id": "text_review",
+            "language": "hi",
+            "item_number": i,
+            "content": {"text": SAMPLE_TEXT * 4, "source": "benchmark", "tokens": list(range(40))},
+            "review_state": {
+                "status": "pending",
+                "finalized": False,
+                "review_count": 0,
+                "reviewed_by": [],
+                "lock_owner": None,
+            },
+            "flags": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def median_time(rounds: int, fn: Callable[[], Any]) -> float:
+    """Median wall time of `rounds` runs."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def benchmark_client(documents: List[Dict[str, Any]], rounds: int) -> Dict[str, float]:
+    """Time what happens in-process for each document on the way in and out."""
+    codec = get_codec("orjson")
+    legacy_wire = [JSONB_VERSION + json.dumps(doc).encode() for doc in documents]
+    codec_wire = [codec.encode_jsonb(doc) for doc in documents]
+    return {
+        # json.dumps in the adapter, then the dialect's str -> bytes jsonb encoder
+        "encode_legacy": median_time(rounds, lambda: [JSONB_VERSION + json.dumps(doc).encode() for doc in documents]),
+        "encode_codec": median_time(rounds, lambda: [codec.encode_jsonb(doc) for doc in documents]),
+        # dialect decoder: strip version byte, decode to str, json.loads
+        "decode_legacy": median_time(rounds, lambda: [json.loads(raw[1:].decode()) for raw in legacy_wire]),
+        "decode_codec": median_time(rounds, lambda: [codec.decode_jsonb(raw) for raw in codec_wire]),
+    }
+
+
+async def benchmark_database(documents: List[Dict[str, Any]], rounds: int) -> Dict[str, float]:
+    """Round trip through a temp table: one executemany insert plus one full read per path."""
+    results: Dict[str, List[float]] = {"write_legacy": [], "write_codec": [], "read": []}
+    async with db_adapter.engine.connect() as conn:
+        await conn.execute(text("CREATE TEMP TABLE jsonb_codec_benchmark (id int, data jsonb)"))
+        for _ in range(rounds):
+            for label in ("write_legacy", "write_codec"):
+                await conn.execute(text("TRUNCATE jsonb_codec_benchmark"))
+                started = time.perf_counter()
+                if label == "write_legacy":
+                    rows = [{"id": i, "data": json.dumps(doc)} for i, doc in enumerate(documents)]
+                    sql = "INSERT INTO jsonb_codec_benchmark (id, data) VALUES (:id, CAST(:data AS jsonb))"
+                else:
+                    rows = [{"id": i, "data": doc} for i, doc in enumerate(documents)]
+                    sql = "INSERT INTO jsonb_codec_benchmark (id, data) VALUES (:id, :data)"
+                await conn.execute(text(sql), rows)
+                results[label].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            (await conn.execute(text("SELECT data FROM jsonb_codec_benchmark"))).fetchall()
+            results["read"].append(time.perf_counter() - started)
+        await conn.rollback()
+    return {label: statistics.median(timings) for label, timings in results.items()}
+
+
+def report(title: str, timings: Dict[str, float], count: int) -> None:
+    print(title)
+    for label, seconds in timings.items():
+        print(f"  {label:<14} {seconds * 1000:9.2f} ms  {count / seconds:12.0f} docs/s")
+
+
+async def main(count: int, rounds: int, database: bool) -> None:
+    documents = make_documents(count)
+    client = benchmark_client(documents, rounds)
+    report(f"client-side, {count} documents", client, count)
+    print(f"  encode speedup {client['encode_legacy'] / client['encode_codec']:.1f}x, "
+          f"decode speedup {client['decode_legacy'] / client['decode_codec']:.1f}x")
+    if database:
+        report(f"database round trip ({db_adapter.codec.name} codec), {count} documents",
+               await benchmark_database(documents, rounds), count)
+        await db_adapter.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000, help="Documents per run")
+    parser.add_argument("--rounds", type=int, default=5, help="Runs per measurement (median is reported)")
+    parser.add_argument("--database", action="store_true", help="Also time writes and reads against DATABASE_URL")
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.rounds, args.database))
@@ -0,0 +1,41 @@
+"""
+Migration helper to move a pre-partitioning `documents` table into the
+per-collection LIST-partitioned layout.
+
+This is intentionally not executed automatically. A human operator can run:
+`python -m backend.scripts.migrate_partition_documents [--batch-size N] [--pause SECONDS]`
+while the application keeps serving traffic. Rows are copied in batches and the
+tables are swapped under a brief exclusive lock; the old table is kept as
+`documents_legacy` and can be dropped once the new layout is verified.
+The migration is idempotent and safe to re-run after an interruption.
+"""
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict
+
+from backend.app.db_adapter import db_adapter
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_partition_documents(batch_size: int = 5000, pause_sec: float = 0.0) -> Dict[str, Any]:
+    """
+    Run the online partitioning migration.
+
+    Returns:
+        Migration summary from DBAdapter.migrate_to_partitioned
+    """
+    summary = await db_adapter.migrate_to_partitioned(batch_size=batch_size, pause_sec=pause_sec)
+    logger.info("Documents partition migration: %s", summary)
+    return summary
+
+
+if __name__ == "__main__":
+    # Manual execution entrypoint; do not call automatically in production pipelines.
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows copied per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate_partition_documents(batch_size=args.batch_size, pause_sec=args.pause))
@@ -55,11 +55,9 @@ async def seed_dataset_types():
         },
     ]
 
-    type_ids = []
-    for type_data in types:
-        dt = dataset_type_to_dict(type_data)
-        type_id = await db_adapter.insert("dataset_types", dt)
-        type_ids.append(type_id)
+    inserted = await db_adapter.upsert_many("dataset_types", [dataset_type_to_dict(t) for t in types])
+    type_ids = inserted["ids"]
+    for type_data, type_id in zip(types, type_ids):
         print(f"Dataset type created: {type_data['name']} (ID: {type_id})")
 
     return type_ids
@@ -352,10 +350,10 @@ async def seed_dataset_items(type_ids):
 
     items = build_news_items(news_type_id) + build_product_items(product_type_id)
 
-    for item_data in items:
-        item = dataset_item_to_dict(item_data)
-        item_id = await db_adapter.insert("dataset_items", item)
-        print(f"Dataset item created: {item['language']} - {item_id[:8]}...")
+    inserted = await db_adapter.upsert_many("dataset_items", [dataset_item_to_dict(i) for i in items])
+    for batch in inserted["batches"]:
+        print(f"Dataset items batch: {batch['rows']} rows via {batch['method']} in {batch['seconds']:.3f}s")
+    print(f"Dataset items created: {len(inserted['ids'])}")
 
 
 async def main():
@@ -0,0 +1,88 @@
+"""Unit tests for the aggregate compiler (no database required)."""
+import os
+import sys
+
+import pytest
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_aggregate import aggregate_documents, compile_aggregate
+
+
+def test_group_keys_use_promoted_columns_or_document_paths():
+    select, joins, params = compile_aggregate(
+        ["review_state.status", "meta.source"],
+        {"items": ("count", None)},
+        column_map={"review_state.status": ("status", str)},
+    )
+    assert select[0] == "to_jsonb(d.status)"
+    assert select[1] == "d.data #> CAST(:a0 AS text[])"
+    assert select[2] == "COUNT(*)"
+    assert joins == []
+    assert params == {"a0": ["meta", "source"]}
+
+
+def test_metric_filters_become_filter_clauses():
+    select, _, params = compile_aggregate(
+        ["reviewer_id"],
+        {"skips": ("count", None, {"action": "skip"}), "earned": ("sum", "payout_amount")},
+    )
+    assert select[1].startswith("COUNT(*) FILTER (WHERE d.data @> CAST(:af")
+    assert "SUM(CASE WHEN jsonb_typeof(" in select[2]
+    assert ["payout_amount"] in params.values()
+
+
+def test_array_paths_share_one_lateral_join_per_array():
+    select, joins, _ = compile_aggregate(["flags[].reviewer_id", "flags[].reason", "review_state.reviewed_by[]"])
+    assert len(joins) == 2
+    assert select[0].startswith("u0.value #>") and select[1].startswith("u0.value #>")
+    assert select[2] == "u1.value"
+
+
+def test_lookup_paths_read_the_joined_document():
+    select, _, _ = compile_aggregate(["$lookup.dataset_type_id"], lookup=True)
+    assert select[0].startswith("l.data #>")
+    with pytest.raises(ValueError):
+        compile_aggregate(["$lookup.dataset_type_id"])
+
+
+@pytest.mark.parametrize("group_by, metrics", [
+    (None, None),
+    ("language", None),
+    (["language"], {"language": ("count", None)}),
+    (None, {"n": ("median", "x")}),
+    (None, {"n": ("sum", None)}),
+    (None, {"n": "count"}),
+    (["flags[][]"], None),
+    (["flags[]x"], None),
+])
+def test_invalid_specs_raise_value_error(group_by, metrics):
+    with pytest.raises(ValueError):
+        compile_aggregate(group_by, metrics)
+
+
+def test_aggregate_documents_groups_in_python():
+    documents = [
+        {"language": "hi", "review_state": {"status": "pending", "review_count": 1}},
+        {"language": "hi", "review_state": {"status": "done", "review_count": 3}},
+        {"language": "en", "review_state": {"status": "done", "review_count": 2}},
+        {"review_state": {"status": "pending"}},
+    ]
+    rows = aggregate_documents(
+        documents,
+        ["language"],
+        {
+            "items": ("count", None),
+            "reviews": ("sum", "review_state.review_count"),
+            "done": ("count", None, {"review_state.status": "done"}),
+        },
+    )
+    assert rows == [
+        {"language": "en", "items": 1, "reviews": 2, "done": 1},
+        {"language": "hi", "items": 2, "reviews": 4, "done": 1},
+        {"language": None, "items": 1, "reviews": None, "done": 0},
+    ]
+    assert aggregate_documents([], None, {"items": ("count", None)}) == [{"items": 0}]
@@ -0,0 +1,86 @@
+"""Unit tests for the document cache (no database required)."""
+import json
+import os
+import sys
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_cache import MISSING, DocumentCache, apply_invalidation, invalidation_payload
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(**kwargs):
+    clock = FakeClock()
+    return DocumentCache(["system_config", "dataset_types"], clock=clock, **kwargs), clock
+
+
+def test_only_designated_collections_are_cached():
+    cache, _ = make_cache()
+    assert cache.enabled_for("system_config")
+    assert not cache.enabled_for("dataset_items")
+
+
+def test_hits_return_private_copies_and_cache_missing_documents():
+    cache, _ = make_cache()
+    assert cache.get("system_config", "config") is MISSING
+    cache.put("system_config", "config", {"lock_timeout_sec": 180})
+    cache.put("dataset_types", "gone", None)
+
+    first = cache.get("system_config", "config")
+    first["lock_timeout_sec"] = 1
+    assert cache.get("system_config", "config") == {"lock_timeout_sec": 180}
+    assert cache.get("dataset_types", "gone") is None
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache, clock = make_cache(ttl_sec=10)
+    cache.put("dataset_types", "t1", {"name": "A"})
+    clock.now = 9.9
+    assert cache.get("dataset_types", "t1") == {"name": "A"}
+    clock.now = 10.0
+    assert cache.get("dataset_types", "t1") is MISSING
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, _ = make_cache(max_entries=2)
+    cache.put("dataset_types", "t1", {})
+    cache.put("dataset_types", "t2", {})
+    cache.get("dataset_types", "t1")
+    cache.put("dataset_types", "t3", {})
+    assert cache.get("dataset_types", "t2") is MISSING
+    assert cache.get("dataset_types", "t1") == {}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_read_started_before_an_invalidation_is_not_cached():
+    cache, _ = make_cache()
+    token = cache.token()
+    cache.invalidate("dataset_types", ["t1"])
+    cache.put("dataset_types", "t1", {"name": "stale"}, token)
+    assert cache.get("dataset_types", "t1") is MISSING
+
+
+def test_notify_payload_round_trip_and_collection_fallback():
+    cache, _ = make_cache()
+    cache.put("dataset_types", "t1", {})
+    cache.put("dataset_types", "t2", {})
+    apply_invalidation(cache, invalidation_payload(cache.codec, "dataset_types", ["t1"]))
+    assert cache.get("dataset_types", "t1") is MISSING
+    assert cache.get("dataset_types", "t2") == {}
+
+    payload = invalidation_payload(cache.codec, "dataset_types", [f"id-{i:05d}" for i in range(2000)])
+    assert json.loads(payload) == {"c": "dataset_types"}
+    apply_invalidation(cache, payload)
+    assert cache.get("dataset_types", "t2") is MISSING
@@ -0,0 +1,53 @@
+"""Unit tests for the JSONB codec layer (no database required)."""
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_codec import JSONB_VERSION, get_codec
+
+CODEC_NAMES = ["json", "orjson"]
+
+
+@pytest.mark.parametrize("name", CODEC_NAMES)
+def test_documents_round_trip_through_binary_jsonb(name):
+    codec = get_codec(name)
+    document = {"_id": "a1", "content": {"text": "नमस्ते दुनिया"}, "review_state": {"reviewed_by": []}, "n": 1.5}
+    encoded = codec.encode_jsonb(document)
+    assert encoded.startswith(JSONB_VERSION)
+    assert codec.decode_jsonb(encoded) == document
+
+
+@pytest.mark.parametrize("name", CODEC_NAMES)
+def test_datetimes_and_uuids_serialise_like_the_services_store_them(name):
+    codec = get_codec(name)
+    when = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    aware = when.replace(tzinfo=timezone.utc)
+    ident = uuid.uuid4()
+    decoded = json.loads(codec.dumps({"naive": when, "aware": aware, "id": ident, 3: "key"}))
+    assert decoded == {"naive": when.isoformat(), "aware": aware.isoformat(), "id": str(ident), "3": "key"}
+
+
+@pytest.mark.parametrize("name", CODEC_NAMES)
+def test_text_is_bound_as_already_serialised_json(name):
+    codec = get_codec(name)
+    assert codec.encode_jsonb('{"a": 1}') == JSONB_VERSION + b'{"a": 1}'
+    assert codec.encode_jsonb(codec.dumps_text("pending")) == JSONB_VERSION + b'"pending"'
+    assert codec.encode_json([1, 2]) == b"[1,2]"
+
+
+def test_orjson_falls_back_for_values_it_rejects():
+    assert json.loads(get_codec("orjson").dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_unknown_codec_raises_value_error():
+    with pytest.raises(ValueError):
+        get_codec("msgpack")
@@ -0,0 +1,122 @@
+"""Unit tests for the filter document compiler (no database required)."""
+import json
+import os
+import sys
+
+import pytest
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_filters import compile_filter, match_filter
+
+
+def test_empty_filter_matches_everything():
+    sql, params = compile_filter(None)
+    assert sql == "TRUE"
+    assert params == {}
+
+
+def test_scalar_equality_uses_containment_on_nested_path():
+    sql, params = compile_filter({"review_state.status": "pending"})
+    assert sql == "data @> CAST(:f0 AS jsonb)"
+    assert json.loads(params["f0"]) == {"review_state": {"status": "pending"}}
+
+
+def test_operators_are_parameterised_and_combined():
+    sql, params = compile_filter({
+        "language": {"$in": ["hi", "ta"]},
+        "item_number": {"$gt": 10},
+        "$or": [{"flagged": True}, {"is_gold": True}],
+    })
+    assert sql.count(" AND ") >= 2
+    assert " OR " in sql
+    assert json.loads(params["f0"]) == ["hi", "ta"]
+    assert params["f1"] == ["language"]
+    assert 10 in params.values()
+    # No user values are interpolated into the SQL text
+    assert "hi" not in sql and "10" not in sql
+
+
+def test_contains_wraps_element_in_array():
+    sql, params = compile_filter({"flags": {"$contains": {"reason": "corrupt"}}})
+    assert "@>" in sql
+    assert json.loads(params["f0"]) == {"flags": [{"reason": "corrupt"}]}
+
+
+def test_icontains_escapes_like_wildcards():
+    _, params = compile_filter({"content": {"$icontains": "50%_off"}})
+    assert params["f0"] == "%50\\%\\_off%"
+
+
+def test_icontains_matches_object_values_joined_in_jsonb_key_order():
+    sql, _ = compile_filter({"content": {"$icontains": "x"}})
+    assert "string_agg(kv.value, ' ' ORDER BY kv.n)" in sql
+    # jsonb key order: "text" (4 bytes) before "answer" (6 bytes)
+    document = {"content": {"answer": "New Delhi", "text": "Capital of India?", "note": "", "extra": None}}
+    assert match_filter(document, {"content": {"$icontains": "india? new delhi"}})
+    assert match_filter(document, {"content": {"$icontains": "CAPITAL"}})
+    assert not match_filter(document, {"content": {"$icontains": "delhi capital"}})
+    # Keys are not searched
+    assert not match_filter(document, {"content": {"$icontains": "answer"}})
+
+
+def test_leased_checks_the_lease_table_for_the_document_id():
+    sql, params = compile_filter({"$leased": False}, data_column="d.data")
+    assert sql == "NOT EXISTS (SELECT 1 FROM item_leases lease WHERE lease.item_id = d.doc_id)"
+    assert params == {}
+    assert match_filter({"_id": "a"}, {"$leased": False})
+    with pytest.raises(ValueError):
+        compile_filter({"$leased": "yes"})
+
+
+def test_promoted_columns_replace_jsonb_lookups():
+    column_map = {"review_state.status": ("status", str), "flagged": ("flagged", bool)}
+    sql, params = compile_filter(
+        {"review_state.status": {"$in": ["pending", None]}, "flagged": True},
+        data_column="d.data",
+        column_map=column_map,
+    )
+    assert "d.status IS NULL" in sql
+    assert "d.status = ANY(CAST(:f0 AS text[]))" in sql
+    assert "d.flagged = CAST(:f1 AS boolean)" in sql
+    assert params == {"f0": ["pending"], "f1": True}
+
+    # Operands that don't fit the column type fall back to the document
+    sql, _ = compile_filter({"flagged": "yes"}, column_map=column_map)
+    assert sql.startswith("data @>")
+
+
+def test_null_equality_matches_missing_keys():
+    sql, _ = compile_filter({"deleted_at": None})
+    assert "COALESCE" in sql and "'null'::jsonb" in sql
+
+
+@pytest.mark.parametrize("bad_filter", [
+    {"$where": "1=1"},
+    {"language": {"$regex": "h.*"}},
+    {"item_number": {"$gt": True}},
+    {"language": {"$in": "hi"}},
+    {"a..b": 1},
+])
+def test_invalid_filters_raise_value_error(bad_filter):
+    with pytest.raises(ValueError):
+        compile_filter(bad_filter)
+
+
+def test_match_filter_follows_sql_semantics():
+    document = {"language": "hi", "tags": ["a", "b"], "review_state": {"status": "pending", "finalized": "yes"}}
+    assert match_filter(document, {"review_state.status": {"$in": ["pending", "in_review"]}, "tags": {"$contains": "a"}})
+    # Equality is jsonb containment, which does not look inside nested arrays
+    assert not match_filter(document, {"tags": "a"})
+    assert match_filter(document, {"missing": None, "language": {"$ne": "en"}})
+    # Comparisons with a missing value are NULL: they don't match, inside $or either
+    assert not match_filter(document, {"missing": {"$gt": 1}})
+    assert not match_filter(document, {"$or": [{"missing": {"$gt": 1}}, {"language": "en"}]})
+    assert match_filter(document, {"missing": {"$not": {"$gt": 1}}})
+    columns = {"review_state.finalized": ("finalized", bool)}
+    # Promoted boolean columns are NULL for non-boolean values
+    assert match_filter(document, {"review_state.finalized": None}, column_map=columns)
+    assert not match_filter(document, {"review_state.finalized": None})
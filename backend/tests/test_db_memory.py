@@ -0,0 +1,479 @@
+"""Tests for the in-memory storage backend (no database required)."""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import backend.app.db_adapter as db_module
+from backend.app.db_adapter import FILTER_COLUMNS, VersionConflict, create_db_adapter
+from backend.app.db_memory import MemoryAdapter
+from backend.app.routes import routes_operator
+from backend.app.services import item_number_service, queue_service, review_service
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def dataset_item(index, language="hi", **review_state):
+    return {
+        "_id": f"item-{index}",
+        "language": language,
+        "dataset_type_id": "type-1",
+        "item_number": index,
+        "created_at": f"2024-01-{index + 1:02d}T00:00:00",
+        "content": {"text": f"item number {index}"},
+        "review_state": {"status": "pending", "reviewed_by": [], "review_count": 0, **review_state},
+    }
+
+
+async def seeded(count=5, **kwargs):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    await db.insert_many("dataset_items", [dataset_item(index, **kwargs) for index in range(count)])
+    return db
+
+
+def test_factory_selects_the_backend():
+    assert isinstance(create_db_adapter("memory"), MemoryAdapter)
+    with pytest.raises(ValueError):
+        create_db_adapter("redis")
+
+
+def test_backends_must_implement_every_operation():
+    assert not MemoryAdapter.__abstractmethods__
+    operations = db_module.StorageBackend.__abstractmethods__ - {"get_leases"}
+    incomplete = type("Incomplete", (db_module.StorageBackend,), {name: getattr(MemoryAdapter, name) for name in operations})
+    with pytest.raises(TypeError, match="get_leases"):
+        incomplete()
+
+
+def test_documents_are_stored_as_json_copies():
+    async def scenario():
+        db = MemoryAdapter()
+        document = {"_id": "a", "tags": ["x"], "nested": {"n": 1}}
+        await db.insert("things", document)
+        document["tags"].append("y")
+        stored = await db.get("things", "a")
+        stored["nested"]["n"] = 2
+        return stored, await db.get("things", "a"), await db.get("things", "a", projection=["nested.n"])
+
+    stored, again, projected = run(scenario())
+    assert stored["tags"] == ["x"]
+    assert again["nested"] == {"n": 1}
+    assert projected == {"_id": "a", "nested": {"n": 1}}
+
+
+def test_find_filters_sorts_and_pages():
+    async def scenario():
+        db = await seeded(6)
+        await db.update_one("dataset_items", "item-2", set_fields={"language": "en"})
+        return (
+            await db.find("dataset_items", {"language": "hi"}, sort_by="item_number", sort_dir="desc", limit=2, offset=1),
+            await db.count_documents("dataset_items", {"language": "hi"}),
+            await db.find_one("dataset_items", {"item_number": {"$gte": 4}}),
+        )
+
+    page, count, first = run(scenario())
+    assert [item["_id"] for item in page] == ["item-4", "item-3"]
+    assert count == 5
+    assert first["_id"] == "item-4"
+
+
+def test_query_collection_cursor_walks_every_item_once():
+    async def scenario():
+        db = await seeded(7)
+        seen = []
+        result = await db.query_collection("dataset_items", {"language": "hi"}, sort_dir="asc", limit=3)
+        total = result["total"]
+        while True:
+            seen += [item["_id"] for item in result["items"]]
+            if not result["next_cursor"]:
+                return seen, total
+            result = await db.query_collection(
+                "dataset_items", {"language": "hi"}, sort_dir="asc", limit=3, cursor=result["next_cursor"]
+            )
+
+    seen, total = run(scenario())
+    assert seen == [f"item-{index}" for index in range(7)]
+    assert total == 7
+
+
+def test_writes_bump_versions_and_compare_and_swap_checks_them():
+    async def scenario():
+        db = await seeded(1)
+        updated = await db.update_one("dataset_items", "item-0", inc_fields={"review_state.review_count": 1})
+        swapped = await db.update_if_version("dataset_items", "item-0", 1, push_fields={"review_state.reviewed_by": "u1"})
+        with pytest.raises(VersionConflict):
+            await db.update_if_version("dataset_items", "item-0", 1, set_fields={"note": "stale"})
+        return updated, swapped, await db.get("dataset_items", "item-0")
+
+    updated, swapped, current = run(scenario())
+    assert updated["_version"] == 1
+    assert updated["review_state"]["review_count"] == 1
+    assert swapped["_version"] == 2
+    assert current["review_state"]["reviewed_by"] == ["u1"]
+    assert "note" not in current
+
+
+def test_unit_of_work_rolls_back_and_hides_uncommitted_writes():
+    async def scenario():
+        db = MemoryAdapter()
+        await db.insert("things", {"_id": "a", "n": 0})
+        with pytest.raises(RuntimeError):
+            async with db.unit_of_work():
+                await db.update_one("things", "a", set_fields={"n": 1})
+                await db.insert("things", {"_id": "b"})
+                raise RuntimeError("abort")
+        seen_outside = []
+
+        async def writer(started, release):
+            async with db.unit_of_work():
+                await db.update_one("things", "a", set_fields={"n": 2})
+                started.set()
+                await release.wait()
+
+        started, release = asyncio.Event(), asyncio.Event()
+        task = asyncio.create_task(writer(started, release))
+        await started.wait()
+        seen_outside.append((await db.get("things", "a"))["n"])
+        release.set()
+        await task
+        seen_outside.append((await db.get("things", "a"))["n"])
+        return await db.get("things", "b"), seen_outside
+
+    missing, seen_outside = run(scenario())
+    assert missing is None
+    assert seen_outside == [0, 2]
+
+
+def test_concurrent_claims_never_return_the_same_item():
+    async def scenario():
+        db = await seeded(5)
+        return await asyncio.gather(*[
+            db.claim_next_dataset_item(["hi"], f"reviewer-{index}") for index in range(8)
+        ])
+
+    claims = run(scenario())
+    claimed = [item["_id"] for item in claims if item]
+    assert sorted(claimed) == [f"item-{index}" for index in range(5)]
+    assert claims[0]["_id"] == "item-0"
+    assert all(item["review_state"]["status"] == "in_review" for item in claims if item)
+
+
+def test_batch_claims_lease_disjoint_items_in_queue_order():
+    async def scenario():
+        db = await seeded(7)
+        first, second = await asyncio.gather(
+            db.claim_next_dataset_items(["hi"], "reviewer-1", limit=4),
+            db.claim_next_dataset_items(["hi"], "reviewer-2", limit=4),
+        )
+        with pytest.raises(ValueError):
+            await db.claim_next_dataset_items(["hi"], "reviewer-3", limit=0)
+        return first, second
+
+    first, second = run(scenario())
+    assert [item["_id"] for item in first] == ["item-0", "item-1", "item-2", "item-3"]
+    assert [item["_id"] for item in second] == ["item-4", "item-5", "item-6"]
+    assert {item["review_state"]["lock_owner"] for item in second} == {"reviewer-2"}
+
+
+def test_claim_skips_items_locked_by_open_transactions():
+    async def scenario():
+        db = await seeded(2)
+        locked, release = asyncio.Event(), asyncio.Event()
+
+        async def holder():
+            async with db.transaction() as session:
+                await db.get_for_update(session, "dataset_items", "item-0")
+                locked.set()
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await locked.wait()
+        claimed = await db.claim_next_dataset_item(["hi"], "reviewer")
+        release.set()
+        await task
+        return claimed
+
+    assert run(scenario())["_id"] == "item-1"
+
+
+def test_claim_respects_reviewers_and_reaped_stale_locks(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    monkeypatch.setattr(queue_service, "db_adapter", db)
+
+    async def scenario():
+        await db.insert_many("dataset_items", [
+            dataset_item(0, reviewed_by=["reviewer"]),
+            dataset_item(1, status="in_review", lock_time="2099-01-01T00:00:00"),
+            dataset_item(2, status="in_review", lock_time="2000-01-01T00:00:00"),
+        ])
+        before = await db.claim_next_dataset_item(["hi"], "reviewer", lock_timeout_sec=60)
+        report = await queue_service.QueueService.reap_stale_locks(lock_timeout_sec=60)
+        return before, report, await db.claim_next_dataset_item(["hi"], "reviewer", lock_timeout_sec=60)
+
+    before, report, after = run(scenario())
+    # Stale locks only return to the queue through the reaper
+    assert before is None
+    assert (report["reclaimed"], report["legacy_reset"]) == (1, 1)
+    assert after["_id"] == "item-2"
+
+
+def test_reaper_reports_reclaimed_leases_and_runs_one_at_a_time():
+    async def scenario():
+        db = await seeded(5)
+        await db.claim_next_dataset_items(["hi"], "other", limit=1, lock_timeout_sec=600)
+        await db.claim_next_dataset_items(["hi"], "reviewer", limit=3, lock_timeout_sec=0)
+        async with db._reaper_lock:
+            busy = await db.reap_expired_leases()
+        return busy, await db.reap_expired_leases(batch_size=2), await db.count_leases()
+
+    busy, report, remaining = run(scenario())
+    assert busy["skipped"] is True and busy["reclaimed"] == 0
+    assert (report["reclaimed"], report["batches"], report["skipped"]) == (3, 2, False)
+    assert report["oldest_sec"] >= report["mean_sec"] >= 0
+    assert remaining == 1
+
+
+def test_claim_watermark_keeps_items_held_by_others_reachable():
+    async def scenario():
+        db = MemoryAdapter(column_map=FILTER_COLUMNS)
+        await db.insert_many("dataset_items", [
+            dataset_item(0, reviewed_by=["reviewer"]),
+            dataset_item(1, status="in_review", lock_owner="other", lock_time="2099-01-01T00:00:00"),
+            dataset_item(2, reviewed_by=["reviewer"]),
+            dataset_item(3),
+        ])
+        first = await db.claim_next_dataset_items(["hi"], "reviewer", limit=5)
+        watermark = db._claim_watermarks[("reviewer", "*|hi")][0][1]
+        await db.update_one("dataset_items", "item-1", set_fields={"review_state.status": "pending"})
+        second = await db.claim_next_dataset_items(["hi"], "reviewer", limit=5)
+        return first, watermark, second
+
+    first, watermark, second = run(scenario())
+    assert [item["_id"] for item in first] == ["item-3"]
+    # Stops at the item another reviewer holds, not at the claimed one
+    assert watermark == 2
+    assert [item["_id"] for item in second] == ["item-1"]
+
+
+def test_queue_counters_follow_every_write(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    for module in (queue_service, review_service):
+        monkeypatch.setattr(module, "db_adapter", db)
+
+    async def scenario():
+        await db.insert_many("dataset_items", [dataset_item(index, language="hi" if index < 4 else "en") for index in range(6)])
+        await db.insert("user", {"_id": "reviewer", "payout_balance": 0, "reviews_done": 0})
+        leased = await queue_service.QueueService.get_next_items("reviewer", ["hi"], 3)
+        await review_service.ReviewService.submit_review(leased[0]["_id"], "reviewer", "approve")
+        await db.update_one("dataset_items", leased[1]["_id"], set_fields={"language": "en"})
+        await db.delete("dataset_items", leased[2]["_id"])
+        await db.update_one("dataset_items", "item-5", set_fields={"review_state.finalized": True})
+        stats = await queue_service.QueueService.get_queue_stats(), await queue_service.QueueService.get_queue_stats(["en"])
+        clean = await db.reconcile_queue_counters()
+        db._queue_counters[("type-1", "en", "pending", False)] += 2
+        return stats, clean, await db.reconcile_queue_counters()
+
+    (everything, english), clean, drifted = run(scenario())
+    assert (everything["total_items"], everything["pending_items"], everything["in_review"]) == (4, 3, 1)
+    assert (english["total_items"], english["pending_items"], english["in_review"]) == (2, 1, 1)
+    assert clean["corrected"] == 0
+    assert (drifted["corrected"], drifted["drift"]) == (1, 2)
+
+
+def test_finalizing_review_releases_every_lease_on_the_item(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    for module in (queue_service, review_service):
+        monkeypatch.setattr(module, "db_adapter", db)
+
+    async def scenario():
+        await db.insert("dataset_items", dataset_item(0, review_count=2))
+        await db.insert("user", {"_id": "reviewer", "payout_balance": 0, "reviews_done": 0})
+        # The reviewer's lease expires and another reviewer takes the item over
+        await db.claim_next_dataset_items(["hi"], "reviewer", limit=1, lock_timeout_sec=0)
+        await db.claim_next_dataset_items(["hi"], "other", limit=1, lock_timeout_sec=60)
+        await review_service.ReviewService.submit_review("item-0", "reviewer", "approve")
+        return await db.count_leases(), await queue_service.QueueService.get_queue_stats()
+
+    leases, stats = run(scenario())
+    assert leases == 0
+    assert (stats["total_items"], stats["in_review"]) == (0, 0)
+
+
+def test_item_numbers_are_reserved_in_contiguous_blocks(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    monkeypatch.setattr(item_number_service, "db_adapter", db)
+    numbers = item_number_service.ItemNumberService
+
+    async def scenario():
+        first = await numbers.reserve("type-1", 5)
+        counter = await db.get("counters", "item_counter:type-1")
+        following = await numbers.get_next_number("type-1")
+        # A reserve rolled back with its transaction hands out nothing
+        with pytest.raises(RuntimeError):
+            async with db.transaction() as session:
+                await numbers.reserve("type-1", 3, session=session)
+                raise RuntimeError("upload failed")
+        starts = await asyncio.gather(*[numbers.reserve("type-1", 4) for _ in range(5)])
+        return first, counter, following, starts, await db.get("counters", "item_counter:type-1")
+
+    first, counter, following, starts, final = run(scenario())
+    assert first == 1
+    assert (counter["current"], counter["dataset_type_id"]) == (5, "type-1")
+    assert following == 6
+    # Concurrent reserves get disjoint blocks covering the numbers without a gap
+    assert sorted(number for start in starts for number in range(start, start + 4)) == list(range(7, 27))
+    assert final["current"] == 26
+    with pytest.raises(ValueError):
+        run(numbers.reserve("type-1", 0))
+
+
+def test_operator_listing_shows_leased_items_in_review(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    for module in (queue_service, routes_operator):
+        monkeypatch.setattr(module, "db_adapter", db)
+
+    def listing(**filters):
+        return routes_operator.list_dataset_items(
+            **{"dataset_type_id": None, "language": None, "status": None, "finalized": None, "search": None,
+               "sort_by": "created_at", "sort_order": "asc", "limit": 100, "offset": 0, "cursor": None,
+               "totals": "exact", "current_user": {}, **filters}
+        )
+
+    async def scenario():
+        await db.insert_many("dataset_items", [{**dataset_item(index), "meta": {}} for index in range(3)])
+        await queue_service.QueueService.get_next_items("reviewer", ["hi"], 2)
+        return (
+            await listing(), await listing(status="in_review"), await listing(status="pending"),
+            await listing(search="number", status="in_review"), await queue_service.QueueService.get_queue_stats(),
+        )
+
+    everything, in_review, pending, found, stats = run(scenario())
+    assert (everything["total"], everything["stats"]["pending"]) == (3, 1)
+    assert [item.review_state.status for item in everything["items"]] == ["in_review", "in_review", "pending"]
+    assert everything["items"][0].review_state.lock_owner == "reviewer"
+    assert [item.id for item in in_review["items"]] == ["item-0", "item-1"]
+    assert [item.id for item in pending["items"]] == ["item-2"]
+    assert found["total"] == 2
+    assert (stats["in_review"], stats["pending_items"]) == (in_review["total"], pending["total"])
+
+
+def test_namespaced_keys_are_listed_and_cleared_by_prefix(monkeypatch):
+    db = MemoryAdapter()
+    monkeypatch.setattr(db_module, "db_adapter", db)
+    store = db_module.DatabaseAdapter("sessions:")
+
+    async def scenario():
+        for key in ("user:a", "user:b", "user_c", "token:x"):
+            await store.set(key, {"_id": key})
+        keys = await store.list_keys("user:")
+        cleared = await store.clear_all("user:")
+        return keys, cleared, await store.list_keys(), await store.clear_all()
+
+    keys, cleared, remaining, rest = run(scenario())
+    assert keys == ["user:a", "user:b"]
+    assert cleared == 2
+    assert remaining == ["user_c", "token:x"]
+    assert rest == 2
+
+
+def test_aggregate_and_search():
+    async def scenario():
+        db = await seeded(4)
+        await db.update_one("dataset_items", "item-3", set_fields={"language": "en", "content.text": "other words"})
+        stats = await db.aggregate(
+            "dataset_items", None, ["language"], {"items": ("count", None), "numbers": ("sum", "item_number")}
+        )
+        found = await db.search("dataset_items", "numb", filters={"language": "hi"}, limit=2)
+        return stats, found
+
+    stats, found = run(scenario())
+    assert stats == [{"language": "en", "items": 1, "numbers": 3}, {"language": "hi", "items": 3, "numbers": 3}]
+    assert found["total"] == 3
+    assert len(found["items"]) == 2
+    assert found["has_more"] is True
+
+
+def test_bulk_writes_run_in_batches():
+    async def scenario():
+        db = await seeded(5)
+        with pytest.raises(ValueError):
+            await db.insert_many("dataset_items", [dataset_item(0)])
+        updated = await db.update_many("dataset_items", {"language": "hi"}, set_fields={"flagged": True}, batch_size=2)
+        patched = await db.patch_many("dataset_items", {"item-0": {"note": "x"}, "missing": {"note": "y"}})
+        deleted = await db.delete_many("dataset_items", {"flagged": True, "note": {"$exists": False}}, batch_size=3)
+        return updated, patched, deleted, await db.count_documents("dataset_items")
+
+    updated, patched, deleted, remaining = run(scenario())
+    assert (updated["affected"], updated["batches"]) == (5, 3)
+    assert patched == 1
+    assert deleted["affected"] == 4
+    assert remaining == 1
+
+
+def test_services_run_on_the_memory_backend(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    for module in (db_module, queue_service, review_service):
+        monkeypatch.setattr(module, "db_adapter", db)
+
+    async def scenario():
+        await db.insert_many("dataset_items", [dataset_item(index) for index in range(3)])
+        await db.insert("user", {"_id": "reviewer", "payout_balance": 0, "reviews_done": 0})
+        item = await queue_service.QueueService.get_next_item("reviewer", ["hi"])
+        await review_service.ReviewService.submit_review(item["_id"], "reviewer", "approve")
+        stats = await queue_service.QueueService.get_queue_stats()
+        return item, await db.get("dataset_items", item["_id"]), await db.get("user", "reviewer"), stats
+
+    claimed, reviewed, user, stats = run(scenario())
+    assert claimed["_id"] == "item-0"
+    assert reviewed["review_state"]["reviewed_by"] == ["reviewer"]
+    assert user["reviews_done"] == 1
+    assert stats["total_items"] == 3
+
+
+def test_unused_leases_are_released(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    monkeypatch.setattr(queue_service, "db_adapter", db)
+
+    async def scenario():
+        await db.insert_many("dataset_items", [dataset_item(index) for index in range(4)])
+        leased = await queue_service.QueueService.get_next_items("reviewer", ["hi"], 3)
+        await queue_service.QueueService.get_next_items("other", ["hi"], 1)
+        one = await queue_service.QueueService.release_items("reviewer", [leased[0]["_id"], "item-3"])
+        rest = await queue_service.QueueService.release_items("reviewer")
+        return leased, one, rest, await db.count_leases()
+
+    leased, one, rest, remaining = run(scenario())
+    assert len(leased) == 3
+    assert (one, rest) == (1, 2)
+    assert remaining == 1
+
+
+def test_claims_lease_items_without_rewriting_them(monkeypatch):
+    db = MemoryAdapter(column_map=FILTER_COLUMNS)
+    monkeypatch.setattr(queue_service, "db_adapter", db)
+
+    async def scenario():
+        await db.insert_many("dataset_items", [dataset_item(index) for index in range(3)])
+        claimed = await db.claim_next_dataset_items(["hi"], "reviewer", limit=2, lock_timeout_sec=0)
+        stored = await db.get("dataset_items", claimed[0]["_id"])
+        # Expired leases are taken over by the next claim and dropped by the stale-lock sweep
+        again = await db.claim_next_dataset_items(["hi"], "other", limit=1, lock_timeout_sec=60)
+        swept = await queue_service.QueueService.release_stale_locks()
+        stats = await queue_service.QueueService.get_queue_stats()
+        return claimed, stored, again, stats, swept
+
+    claimed, stored, again, stats, swept = run(scenario())
+    assert claimed[0]["review_state"]["lock_owner"] == "reviewer"
+    assert stored["review_state"]["status"] == "pending"
+    assert "_version" not in stored
+    assert again[0]["_id"] == "item-0"
+    assert (stats["pending_items"], stats["in_review"]) == (2, 1)
+    assert swept == 1
@@ -0,0 +1,160 @@
+"""Unit tests for adapter instrumentation (no database required)."""
+import asyncio
+import os
+import sys
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pytest
+
+from backend.app.db_metrics import DBMetrics, LatencyHistogram, _explain, db_operation, end_request, start_request
+
+
+class FakeAdapter:
+    def __init__(self):
+        self.metrics = DBMetrics()
+
+    @db_operation()
+    async def get(self, collection, doc_id):
+        return {"_id": doc_id}
+
+    @db_operation(rows=len)
+    async def find(self, collection, filters=None):
+        return [await self.get(collection, "a"), await self.get(collection, "b")]
+
+    @db_operation()
+    async def fail(self, collection):
+        raise ValueError("boom")
+
+    @db_operation()
+    async def iterate(self, collection, count):
+        for i in range(count):
+            yield i
+
+
+def operations(adapter):
+    return {(row["op"], row["collection"]): row for row in adapter.metrics.snapshot()["operations"]}
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram(buckets_ms=(1, 10, 100))
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["buckets"] == {"le_1": 1, "le_10": 2, "le_100": 1, "inf": 1}
+    assert snapshot["p50_ms"] == 10
+    assert snapshot["p99_ms"] == 500
+    assert snapshot["max_ms"] == 500
+
+
+def test_empty_histogram_has_no_quantiles():
+    assert LatencyHistogram().snapshot()["p50_ms"] is None
+
+
+def test_operations_are_recorded_per_collection():
+    adapter = FakeAdapter()
+    asyncio.run(adapter.get("users", "x"))
+    asyncio.run(adapter.get("users", "y"))
+    asyncio.run(adapter.get("items", "z"))
+    ops = operations(adapter)
+    assert ops[("get", "users")]["calls"] == 2
+    assert ops[("get", "users")]["rows"] == 2
+    assert ops[("get", "items")]["calls"] == 1
+
+
+def test_nested_operations_count_towards_the_outermost():
+    adapter = FakeAdapter()
+    asyncio.run(adapter.find("users"))
+    ops = operations(adapter)
+    assert list(ops) == [("find", "users")]
+    assert ops[("find", "users")]["rows"] == 2
+
+
+def test_errors_are_counted_and_reraised():
+    adapter = FakeAdapter()
+    with pytest.raises(ValueError):
+        asyncio.run(adapter.fail("users"))
+    assert operations(adapter)[("fail", "users")]["errors"] == 1
+
+
+def test_async_generators_count_yielded_rows_even_when_stopped_early():
+    adapter = FakeAdapter()
+
+    async def consume():
+        seen = []
+        iterator = adapter.iterate("items", 10)
+        async for value in iterator:
+            seen.append(value)
+            if len(seen) == 3:
+                break
+        await iterator.aclose()
+        return seen
+
+    assert asyncio.run(consume()) == [0, 1, 2]
+    row = operations(adapter)[("iterate", "items")]
+    assert row["rows"] == 3
+    assert row["errors"] == 0
+
+
+def test_disabled_metrics_record_nothing():
+    adapter = FakeAdapter()
+    adapter.metrics.enabled = False
+    asyncio.run(adapter.get("users", "x"))
+    assert operations(adapter) == {}
+
+
+def test_request_summary_counts_outermost_operations():
+    adapter = FakeAdapter()
+
+    async def handle():
+        summary, token = start_request()
+        try:
+            await adapter.find("users")
+            await adapter.get("users", "x")
+        finally:
+            end_request(token)
+        return summary
+
+    summary = asyncio.run(handle())
+    assert summary.ops == 2
+    headers = summary.headers()
+    assert headers["X-DB-Summary"].startswith("ops=2; queries=0;")
+    assert headers["Server-Timing"].startswith("db;dur=")
+
+
+class RecordingConnection:
+    """DB-API connection stand-in that records executed statements."""
+
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(statement)
+
+    def fetchall(self):
+        return [("Seq Scan on documents",)]
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("statement, analyzed", [
+    ("SELECT * FROM documents", True),
+    ("SELECT * FROM documents FOR UPDATE SKIP LOCKED", False),
+    ("SELECT * FROM documents FOR SHARE", False),
+    ("SELECT * FROM documents FOR NO KEY UPDATE", False),
+    ("SELECT * FROM documents FOR KEY SHARE", False),
+    ("SELECT pg_try_advisory_xact_lock(1)", False),
+])
+def test_explain_analyzes_read_only_statements_only(statement, analyzed):
+    connection = RecordingConnection()
+    assert _explain(connection, statement, {}) == "Seq Scan on documents"
+    explain = connection.executed[1]
+    assert explain.startswith("EXPLAIN (ANALYZE") is analyzed
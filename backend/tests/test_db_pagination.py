@@ -0,0 +1,37 @@
+"""Unit tests for keyset pagination helpers (no database required)."""
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_adapter import DBAdapter, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor("created_at", "DESC", created, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "created_at", "DESC") == {"value": created.isoformat(), "id": 42}
+
+
+@pytest.mark.parametrize("cursor, sort_by, sort_dir", [
+    ("not-a-cursor", "created_at", "DESC"),
+    (encode_cursor("created_at", "DESC", None, 1), "item_number", "DESC"),
+    (encode_cursor("created_at", "DESC", None, 1), "created_at", "ASC"),
+])
+def test_invalid_or_mismatched_cursor_raises(cursor, sort_by, sort_dir):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, sort_by, sort_dir)
+
+
+def test_keyset_clause_handles_null_sort_values():
+    clause = DBAdapter._keyset_clause("expr", "bigint", True, False, 5)
+    assert clause.startswith("((expr, id) > (") and clause.endswith("OR expr IS NULL)")
+    assert DBAdapter._keyset_clause("expr", "bigint", True, True, 5).startswith("(expr, id) < (")
+    assert DBAdapter._keyset_clause("expr", "bigint", True, False, None) == "(expr IS NULL AND id > :cursor_id)"
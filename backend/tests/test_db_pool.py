@@ -0,0 +1,62 @@
+"""Unit tests for connection pool settings (no database required)."""
+import os
+import sys
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_pool import MonitoredQueuePool, PoolStats, StatementNamer, engine_options
+
+
+def make_settings(**overrides):
+    settings = {
+        "DB_POOL_SIZE": 5,
+        "DB_MAX_OVERFLOW": 2,
+        "DB_POOL_TIMEOUT": 10.0,
+        "DB_POOL_PRE_PING": True,
+        "DB_POOL_RECYCLE": 600,
+        "DB_STATEMENT_CACHE_SIZE": 128,
+        "DB_PGBOUNCER": False,
+    }
+    settings.update(overrides)
+    return SimpleNamespace(**settings)
+
+
+def test_pool_settings_come_from_config():
+    options = engine_options(make_settings())
+    assert options["poolclass"] is MonitoredQueuePool
+    assert options["pool_size"] == 5
+    assert options["max_overflow"] == 2
+    assert options["pool_timeout"] == 10.0
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 600
+    assert options["connect_args"]["prepared_statement_cache_size"] == 128
+    assert options["connect_args"]["prepared_statement_name_func"]() is None
+
+
+def test_pgbouncer_mode_disables_statement_caches():
+    connect_args = engine_options(make_settings(DB_PGBOUNCER=True))["connect_args"]
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_statement_cache_hit_rate():
+    stats = PoolStats()
+    assert stats.snapshot()["statement_cache"]["hit_rate"] is None
+    stats.statement_cache_lookups, stats.statement_cache_misses = 4, 1
+    assert stats.snapshot()["statement_cache"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+
+
+def test_statement_namer_counts_prepares_as_misses():
+    stats = PoolStats()
+    namer = StatementNamer()
+    namer()
+    namer.stats = stats
+    namer()
+    namer()
+    assert stats.statement_cache_misses == 2
@@ -0,0 +1,79 @@
+"""Unit tests for the projection compiler (no database required)."""
+import os
+import sys
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pytest
+
+from backend.app.db_projection import compile_projection, expand_projection, normalize_projection, project
+
+
+DOCUMENT = {
+    "_id": "item-1",
+    "language": "hi",
+    "note": None,
+    "content": {"full_text": "x" * 100, "title": "t"},
+    "review_state": {"status": "pending", "reviewed_by": ["a", "b"]},
+    "flags": [{"reason": "typo"}, {"reason": "blank"}],
+}
+
+
+def test_normalize_drops_duplicates_id_and_covered_paths():
+    assert normalize_projection(["review_state.status", "_id", "review_state", "language", "language"]) == [
+        "language",
+        "review_state",
+    ]
+    assert normalize_projection(None) is None
+    assert normalize_projection([]) is None
+
+
+def test_normalize_rejects_bad_paths():
+    with pytest.raises(ValueError):
+        normalize_projection(["content..title"])
+    with pytest.raises(ValueError):
+        normalize_projection("language")
+
+
+def test_compile_projection_binds_keys_and_paths():
+    sql, params = compile_projection(["language", "review_state.status"])
+    assert sql == (
+        "jsonb_build_object('_id', data->'_id', "
+        "CAST(:proj0k AS text), data #> CAST(:proj0 AS text[]), "
+        "CAST(:proj1k AS text), data #> CAST(:proj1 AS text[]))"
+    )
+    assert params == {
+        "proj0k": "language",
+        "proj0": ["language"],
+        "proj1k": "review_state.status",
+        "proj1": ["review_state", "status"],
+    }
+
+
+def test_large_projections_are_split_across_calls():
+    sql, _ = compile_projection([f"f{i}" for i in range(60)])
+    assert sql.count("jsonb_build_object(") == 2
+    assert " || " in sql
+
+
+def test_expand_projection_nests_paths_and_drops_missing():
+    row = {"_id": "item-1", "language": "hi", "review_state.status": "pending", "content.title": None}
+    assert expand_projection(row, ["content.title", "language", "review_state.status"]) == {
+        "_id": "item-1",
+        "language": "hi",
+        "review_state": {"status": "pending"},
+    }
+    assert expand_projection(None, ["language"]) is None
+
+
+def test_project_matches_server_side_shape():
+    paths = normalize_projection(["content.title", "review_state.status", "flags.1.reason", "note", "missing.x"])
+    assert project(DOCUMENT, paths) == {
+        "_id": "item-1",
+        "content": {"title": "t"},
+        "review_state": {"status": "pending"},
+        "flags": {"1": {"reason": "blank"}},
+    }
@@ -0,0 +1,85 @@
+"""Unit tests for search tokenisation and tsvector/tsquery construction (no database required)."""
+import os
+import sys
+import unicodedata
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_search import (
+    document_text,
+    index_entry,
+    like_pattern,
+    normalize_text,
+    search_triggers,
+    to_tsquery_literal,
+    to_tsvector_literal,
+    tokenize,
+)
+
+
+def test_devanagari_words_keep_vowel_signs_and_viramas():
+    assert tokenize("यह हिन्दी भाषा है।") == ["यह", "हिन्दी", "भाषा", "है"]
+
+
+def test_tamil_and_bengali_words_stay_whole():
+    assert tokenize("தமிழ் மொழி") == ["தமிழ்", "மொழி"]
+    assert tokenize("বাংলা ভাষা") == ["বাংলা", "ভাষা"]
+
+
+def test_decomposed_input_matches_composed_text():
+    composed = "ক্ষমা café"
+    decomposed = unicodedata.normalize("NFD", composed)
+    assert tokenize(decomposed) == tokenize(composed)
+
+
+def test_tokens_split_where_the_script_changes():
+    assert tokenize("Hindiहिन्दी") == ["hindi", "हिन्दी"]
+
+
+def test_joiners_are_dropped_and_native_digits_become_ascii():
+    assert tokenize("क्\u200dष") == tokenize("क्ष")
+    assert tokenize("௧௨ १२३") == ["12", "123"]
+
+
+def test_casefolding():
+    assert normalize_text("Straße") == "strasse"
+    assert tokenize("Hello WORLD") == ["hello", "world"]
+
+
+def test_document_text_collects_leaf_values_only():
+    text = document_text({"text": "hello", "meta": {"page": 3, "ok": True}, "tags": ["a", None]})
+    assert text.split("\n") == ["hello", "3", "a"]
+
+
+def test_tsvector_literal_quotes_and_keeps_positions():
+    assert to_tsvector_literal(["it's", "a", "it's"]) == "'it''s':1,3 'a':2"
+    assert to_tsvector_literal(["back\\slash"]) == "'back\\\\slash':1"
+    assert to_tsvector_literal(["x" * 3000]) == ""
+
+
+def test_tsquery_literal_prefix_matches_every_token_once():
+    assert to_tsquery_literal(["hello", "wor", "hello"]) == "'hello':* & 'wor':*"
+
+
+def test_like_pattern_escapes_wildcards():
+    assert like_pattern("50%_off") == "%50\\%\\_off%"
+
+
+def test_index_entry():
+    entry = index_entry({"text": "हिन्दी Text"})
+    assert entry == {"search_text": "हिन्दी text", "tsv": "'हिन्दी':1 'text':2"}
+
+
+def test_triggers_watch_the_indexed_field():
+    triggers = search_triggers("documents")
+    assert set(triggers) == {
+        "documents_search_dataset_items_ins",
+        "documents_search_dataset_items_upd",
+        "documents_search_dataset_items_del",
+    }
+    assert "OLD.data #> '{content}' IS DISTINCT FROM NEW.data #> '{content}'" in (
+        triggers["documents_search_dataset_items_upd"]
+    )
@@ -0,0 +1,70 @@
+"""Unit tests for the partial update compiler (no database required)."""
+import json
+import os
+import sys
+
+import pytest
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_updates import apply_update, compile_update
+
+
+def test_top_level_sets_merge_into_one_patch():
+    sql, params = compile_update({"flagged": True, "note": "x"})
+    assert sql == "(data || CAST(:u0 AS jsonb))"
+    assert json.loads(params["u0"]) == {"flagged": True, "note": "x"}
+
+
+def test_dotted_sets_keep_order_with_top_level_keys():
+    sql, params = compile_update({"a": 1, "review_state.status": "pending", "b": 2})
+    assert sql.startswith("(documents_set_path((data || CAST(:u0 AS jsonb)), CAST(:u1 AS text[])")
+    assert params["u1"] == ["review_state", "status"]
+    assert json.loads(params["u2"]) == "pending"
+    assert json.loads(params["u3"]) == {"b": 2}
+
+
+def test_inc_push_and_unset_compose():
+    sql, params = compile_update(
+        inc_fields={"review_state.review_count": 1},
+        push_fields={"flags": {"reason": "corrupt"}},
+        unset_fields=["review_state.lock_owner"],
+    )
+    assert sql.startswith("(documents_push_path(documents_inc_path(data,")
+    assert sql.endswith("#- CAST(:u4 AS text[]))")
+    assert params["u1"] == 1
+    assert params["u4"] == ["review_state", "lock_owner"]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"set_fields": {}},
+    {"inc_fields": {"n": "1"}},
+    {"inc_fields": {"n": True}},
+    {"unset_fields": "a"},
+    {"set_fields": {"a..b": 1}},
+])
+def test_invalid_updates_raise_value_error(kwargs):
+    with pytest.raises(ValueError):
+        compile_update(**kwargs)
+
+
+def test_apply_update_mirrors_the_sql_update():
+    document = {"review_state": {"review_count": 1, "reviewed_by": ["a"]}, "flags": [1, 2]}
+    result = apply_update(
+        document,
+        set_fields={"meta.source": "ocr", "review_state.status": "done"},
+        inc_fields={"review_state.review_count": 1, "skips": 0.5},
+        push_fields={"review_state.reviewed_by": "b"},
+        unset_fields=["flags.0"],
+    )
+    assert result is document
+    assert result == {
+        "review_state": {"review_count": 2, "reviewed_by": ["a", "b"], "status": "done"},
+        "flags": [2],
+        "meta": {"source": "ocr"},
+        "skips": 0.5,
+    }
@@ -0,0 +1,58 @@
+"""Unit tests for optimistic concurrency helpers (no database required)."""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Ensure project root is on sys.path for absolute imports when running tests directly.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from backend.app.db_adapter import VersionConflict, document_version, retry_on_conflict
+
+
+def test_document_version_defaults_to_zero():
+    assert document_version(None) == 0
+    assert document_version({"_id": "a"}) == 0
+    assert document_version({"_id": "a", "_version": 3}) == 3
+
+
+def test_retry_until_the_operation_succeeds():
+    calls = []
+
+    async def operation(value, suffix=""):
+        calls.append(value)
+        if len(calls) < 3:
+            raise VersionConflict("items", "a", len(calls))
+        return value + suffix
+
+    result = asyncio.run(retry_on_conflict(operation, "ok", suffix="!", attempts=5, backoff_sec=0))
+    assert result == "ok!"
+    assert len(calls) == 3
+
+
+def test_last_conflict_is_reraised():
+    calls = []
+
+    async def operation():
+        calls.append(1)
+        raise VersionConflict("items", "a", 7)
+
+    with pytest.raises(VersionConflict) as info:
+        asyncio.run(retry_on_conflict(operation, attempts=2, backoff_sec=0))
+    assert len(calls) == 2
+    assert info.value.expected == 7
+
+
+def test_other_errors_are_not_retried():
+    calls = []
+
+    async def operation():
+        calls.append(1)
+        raise ValueError("Item already finalized")
+
+    with pytest.raises(ValueError):
+        asyncio.run(retry_on_conflict(operation, attempts=5, backoff_sec=0))
+    assert len(calls) == 1
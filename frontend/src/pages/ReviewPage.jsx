@@ -16,6 +16,9 @@ const MODALITY_ICONS = {
   custom: 'CUSTOM'
 }
 
+// Items leased per /datasets/next-batch call; the rest wait in a local queue
+const PREFETCH_COUNT = 5
+
 export default function ReviewPage() {
   const { user, refreshUser } = useAuth()
   const [item, setItem] = useState(null)
@@ -49,6 +52,10 @@ export default function ReviewPage() {
   // Dataset type schema for widget rendering
   const [datasetTypeSchema, setDatasetTypeSchema] = useState(null)
 
+  // Leased items not shown yet, and the one on screen, for releasing them on the way out
+  const prefetchedRef = useRef({ items: [], expiresAt: 0 })
+  const currentItemRef = useRef(null)
+
   useFocusTrap(showSkipFeedbackModal, skipModalRef, {
     initialFocusRef: skipTextareaRef,
     returnFocusRef: skipTriggerRef,
@@ -86,15 +93,26 @@ export default function ReviewPage() {
     setEditMode(false)
     
     try {
-      const languages = user?.languages?.length > 0 ? user.languages : ['en']
-      const data = await api.getNextItem(languages)
-      
-      if (data.message) {
+      const prefetched = prefetchedRef.current
+      // Leases that ran out may already be someone else's
+      if (Date.now() >= prefetched.expiresAt) {
+        prefetched.items = []
+      }
+      if (prefetched.items.length === 0) {
+        const languages = user?.languages?.length > 0 ? user.languages : ['en']
+        const data = await api.getNextItems(languages, PREFETCH_COUNT)
+        prefetched.items = data.items
+        prefetched.expiresAt = Date.now() + data.lease_sec * 1000
+      }
+
+      const next = prefetched.items.shift()
+      currentItemRef.current = next || null
+      if (!next) {
         setItem(null)
-        setError(data.message)
+        setError('No items available in queue')
       } else {
-        setItem(data)
-        setEditedContent(data.content || {})
+        setItem(next)
+        setEditedContent(next.content || {})
       }
     } catch (err) {
       setError(err.message || 'Failed to fetch next item')
@@ -104,6 +122,27 @@ export default function ReviewPage() {
     }
   }
 
+  // Give back the leases of items left unreviewed when leaving the page or closing the tab
+  useEffect(() => {
+    const releaseLeases = (keepalive) => {
+      const itemIds = prefetchedRef.current.items.map((leased) => leased._id)
+      if (currentItemRef.current) itemIds.push(currentItemRef.current._id)
+      prefetchedRef.current.items = []
+      currentItemRef.current = null
+      if (itemIds.length === 0) return
+      api.releaseItems(itemIds, { keepalive }).catch((err) => {
+        console.error('Failed to release leased items:', err)
+      })
+    }
+    const handlePageHide = () => releaseLeases(true)
+
+    window.addEventListener('pagehide', handlePageHide)
+    return () => {
+      window.removeEventListener('pagehide', handlePageHide)
+      releaseLeases(false)
+    }
+  }, [])
+
   // Fetch dataset type schema when item changes
   useEffect(() => {
     const fetchSchema = async () => {
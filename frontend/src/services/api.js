@@ -74,6 +74,20 @@ export const api = {
     return request(`/datasets/next?langs=${langs}`)
   },
 
+  async getNextItems(languages = ['en'], count = 10) {
+    const langs = languages.join(',')
+    return request(`/datasets/next-batch?langs=${langs}&count=${count}`)
+  },
+
+  // keepalive lets the request outlive the page (pagehide); unlike sendBeacon it keeps the auth header
+  async releaseItems(itemIds = null, { keepalive = false } = {}) {
+    return request('/datasets/release', {
+      method: 'POST',
+      body: JSON.stringify({ item_ids: itemIds }),
+      keepalive,
+    })
+  },
+
   async getDatasetTypeSchema(datasetTypeId) {
     return request(`/datasets/type/${datasetTypeId}`)
   },